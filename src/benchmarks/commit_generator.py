@@ -0,0 +1,67 @@
+"""
+Deterministic generator of GitHub-shaped commit payloads.
+
+The same arguments always produce the same commits, so benchmark results
+of different commits of the repository are comparable.
+"""
+import random
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List
+
+def get_day_window_start(day: date) -> datetime:
+    """
+    Start (UTC) of the commit window of a partition day, matching
+    GitHubToGCSOperator: the previous day at 17:00Z.
+
+    Args:
+        day: Partition day
+
+    Returns:
+        Naive UTC datetime of the window start
+    """
+    return datetime.combine(day - timedelta(days=1), time(17))
+
+def generate_commits(
+    count: int,
+    seed: int = 42,
+    committers: int = 500,
+    null_committer_ratio: float = 0.05,
+    day: date = date(2024, 10, 2)
+) -> List[Dict]:
+    """
+    Generate GitHub-shaped commit payloads for one partition day.
+
+    Args:
+        count: Number of commits in the day
+        seed: Random seed
+        committers: Number of distinct committers (cardinality of committer name / email / id)
+        null_committer_ratio: Share of commits without a linked GitHub committer account
+        day: Partition day, commit dates fall in its 17:00Z-16:59:59Z window
+
+    Returns:
+        List of commit dictionaries
+    """
+    rng = random.Random(seed)
+    start = get_day_window_start(day)
+    commits = []
+    for i in range(count):
+        user_id = rng.randint(1, committers)
+        date_str = (start + timedelta(seconds=rng.randint(0, 86399))).strftime('%Y-%m-%dT%H:%M:%SZ')
+        sha = f"{rng.getrandbits(160):040x}"
+        person = {"name": f"Dev {user_id}", "email": f"dev{user_id}@example.org", "date": date_str}
+        user = {"login": f"dev{user_id}", "id": user_id, "url": f"https://api.github.com/users/dev{user_id}", "type": "User"}
+        commits.append({
+            "sha": sha,
+            "commit": {
+                "author": person,
+                "committer": person,
+                "message": f"subsystem: fix issue {i}\n\nSigned-off-by: Dev {user_id} <dev{user_id}@example.org>",
+                "tree": {"sha": f"{rng.getrandbits(160):040x}"},
+                "verification": {"verified": False, "reason": "unsigned", "signature": None, "payload": None}
+            },
+            "url": f"https://api.github.com/repos/torvalds/linux/commits/{sha}",
+            "author": user,
+            "committer": user if rng.random() >= null_committer_ratio else None,
+            "parents": [{"sha": f"{rng.getrandbits(160):040x}"}]
+        })
+    return commits
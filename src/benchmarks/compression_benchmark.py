@@ -0,0 +1,87 @@
+"""
+Compare bronze/silver compression codecs (none, gzip, zstd).
+
+For each codec the benchmark runs the per-object work of every stage on a
+synthetic day of GitHub commits and reports the bytes that would be moved
+to / from GCS and the time spent per stage:
+
+- extract:   serialize pages to NDJSON and compress (bronze upload)
+- transform: decompress + parse bronze, transform, serialize + compress (silver upload)
+- parquet:   decompress + parse silver and write parquet (gold)
+
+Usage (from src/):
+    python -m benchmarks.compression_benchmark --commits 20000 --page-size 100
+"""
+import argparse
+import io
+import json
+import time
+from typing import Dict, List
+
+from benchmarks.commit_generator import generate_commits
+from plugins.operators.gcs_transform import GCSTransformOperator
+from plugins.utils.compression import decompress, open_compressed_writer
+from plugins.utils.json_utils import iter_json_records, to_ndjson_line
+from plugins.utils.parquet_utils import read_silver_commits_table, write_gold_parquet
+
+CODECS = ['none', 'gzip', 'zstd']
+
+def write_ndjson(records: List[Dict], codec: str) -> bytes:
+    buffer = io.BytesIO()
+    with open_compressed_writer(buffer, codec) as writer:
+        for record in records:
+            writer.write(to_ndjson_line(record))
+    return buffer.getvalue()
+
+def run_codec(commits: List[Dict], page_size: int, codec: str) -> Dict:
+    transform = GCSTransformOperator(task_id='benchmark_transform', src_path='', dest_path='', transform_engine='python').transform_github_commits
+    pages = [commits[i:i + page_size] for i in range(0, len(commits), page_size)]
+    result = {"codec": codec}
+
+    start = time.perf_counter()
+    bronze = [write_ndjson(page, codec) for page in pages]
+    result["extract_seconds"] = time.perf_counter() - start
+    result["bronze_bytes"] = sum(len(part) for part in bronze)
+
+    start = time.perf_counter()
+    silver = [write_ndjson(transform(list(iter_json_records(decompress(part, codec)))), codec) for part in bronze]
+    result["transform_seconds"] = time.perf_counter() - start
+    result["silver_bytes"] = sum(len(part) for part in silver)
+
+    start = time.perf_counter()
+    gold_bytes = 0
+    for part in silver:
+        parquet_buffer = io.BytesIO()
+        write_gold_parquet([read_silver_commits_table(io.BytesIO(decompress(part, codec)))], parquet_buffer)
+        gold_bytes += len(parquet_buffer.getvalue())
+    result["parquet_seconds"] = time.perf_counter() - start
+    result["gold_bytes"] = gold_bytes
+
+    # Every stage downloads its input and uploads its output
+    result["transferred_bytes"] = 2 * result["bronze_bytes"] + 2 * result["silver_bytes"] + gold_bytes
+    return result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commits", type=int, default=20000, help="Commits in the synthetic day")
+    parser.add_argument("--page-size", type=int, default=100, help="Commits per bronze part")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    commits = generate_commits(args.commits)
+    results = [run_codec(commits, args.page_size, codec) for codec in CODECS]
+
+    print(f"{'codec':<6} {'bronze MB':>10} {'silver MB':>10} {'moved MB':>10} {'extract s':>10} {'transform s':>12} {'parquet s':>10}")
+    for r in results:
+        print(
+            f"{r['codec']:<6} {r['bronze_bytes'] / 1e6:>10.2f} {r['silver_bytes'] / 1e6:>10.2f} "
+            f"{r['transferred_bytes'] / 1e6:>10.2f} {r['extract_seconds']:>10.2f} "
+            f"{r['transform_seconds']:>12.2f} {r['parquet_seconds']:>10.2f}"
+        )
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(results, output_file, indent=2)
+
+if __name__ == '__main__':
+    main()
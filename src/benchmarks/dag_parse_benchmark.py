@@ -0,0 +1,110 @@
+"""
+Parse-time benchmark of the DAG files.
+
+Every DAG file is parsed with a DagBag in fresh processes (as the DAG
+processor does), reporting the parse time, the metadata database queries
+and Variable.get calls made while parsing, the heavy modules imported by
+the parse, and whether a second parse yields the same DAG schedule window
+(start_date / end_date).
+
+Variables stored as AIRFLOW_VAR_* environment variables are read without
+a database query; unset them to measure variables kept in the metastore.
+
+Usage (from src/):
+    python -m benchmarks.dag_parse_benchmark --rounds 5
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+DAGS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dags')
+
+# Modules that should only be needed by the tasks, not by the parse
+HEAVY_MODULES = ['pyarrow', 'pandas', 'requests', 'curlify']
+
+def measure(path: str, queue: multiprocessing.Queue) -> None:
+    from sqlalchemy import event
+    from airflow import settings
+    from airflow.models import DagBag
+    from airflow.models.variable import Variable
+
+    counts = {"db_queries": 0, "variable_gets": 0}
+    def count_query(*args, **kwargs):
+        counts["db_queries"] += 1
+    event.listen(settings.engine, 'before_cursor_execute', count_query)
+
+    variable_get = Variable.get.__func__
+    def counted_get(cls, *args, **kwargs):
+        counts["variable_gets"] += 1
+        return variable_get(cls, *args, **kwargs)
+    Variable.get = classmethod(counted_get)
+
+    modules_before = set(sys.modules)
+    started_at = time.perf_counter()
+    dagbag = DagBag(dag_folder=path, include_examples=False)
+    parse_seconds = time.perf_counter() - started_at
+    heavy = sorted(name for name in HEAVY_MODULES if name in sys.modules and name not in modules_before)
+    parse_counts = dict(counts)
+
+    # A second parse, as the next DAG processor loop, must describe the same schedule window
+    reparsed = DagBag(dag_folder=path, include_examples=False)
+    stable = all(
+        (dag.start_date, dag.end_date) == (reparsed.dags[dag_id].start_date, reparsed.dags[dag_id].end_date)
+        for dag_id, dag in dagbag.dags.items()
+    )
+
+    queue.put({
+        "parse_seconds": parse_seconds,
+        "import_errors": len(dagbag.import_errors),
+        "heavy_modules": heavy,
+        "stable_window": stable,
+        **parse_counts
+    })
+
+def run(path: str) -> Dict:
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=measure, args=(path, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5, help="Fresh-process parses per DAG file")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results: List[Dict] = []
+    print(f"{'dag file':<36} {'parse s':>8} {'db queries':>11} {'Variable.get':>13} {'stable window':>14}  heavy modules")
+    for path in sorted(glob.glob(os.path.join(DAGS_DIR, 'dag_*.py'))):
+        rounds = [run(path) for _ in range(args.rounds)]
+        result = {
+            "dag_file": os.path.basename(path),
+            "parse_seconds": statistics.median(r["parse_seconds"] for r in rounds),
+            "db_queries": rounds[-1]["db_queries"],
+            "variable_gets": rounds[-1]["variable_gets"],
+            "import_errors": rounds[-1]["import_errors"],
+            "stable_window": all(r["stable_window"] for r in rounds),
+            "heavy_modules": rounds[-1]["heavy_modules"]
+        }
+        results.append(result)
+        print(
+            f"{result['dag_file']:<36} {result['parse_seconds']:>8.3f} {result['db_queries']:>11} "
+            f"{result['variable_gets']:>13} {str(result['stable_window']):>14}  {', '.join(result['heavy_modules']) or '-'}"
+            + (f"  ({result['import_errors']} import errors)" if result['import_errors'] else "")
+        )
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(results, output_file, indent=2)
+
+if __name__ == '__main__':
+    main()
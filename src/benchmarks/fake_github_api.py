@@ -0,0 +1,231 @@
+"""
+Local fake of the GitHub commits API (GET /repos/{owner}/{repo}/commits).
+
+Serves a fixed list of commits newest first, filtered by `since` / `until`
+and paginated with `per_page` / `page`, with the `Link` (first / prev /
+next / last), `ETag` (If-None-Match answers 304) and `X-RateLimit-*`
+headers the extractor relies on. Every path is treated as the commits
+endpoint, so `http://127.0.0.1:<port>/repos/torvalds/linux/commits` works.
+
+POST requests are answered as the GraphQL API (`/graphql`): the commit
+history of COMMIT_HISTORY_QUERY, filtered by the `since` / `until`
+variables and paginated with `first` / `after` cursors. Dates are sent
+with a non-UTC offset, as GitHub does for committers in other timezones.
+
+Usage (from src/), serving a synthetic day until interrupted:
+    python -m benchmarks.fake_github_api --commits 20000 --port 8765
+"""
+import argparse
+import base64
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from benchmarks.commit_generator import generate_commits
+
+RATE_LIMIT = 5000
+
+# Offset of the committer dates returned by the GraphQL endpoint
+GRAPHQL_DATE_OFFSET = timezone(timedelta(hours=-7))
+
+def to_graphql_commit(commit: Dict) -> Dict:
+    """
+    Convert a REST commit payload into a history node of the GraphQL API.
+
+    Args:
+        commit: Commit in the REST layout
+
+    Returns:
+        Node with the fields of COMMIT_HISTORY_QUERY
+    """
+    committer = commit['commit']['committer']
+    committed_at = datetime.strptime(committer['date'], '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc)
+    return {
+        "oid": commit['sha'],
+        "committer": {
+            "name": committer['name'],
+            "email": committer['email'],
+            "date": committed_at.astimezone(GRAPHQL_DATE_OFFSET).isoformat(),
+            "user": {"databaseId": commit['committer']['id']} if commit.get('committer') else None
+        }
+    }
+
+class FakeGitHubCommitsAPI:
+    """
+    Threaded HTTP server serving commits like the GitHub commits API.
+
+    Use as a context manager; `url` is the commits endpoint.
+    """
+
+    def __init__(self, commits: List[Dict], host: str = '127.0.0.1', port: int = 0, latency: float = 0.0) -> None:
+        """
+        Initialize the server (not started yet).
+
+        Args:
+            commits: Commits to serve, in any order
+            host: Interface to bind
+            port: Port to bind, 0 for a free port
+            latency: Seconds added to every response
+        """
+        # GitHub lists commits newest first
+        self.commits = sorted(commits, key=lambda commit: commit['commit']['committer']['date'], reverse=True)
+        self.latency = latency
+        self.requests = 0
+        self.bytes_served = 0
+        self._lock = threading.Lock()
+        self._windows: Dict[tuple, List[Dict]] = {}
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/repos/torvalds/linux/commits"
+
+    @property
+    def graphql_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/graphql"
+
+    def start(self) -> 'FakeGitHubCommitsAPI':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'FakeGitHubCommitsAPI':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _select(self, since: Optional[str], until: Optional[str]) -> List[Dict]:
+        with self._lock:
+            if (since, until) not in self._windows:
+                # Dates share the same ISO format, so string comparison orders them
+                self._windows[(since, until)] = [
+                    commit for commit in self.commits
+                    if (since is None or commit['commit']['committer']['date'] >= since)
+                    and (until is None or commit['commit']['committer']['date'] <= until)
+                ]
+            return self._windows[(since, until)]
+
+    def _record(self, size: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes_served += size
+
+    def _handler_class(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; without TCP_NODELAY keep-alive requests stall on delayed ACKs
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                if api.latency > 0:
+                    time.sleep(api.latency)
+
+                parsed = urlparse(self.path)
+                query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+                per_page = min(int(query.get('per_page', 30)), 100)
+                page = max(int(query.get('page', 1)), 1)
+
+                selected = api._select(query.get('since'), query.get('until'))
+                last_page = max(1, -(-len(selected) // per_page))
+                body = json.dumps(selected[(page - 1) * per_page:page * per_page]).encode('utf-8')
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+
+                base = f"http://{self.headers.get('Host')}{parsed.path}"
+                def link(rel: str, target: int) -> str:
+                    return f'<{base}?{urlencode(dict(query, page=target))}>; rel="{rel}"'
+                links = []
+                if page > 1:
+                    links += [link('prev', page - 1), link('first', 1)]
+                if page < last_page:
+                    links += [link('next', page + 1), link('last', last_page)]
+
+                not_modified = self.headers.get('If-None-Match') == etag
+                self.send_response(304 if not_modified else 200)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('ETag', etag)
+                if links:
+                    self.send_header('Link', ', '.join(links))
+                self.send_header('X-RateLimit-Limit', str(RATE_LIMIT))
+                self.send_header('X-RateLimit-Remaining', str(RATE_LIMIT - 1))
+                self.send_header('X-RateLimit-Reset', str(int(time.time()) + 3600))
+                self.send_header('Content-Length', '0' if not_modified else str(len(body)))
+                self.end_headers()
+                if not not_modified:
+                    self.wfile.write(body)
+                api._record(0 if not_modified else len(body))
+
+            def do_POST(self) -> None:
+                if api.latency > 0:
+                    time.sleep(api.latency)
+
+                request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                variables = request.get('variables') or {}
+                if 'history' not in request.get('query', ''):
+                    payload = {"errors": [{"message": "Only the commit history query is supported"}]}
+                else:
+                    # Cursors are opaque to clients, here they encode the offset of the next commit
+                    offset = int(base64.b64decode(variables['after'])) if variables.get('after') else 0
+                    first = min(int(variables.get('first', 100)), 100)
+                    selected = api._select(variables.get('since'), variables.get('until'))
+                    nodes = [to_graphql_commit(commit) for commit in selected[offset:offset + first]]
+                    end = offset + len(nodes)
+                    payload = {"data": {"repository": {"defaultBranchRef": {"target": {"history": {
+                        "pageInfo": {
+                            "hasNextPage": end < len(selected),
+                            "endCursor": base64.b64encode(str(end).encode()).decode() if nodes else None
+                        },
+                        "nodes": nodes
+                    }}}}}}
+
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('X-RateLimit-Limit', str(RATE_LIMIT))
+                self.send_header('X-RateLimit-Remaining', str(RATE_LIMIT - 1))
+                self.send_header('X-RateLimit-Reset', str(int(time.time()) + 3600))
+                self.send_header('X-RateLimit-Resource', 'graphql')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                api._record(len(body))
+
+        return Handler
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commits", type=int, default=20000, help="Commits in the synthetic day")
+    parser.add_argument("--committers", type=int, default=500, help="Distinct committers")
+    parser.add_argument("--null-committer-ratio", type=float, default=0.05, help="Share of commits without a committer account")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    args = parser.parse_args()
+
+    commits = generate_commits(args.commits, committers=args.committers, null_committer_ratio=args.null_committer_ratio)
+    with FakeGitHubCommitsAPI(commits, port=args.port, latency=args.latency) as api:
+        print(f"Serving {len(commits)} commits at {api.url} (GraphQL: {api.graphql_url})")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+"""
+End-to-end benchmark of the extract -> transform -> parquet chain.
+
+For every requested day size a synthetic day of commits is served by the
+local fake commits API, and GitHubToGCSOperator, GCSTransformOperator and
+GCSJsonToParquetOperator run one after another against the local storage
+backend. Each stage runs in a fresh process so its peak RSS is its own.
+Per stage the runner reports rows/s, bytes/s (bytes written) and peak RSS,
+and the results can be saved as JSON and compared against a previous run.
+
+Usage (from src/):
+    python -m benchmarks.pipeline_benchmark --commits 10000 50000 --output results.json
+    python -m benchmarks.pipeline_benchmark --commits 10000 50000 --baseline results.json
+"""
+import argparse
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import tempfile
+import time
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional
+
+from benchmarks.commit_generator import generate_commits
+from benchmarks.fake_github_api import FakeGitHubCommitsAPI
+
+STAGES = ['extract', 'transform', 'parquet']
+
+BENCHMARK_DAY = date(2024, 10, 2)
+
+def run_stage(stage: str, options: Dict, queue: multiprocessing.Queue) -> None:
+    """
+    Run one pipeline stage in the current (fresh) process and report its metrics.
+
+    Args:
+        stage: extract, transform or parquet
+        options: Runner options (storage root, fake API url, codecs, ...)
+        queue: Queue receiving the metrics
+    """
+    logging.disable(logging.INFO)
+
+    import pendulum
+    from dags.config.config import Config
+    from plugins.operators.gcs_json_to_parquet import GCSJsonToParquetOperator
+    from plugins.operators.gcs_transform import GCSTransformOperator
+    from plugins.operators.github_to_gcs import GitHubToGCSOperator
+
+    Config.LOCAL_STORAGE_ROOT = options['storage_root']
+    Config.LOCAL_STORAGE_LATENCY_SECONDS = options['storage_latency']
+
+    if stage == 'extract':
+        operator = GitHubToGCSOperator(
+            task_id='benchmark_extract',
+            github_token='benchmark',
+            bronze_path=Config.BRONZE_PATH,
+            api_url=options['api_url'],
+            api_mode=options['api_mode'],
+            graphql_url=options['graphql_url'],
+            batch_size=options['page_size'],
+            max_concurrency=options['api_concurrency'],
+            compression=options['compression'],
+            storage_backend='local'
+        )
+    elif stage == 'transform':
+        operator = GCSTransformOperator(
+            task_id='benchmark_transform',
+            src_path=Config.BRONZE_PATH,
+            dest_path=Config.SILVER_PATH,
+            compression=options['compression'],
+            transform_engine=options['transform_engine'],
+            max_concurrency=options['blob_concurrency'],
+            storage_backend='local'
+        )
+    else:
+        operator = GCSJsonToParquetOperator(
+            task_id='benchmark_parquet',
+            src_path=Config.SILVER_PATH,
+            dest_path=Config.GOLD_PATH,
+            max_concurrency=options['blob_concurrency'],
+            storage_backend='local'
+        )
+
+    context = {'execution_date': pendulum.datetime(BENCHMARK_DAY.year, BENCHMARK_DAY.month, BENCHMARK_DAY.day, 8, tz='UTC')}
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    operator.execute(context)
+    seconds = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss is reported in KiB on Linux
+    queue.put({
+        "seconds": seconds,
+        "peak_rss_mb": peak_kb / 1024,
+        "peak_rss_growth_mb": (peak_kb - baseline_kb) / 1024
+    })
+
+def spawn_stage(stage: str, options: Dict) -> Dict:
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=run_stage, args=(stage, options, queue))
+    process.start()
+    process.join()
+    if process.exitcode != 0:
+        raise SystemExit(f"Stage {stage} failed with exit code {process.exitcode}")
+    return queue.get()
+
+def partition_files(storage_root: str, prefix_path: str, pattern: str) -> List[str]:
+    from dags.config.config import Config
+
+    partition_dir = os.path.join(storage_root, Config.GCS_BUCKET, prefix_path, f"dt={BENCHMARK_DAY.isoformat()}")
+    return sorted(glob.glob(os.path.join(partition_dir, pattern)))
+
+def count_rows(stage: str, files: List[str]) -> int:
+    import pyarrow.parquet as pq
+    from plugins.utils.compression import get_codec_from_name, open_decompressed_reader
+
+    if stage == 'parquet':
+        return sum(pq.read_metadata(path).num_rows for path in files)
+
+    # Decompressed streams (e.g. zstd) are not line-iterable, so non-blank lines are counted over chunked reads
+    rows = 0
+    for path in files:
+        with open(path, 'rb') as raw, open_decompressed_reader(raw, get_codec_from_name(path)) as reader:
+            tail = b''
+            while True:
+                chunk = reader.read(1024 * 1024)
+                if not chunk:
+                    break
+                lines = (tail + chunk).split(b'\n')
+                tail = lines.pop()
+                rows += sum(1 for line in lines if line.strip())
+            rows += 1 if tail.strip() else 0
+    return rows
+
+def run_day(commits: int, args: argparse.Namespace) -> Dict:
+    from dags.config.config import Config
+
+    day_commits = generate_commits(
+        commits,
+        seed=args.seed,
+        committers=args.committers,
+        null_committer_ratio=args.null_committer_ratio,
+        day=BENCHMARK_DAY
+    )
+
+    result = {"commits": commits, "stages": {}}
+    with tempfile.TemporaryDirectory() as storage_root, FakeGitHubCommitsAPI(day_commits, latency=args.api_latency) as api:
+        options = {
+            "storage_root": storage_root,
+            "storage_latency": args.storage_latency,
+            "api_url": api.url,
+            "api_mode": args.api_mode,
+            "graphql_url": api.graphql_url,
+            "page_size": args.page_size,
+            "api_concurrency": args.api_concurrency,
+            "blob_concurrency": args.blob_concurrency,
+            "compression": args.compression,
+            "transform_engine": args.transform_engine
+        }
+        outputs = {
+            "extract": (Config.BRONZE_PREFIX_PATH, 'part-*'),
+            "transform": (Config.SILVER_PREFIX_PATH, 'part-*'),
+            "parquet": (Config.GOLD_PREFIX_PATH, 'part-*.parquet')
+        }
+
+        input_bytes = None
+        for stage in STAGES:
+            metrics = spawn_stage(stage, options)
+            if stage == 'extract':
+                input_bytes = api.bytes_served
+            files = partition_files(storage_root, *outputs[stage])
+            output_bytes = sum(os.path.getsize(path) for path in files)
+            rows = count_rows(stage, files)
+
+            metrics.update({
+                "rows": rows,
+                "input_bytes": input_bytes,
+                "output_bytes": output_bytes,
+                "rows_per_second": rows / metrics["seconds"],
+                "bytes_per_second": output_bytes / metrics["seconds"]
+            })
+            result["stages"][stage] = metrics
+            input_bytes = output_bytes
+    return result
+
+def get_git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_results(results: List[Dict], baseline: Optional[Dict] = None) -> None:
+    baseline_stages = {}
+    for day in (baseline or {}).get("results", []):
+        baseline_stages.update({(day["commits"], stage): metrics for stage, metrics in day["stages"].items()})
+
+    print(f"{'commits':>9} {'stage':<10} {'seconds':>8} {'rows/s':>11} {'MB/s':>8} {'out MB':>8} {'peak RSS MB':>12}  {'vs baseline':>11}")
+    for day in results:
+        for stage, m in day["stages"].items():
+            previous = baseline_stages.get((day["commits"], stage))
+            ratio = f"{m['rows_per_second'] / previous['rows_per_second']:.2f}x" if previous else ''
+            print(
+                f"{day['commits']:>9} {stage:<10} {m['seconds']:>8.2f} {m['rows_per_second']:>11,.0f} "
+                f"{m['bytes_per_second'] / 1e6:>8.2f} {m['output_bytes'] / 1e6:>8.2f} {m['peak_rss_mb']:>12.1f}  {ratio:>11}"
+            )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commits", type=int, nargs='+', default=[10000, 50000], help="Commits per day, one run per value")
+    parser.add_argument("--committers", type=int, default=500, help="Distinct committers")
+    parser.add_argument("--null-committer-ratio", type=float, default=0.05, help="Share of commits without a committer account")
+    parser.add_argument("--seed", type=int, default=42, help="Generator seed")
+    parser.add_argument("--page-size", type=int, default=100, help="Commits per API page (bronze part)")
+    parser.add_argument("--api-mode", default='rest', help="Extraction API (rest, graphql)")
+    parser.add_argument("--api-concurrency", type=int, default=8, help="Pages fetched in parallel")
+    parser.add_argument("--blob-concurrency", type=int, default=4, help="Part files processed in parallel")
+    parser.add_argument("--compression", default='gzip', help="Bronze / silver codec (none, gzip, zstd)")
+    parser.add_argument("--transform-engine", default='columnar', help="Transform engine (columnar, python)")
+    parser.add_argument("--api-latency", type=float, default=0.0, help="Seconds added to every fake API response")
+    parser.add_argument("--storage-latency", type=float, default=0.0, help="Seconds added to every local storage request")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Results JSON of a previous run to compare rows/s against")
+    args = parser.parse_args()
+
+    results = [run_day(commits, args) for commits in args.commits]
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+    print_results(results, baseline)
+
+    if args.output:
+        report = {
+            "git_revision": get_git_revision(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "parameters": vars(args),
+            "results": results
+        }
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Micro-benchmark of the silver transform: row-by-row python vs columnar pyarrow.
+
+Both engines run on the same synthetic bronze NDJSON and their serialized
+output is compared byte for byte before any timing is reported.
+
+Usage (from src/):
+    python -m benchmarks.transform_benchmark --commits 50000 --repeat 3
+"""
+import argparse
+import time
+from typing import Callable
+
+from benchmarks.commit_generator import generate_commits
+from plugins.operators.gcs_transform import GCSTransformOperator
+from plugins.utils.arrow_transform import read_github_commits_table, transform_github_commits_table
+from plugins.utils.json_utils import iter_json_records, to_ndjson_line
+
+def run_python(bronze: bytes) -> bytes:
+    operator = GCSTransformOperator(task_id='benchmark_transform', src_path='', dest_path='', transform_engine='python')
+    transformed = operator.transform_github_commits(list(iter_json_records(bronze)))
+    return b''.join(to_ndjson_line(record) for record in transformed)
+
+def run_columnar(bronze: bytes) -> bytes:
+    transformed = transform_github_commits_table(read_github_commits_table(bronze))
+    return b''.join(to_ndjson_line(record) for record in transformed.to_pylist())
+
+def best_of(func: Callable[[bytes], bytes], bronze: bytes, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(bronze)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commits", type=int, default=50000, help="Commits in the synthetic bronze file")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per engine (best is reported)")
+    args = parser.parse_args()
+
+    bronze = b''.join(to_ndjson_line(commit) for commit in generate_commits(args.commits))
+
+    if run_python(bronze) != run_columnar(bronze):
+        raise SystemExit("Columnar transform output differs from the python transform")
+
+    python_seconds = best_of(run_python, bronze, args.repeat)
+    columnar_seconds = best_of(run_columnar, bronze, args.repeat)
+
+    print(f"commits:  {args.commits} ({len(bronze) / 1e6:.1f} MB bronze), outputs byte-identical")
+    print(f"python:   {python_seconds:.3f}s ({args.commits / python_seconds:,.0f} rows/s)")
+    print(f"columnar: {columnar_seconds:.3f}s ({args.commits / columnar_seconds:,.0f} rows/s)")
+    print(f"speedup:  {python_seconds / columnar_seconds:.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Memory regression check of the streaming silver transform.
+
+A small and a large synthetic bronze day (gzip NDJSON on local disk) are
+streamed through GCSTransformOperator.stream_transform_github_commits in
+fresh processes, and the growth of peak RSS during the transform is
+compared. Streaming keeps memory roughly constant, so the large day must
+not need much more memory than the small one; the script exits non-zero
+when it does.
+
+Usage (from src/):
+    python -m benchmarks.transform_memory_benchmark --commits 20000 --scale 5
+"""
+import argparse
+import gzip
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+from typing import Dict
+
+from benchmarks.commit_generator import generate_commits
+from plugins.utils.compression import open_compressed_writer, open_decompressed_reader
+from plugins.utils.json_utils import to_ndjson_line
+
+def write_bronze(path: str, commits: int, base_commits: int = 5000) -> None:
+    # Repeat a base batch so the generator itself does not need the whole day in memory
+    base = [to_ndjson_line(commit) for commit in generate_commits(base_commits)]
+    with gzip.open(path, 'wb') as bronze_file:
+        for i in range(commits):
+            bronze_file.write(base[i % base_commits])
+
+def measure(path: str, engine: str, queue: multiprocessing.Queue) -> None:
+    from plugins.operators.gcs_transform import GCSTransformOperator
+
+    operator = GCSTransformOperator(task_id='benchmark_transform', src_path='', dest_path='', transform_engine=engine)
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    rows = 0
+    with open(path, 'rb') as raw, open_decompressed_reader(raw, 'gzip') as reader:
+        with open(os.devnull, 'wb') as sink, open_compressed_writer(sink, 'gzip') as writer:
+            for record in operator.stream_transform_github_commits(reader):
+                writer.write(to_ndjson_line(record))
+                rows += 1
+
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in KiB on Linux
+    queue.put({"rows": rows, "peak_rss_growth_mb": (after - before) / 1024})
+
+def run(path: str, engine: str) -> Dict:
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=measure, args=(path, engine, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commits", type=int, default=20000, help="Commits in the small day")
+    parser.add_argument("--scale", type=int, default=5, help="The large day has scale x commits")
+    parser.add_argument("--tolerance-mb", type=float, default=32, help="Allowed extra peak RSS growth of the large day")
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        small_path = os.path.join(tmp_dir, 'small.json.gz')
+        large_path = os.path.join(tmp_dir, 'large.json.gz')
+        write_bronze(small_path, args.commits)
+        write_bronze(large_path, args.commits * args.scale)
+
+        for engine in ('columnar', 'python'):
+            small = run(small_path, engine)
+            large = run(large_path, engine)
+            ok = large["peak_rss_growth_mb"] <= small["peak_rss_growth_mb"] * 1.5 + args.tolerance_mb
+            failed = failed or not ok
+            print(
+                f"{engine:<9} {small['rows']:>9} rows: +{small['peak_rss_growth_mb']:.1f} MB   "
+                f"{large['rows']:>9} rows: +{large['peak_rss_growth_mb']:.1f} MB   {'OK' if ok else 'REGRESSION'}"
+            )
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,21 @@
 from dataclasses import dataclass
-from airflow.models import Variable
 
 @dataclass
 class Config:
     # GitHub API Configuration
-    GITHUB_API_URL = "https://api.github.com/repos/torvalds/linux/commits"
-    GITHUB_TOKEN = Variable.get("GITHUB_TOKEN_SECRET")
+    # Commits endpoint, formatted with each repository of GITHUB_REPOS
+    GITHUB_API_URL = "https://api.github.com/repos/{repo}/commits"
+    # Repositories extracted by the DAG, one mapped task instance per repository and stage
+    GITHUB_REPOS = ["torvalds/linux"]
+    # rest: commits endpoint (full payloads), graphql: commit history with only the fields kept by silver
+    GITHUB_API_MODE = "rest"
+    GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+    # Template of the operator's github_token, so the variable is read when the task runs rather than
+    # on every DAG parse (variables named *SECRET* are masked in logs and rendered fields)
+    GITHUB_TOKEN = "{{ var.value.GITHUB_TOKEN_SECRET }}"
+    
+    # Last schedule date of the ETL DAG (pendulum datetime), None keeps it scheduling new days
+    ETL_END_DATE = None
     
     # GCS Configuration
     GCS_BUCKET = "airr-labs-interview"
@@ -18,13 +28,104 @@ class Config:
     SILVER_PATH = f"gs://{GCS_BUCKET}/{SILVER_PREFIX_PATH}"
     GOLD_PATH = f"gs://{GCS_BUCKET}/{GOLD_PREFIX_PATH}"
     
+    # Hourly commit counts aggregated by the gold stage, loaded as the f_commits_hourly partition of the day
+    GOLD_F_COMMITS_HOURLY_PREFIX_PATH = "gold/f_commits_hourly"
+    GOLD_F_COMMITS_HOURLY_PATH = f"gs://{GCS_BUCKET}/{GOLD_F_COMMITS_HOURLY_PREFIX_PATH}"
+    
+    # SHAs of the commits kept by each gold partition (repo=owner__name/month=YYYY-MM/dt=YYYY-MM-DD.parquet), checked by
+    # the stage writing gold so a commit reaching several partitions (overlapping windows, retries) is loaded once
+    GOLD_COMMIT_SHA_INDEX_PREFIX_PATH = "gold/commit_sha_index"
+    GOLD_COMMIT_SHA_INDEX_PATH = f"gs://{GCS_BUCKET}/{GOLD_COMMIT_SHA_INDEX_PREFIX_PATH}"
+    DEDUP_COMMIT_SHAS = True
+    
+    # Gold parts compacted into one parquet object per month (month=YYYY-MM/), current objects listed in its manifest
+    GOLD_MONTHLY_PREFIX_PATH = "gold/github_commits_monthly"
+    GOLD_MONTHLY_PATH = f"gs://{GCS_BUCKET}/{GOLD_MONTHLY_PREFIX_PATH}"
+    
+    # Streaming uploads buffer one chunk at a time (must be a multiple of 256 KiB)
+    GCS_UPLOAD_CHUNK_SIZE = 4 * 256 * 1024
+    GCS_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+    
+    # Storage backend of the lake: gcs (GCSHook) or local (filesystem, same bucket/prefix/dt=... layout)
+    STORAGE_BACKEND = "gcs"
+    LOCAL_STORAGE_ROOT = "/tmp/airflow/local_storage"
+    # Seconds added to every local storage request (and streamed chunk) to imitate object-store round trips
+    LOCAL_STORAGE_LATENCY_SECONDS = 0.0
+    
+    # Part files of a partition processed at the same time, and cap on their total size once decompressed
+    # (estimated from the stored size, see plugins/utils/compression.py CODEC_EXPANSION_RATIOS)
+    BLOB_MAX_CONCURRENCY = 4
+    BLOB_MAX_IN_FLIGHT_BYTES = 256 * 1024 * 1024
+    
+    # Compression codec of bronze / silver objects: none, gzip or zstd (object suffix .gz / .zst)
+    BRONZE_COMPRESSION = "gzip"
+    SILVER_COMPRESSION = "gzip"
+    
+    # Transform engine of the silver stage: columnar (pyarrow) or python (row by row)
+    TRANSFORM_ENGINE = "columnar"
+    
+    # Gold parquet layout
+    GOLD_PARQUET_COMPRESSION = "snappy"
+    GOLD_PARQUET_ROW_GROUP_SIZE = 128 * 1024
+    # Smaller row groups in the monthly objects, so dt / committer_email filters prune more of a month
+    GOLD_COMPACTION_ROW_GROUP_SIZE = 64 * 1024
+    
+    # three_stage: bronze -> silver -> gold tasks, fused: bronze -> gold in one task
+    PIPELINE_MODE = "three_stage"
+    # In fused mode, also write silver NDJSON as a side output
+    FUSED_WRITE_SILVER = False
+    
+    # Skip transform / parquet (and the load and merges) when a partition's content hash is unchanged
+    SKIP_UNCHANGED_PARTITIONS = True
+    
+    # Per-stage metrics: StatsD name prefix, and an optional NDJSON file also receiving them
+    METRICS_PREFIX = "github_commits_etl"
+    METRICS_FILE_PATH = None
+    
     # BigQuery Configuration
     PROJECT_ID = "personal-project-447516"
     DATASET_ID = "airr_labs_interview"
     
     STAGING_COMMITS_TABLE_NAME = "staging_commits"
     
+    # Explicit load schema, matches staging_commits in sql/init_table.sql and the gold parquet schema
+    STAGING_COMMITS_SCHEMA_FIELDS = [
+        {"name": "commit_sha", "type": "STRING", "mode": "NULLABLE"},
+        {"name": "committer_id", "type": "INT64", "mode": "NULLABLE"},
+        {"name": "committer_name", "type": "STRING", "mode": "NULLABLE"},
+        {"name": "committer_email", "type": "STRING", "mode": "NULLABLE"},
+        {"name": "committer_date", "type": "STRING", "mode": "NULLABLE"},
+        {"name": "dt", "type": "DATE", "mode": "NULLABLE"},
+        {"name": "repo", "type": "STRING", "mode": "NULLABLE"},
+    ]
+    
+    F_COMMITS_HOURLY_TABLE_NAME = "f_commits_hourly"
+    
+    # Explicit load schema, matches f_commits_hourly in sql/init_table.sql and plugins/utils/commits_hourly.py
+    F_COMMITS_HOURLY_SCHEMA_FIELDS = [
+        {"name": "d_date_id", "type": "INT64", "mode": "NULLABLE"},
+        {"name": "d_time_id", "type": "INT64", "mode": "NULLABLE"},
+        {"name": "committer_id", "type": "INT64", "mode": "NULLABLE"},
+        {"name": "committer_email", "type": "STRING", "mode": "NULLABLE"},
+        {"name": "commit_count", "type": "INT64", "mode": "NULLABLE"},
+        {"name": "dt", "type": "DATE", "mode": "NULLABLE"},
+        {"name": "repo", "type": "STRING", "mode": "NULLABLE"},
+    ]
+    
     GCS_AIRR_LAB_CONNECTION = 'gcs_airr_lab_interviews'
     
     # Batch Configuration
     API_BATCH_SIZE = 100
+    API_MAX_CONCURRENCY = 8
+    # Repositories extracted at the same time across all runs, each with up to API_MAX_CONCURRENCY requests in flight
+    API_MAX_ACTIVE_EXTRACTS = 2
+    
+    # Shared by every task using GITHUB_TOKEN on the worker
+    API_RATE_LIMIT_STATE_PATH = "/tmp/airflow/github_rate_limit.json"
+    
+    # Conditional-request (ETag) cache for commit pages
+    API_CACHE_DIR = "/tmp/airflow/github_response_cache"
+    API_CACHE_MAX_BYTES = 512 * 1024 * 1024
+    
+    # Daily extracts leave partitions written by the backfill DAG (one API sweep over a date range) as they are
+    EXTRACT_SKIP_BACKFILLED = True
@@ -0,0 +1,56 @@
+from airflow import DAG
+from airflow.models.param import Param
+from datetime import timedelta
+
+from plugins.operators.github_to_gcs import GitHubToGCSOperator
+from dags.config.config import Config
+
+import pendulum
+
+default_args = {
+    'owner': 'airflow',
+    'depends_on_past': False,
+    'email_on_failure': True,
+    'email_on_retry': False,
+    'retries': 3,
+    'retry_delay': timedelta(minutes=5),
+}
+
+# Triggered manually: extracts a whole date range to bronze in one API sweep.
+# The daily github_commits_etl runs then process the backfilled partitions
+# (their extract task leaves them as they are, see EXTRACT_SKIP_BACKFILLED).
+with DAG(
+    'github_commits_backfill',
+    default_args=default_args,
+    description='Backfill GitHub commits to bronze for a date range in one API sweep',
+    schedule_interval=None,
+    start_date=pendulum.datetime(2024, 1, 1, tz="UTC"),
+    catchup=False,
+    tags=['github', 'backfill', 'airr_labs'],
+    max_active_runs=1,
+    params={
+        'start_date': Param(type='string', format='date', description='First partition day (YYYY-MM-DD)'),
+        'end_date': Param(type='string', format='date', description='Last partition day (YYYY-MM-DD), inclusive'),
+    }
+) as dag:
+
+    # Extract every commit of the range and split it into dt= bronze partitions, one instance per repository
+    backfill_github_raw_data_to_gcs = GitHubToGCSOperator.partial(
+        task_id='backfill_github_raw_data_to_gcs',
+        github_token=Config.GITHUB_TOKEN,
+        bronze_path=Config.BRONZE_PATH,
+        api_url=Config.GITHUB_API_URL,
+        api_mode=Config.GITHUB_API_MODE,
+        graphql_url=Config.GITHUB_GRAPHQL_URL,
+        batch_size=Config.API_BATCH_SIZE,
+        max_concurrency=Config.API_MAX_CONCURRENCY,
+        rate_limit_state_path=Config.API_RATE_LIMIT_STATE_PATH,
+        cache_dir=Config.API_CACHE_DIR,
+        cache_max_bytes=Config.API_CACHE_MAX_BYTES,
+        compression=Config.BRONZE_COMPRESSION,
+        storage_backend=Config.STORAGE_BACKEND,
+        metrics_file_path=Config.METRICS_FILE_PATH,
+        backfill_start_date='{{ params.start_date }}',
+        backfill_end_date='{{ params.end_date }}',
+        max_active_tis_per_dag=Config.API_MAX_ACTIVE_EXTRACTS
+    ).expand(repo=Config.GITHUB_REPOS)
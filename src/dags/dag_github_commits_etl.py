@@ -6,6 +6,8 @@ from datetime import timedelta
 from plugins.operators.github_to_gcs import GitHubToGCSOperator
 from plugins.operators.gcs_transform import GCSTransformOperator
 from plugins.operators.gcs_json_to_parquet import GCSJsonToParquetOperator
+from plugins.operators.gcs_mark_loaded import GCSMarkPartitionLoadedOperator
+from plugins.operators.gcs_compact_gold import GCSCompactGoldOperator
 from dags.config.config import Config
 
 import pendulum
@@ -19,18 +21,15 @@ default_args = {
     'retry_delay': timedelta(minutes=5),
 }
 
-# Define end_date as the current time with Ho_Chi_Minh timezone
-end_date = pendulum.now("Asia/Ho_Chi_Minh")
-# Define start_date as 6 months before the end_date
-start_date = end_date.subtract(months=6)
-
 with DAG(
     'github_commits_etl',
     default_args=default_args,
     description='ETL pipeline for GitHub commits',
     schedule_interval='0 8 * * *',  # Daily UTC
-    start_date=start_date,
-    end_date=end_date,
+    # Fixed, so every parse describes the same schedule (pendulum.now() moved the window on each parse)
+    start_date=pendulum.datetime(2024, 8, 1, tz="Asia/Ho_Chi_Minh"),
+    end_date=Config.ETL_END_DATE,
+    # Catchup runs are worked off at most max_active_runs at a time
     catchup=True,
     tags=['github', 'etl', 'airr_labs'],
     max_active_runs=18
@@ -49,36 +48,78 @@ with DAG(
         }
     )
 
+    # Tasks 1-3 are mapped over the repositories, each instance handles one dt=.../repo=... partition
+
     # Task 1: Extract raw data from GitHub API to GCS (Bronze)
-    extract_github_raw_data_to_gcs = GitHubToGCSOperator(
+    # Every instance draws from the same rate limit budget (shared governor state), and at most
+    # API_MAX_ACTIVE_EXTRACTS of them call the API at the same time
+    extract_github_raw_data_to_gcs = GitHubToGCSOperator.partial(
         task_id='extract_github_raw_data_to_gcs',
         github_token=Config.GITHUB_TOKEN,
         bronze_path=Config.BRONZE_PATH,
         api_url=Config.GITHUB_API_URL,
-        batch_size=Config.API_BATCH_SIZE
-    )
+        api_mode=Config.GITHUB_API_MODE,
+        graphql_url=Config.GITHUB_GRAPHQL_URL,
+        batch_size=Config.API_BATCH_SIZE,
+        max_concurrency=Config.API_MAX_CONCURRENCY,
+        rate_limit_state_path=Config.API_RATE_LIMIT_STATE_PATH,
+        cache_dir=Config.API_CACHE_DIR,
+        cache_max_bytes=Config.API_CACHE_MAX_BYTES,
+        compression=Config.BRONZE_COMPRESSION,
+        storage_backend=Config.STORAGE_BACKEND,
+        metrics_file_path=Config.METRICS_FILE_PATH,
+        skip_backfilled=Config.EXTRACT_SKIP_BACKFILLED,
+        max_active_tis_per_dag=Config.API_MAX_ACTIVE_EXTRACTS
+    ).expand(repo=Config.GITHUB_REPOS)
 
+    fused = Config.PIPELINE_MODE == 'fused'
+    
     # Task 2: Transform data (normalize json to keep only necessary fields)
-    transform_gcs_raw_to_staging_data = GCSTransformOperator(
+    # In fused mode this task also writes gold parquet directly and Task 3 is skipped
+    transform_gcs_raw_to_staging_data = GCSTransformOperator.partial(
         task_id='transform_gcs_raw_to_staging_data',
         src_path=Config.BRONZE_PATH,
-        dest_path=Config.SILVER_PATH
-    )
+        dest_path=Config.SILVER_PATH,
+        compression=Config.SILVER_COMPRESSION,
+        transform_engine=Config.TRANSFORM_ENGINE,
+        gold_path=Config.GOLD_PATH if fused else None,
+        write_silver=Config.FUSED_WRITE_SILVER if fused else True,
+        fact_path=Config.GOLD_F_COMMITS_HOURLY_PATH if fused else None,
+        sha_index_path=Config.GOLD_COMMIT_SHA_INDEX_PATH if fused and Config.DEDUP_COMMIT_SHAS else None,
+        parquet_compression=Config.GOLD_PARQUET_COMPRESSION,
+        row_group_size=Config.GOLD_PARQUET_ROW_GROUP_SIZE,
+        max_concurrency=Config.BLOB_MAX_CONCURRENCY,
+        max_in_flight_bytes=Config.BLOB_MAX_IN_FLIGHT_BYTES,
+        storage_backend=Config.STORAGE_BACKEND,
+        metrics_file_path=Config.METRICS_FILE_PATH,
+        skip_unchanged=Config.SKIP_UNCHANGED_PARTITIONS
+    ).expand(repo=Config.GITHUB_REPOS)
     
     # Task 3: Convert normalized json to parquet files
-    convert_json_to_parquet_gcs_data = GCSJsonToParquetOperator(
-        task_id='convert_json_to_parquet_gcs_data',
-        src_path=Config.SILVER_PATH,
-        dest_path=Config.GOLD_PATH
-    )
+    if not fused:
+        convert_json_to_parquet_gcs_data = GCSJsonToParquetOperator.partial(
+            task_id='convert_json_to_parquet_gcs_data',
+            src_path=Config.SILVER_PATH,
+            dest_path=Config.GOLD_PATH,
+            fact_path=Config.GOLD_F_COMMITS_HOURLY_PATH,
+            sha_index_path=Config.GOLD_COMMIT_SHA_INDEX_PATH if Config.DEDUP_COMMIT_SHAS else None,
+            parquet_compression=Config.GOLD_PARQUET_COMPRESSION,
+            row_group_size=Config.GOLD_PARQUET_ROW_GROUP_SIZE,
+            max_concurrency=Config.BLOB_MAX_CONCURRENCY,
+            max_in_flight_bytes=Config.BLOB_MAX_IN_FLIGHT_BYTES,
+            storage_backend=Config.STORAGE_BACKEND,
+            metrics_file_path=Config.METRICS_FILE_PATH,
+            skip_unchanged=Config.SKIP_UNCHANGED_PARTITIONS
+        ).expand(repo=Config.GITHUB_REPOS)
     
-    # Task 4: Load data to warehouse
+    # Task 4: Load data to warehouse, one load of the day for every repository
+    # Runs when at least one repository produced new gold content, skipped when all of them are already loaded
     update_staging_commits_table = GCSToBigQueryOperator(
         task_id='update_staging_commits_table',
         gcp_conn_id=Config.GCS_AIRR_LAB_CONNECTION,
         bucket=Config.GCS_BUCKET,
         source_objects=[
-            f"{Config.GOLD_PREFIX_PATH}/dt={{{{ ds }}}}/commits.parquet"
+            f"{Config.GOLD_PREFIX_PATH}/dt={{{{ ds }}}}/repo=*.parquet"
         ],
         destination_project_dataset_table=(
             f"{Config.PROJECT_ID}.{Config.DATASET_ID}.{Config.STAGING_COMMITS_TABLE_NAME}${{{{ ds_nodash }}}}"
@@ -86,11 +127,13 @@ with DAG(
         source_format='PARQUET',
         write_disposition='WRITE_TRUNCATE',
         create_disposition='CREATE_IF_NEEDED',
-        autodetect=True,
+        autodetect=False,
+        schema_fields=Config.STAGING_COMMITS_SCHEMA_FIELDS,
         time_partitioning={
             'type': 'DAY',
             'field': 'dt',
-        }
+        },
+        trigger_rule='none_failed_min_one_success'
     )
     
     # Task 5: Update record in date dimension
@@ -106,23 +149,94 @@ with DAG(
         }
     )
 
-    # Task 6: Update record in fact
-    update_f_commits_hourly = BigQueryInsertJobOperator(
+    # Task 6: Replace the fact partition of the day with the hourly counts aggregated by the gold stage
+    # (a partition-decorator load, no DML), like Task 4 for every repository at once
+    update_f_commits_hourly = GCSToBigQueryOperator(
         task_id='update_f_commits_hourly',
         gcp_conn_id=Config.GCS_AIRR_LAB_CONNECTION,
+        bucket=Config.GCS_BUCKET,
+        source_objects=[
+            f"{Config.GOLD_F_COMMITS_HOURLY_PREFIX_PATH}/dt={{{{ ds }}}}/repo=*.parquet"
+        ],
+        destination_project_dataset_table=(
+            f"{Config.PROJECT_ID}.{Config.DATASET_ID}.{Config.F_COMMITS_HOURLY_TABLE_NAME}${{{{ ds_nodash }}}}"
+        ),
+        source_format='PARQUET',
+        write_disposition='WRITE_TRUNCATE',
+        create_disposition='CREATE_IF_NEEDED',
+        autodetect=False,
+        schema_fields=Config.F_COMMITS_HOURLY_SCHEMA_FIELDS,
+        time_partitioning={
+            'type': 'DAY',
+            'field': 'dt',
+        },
+        trigger_rule='none_failed_min_one_success'
+    )
+
+    # Task 7: Apply the day's fact partition to the per-committer state read by the reporting queries
+    # Days are applied in date order (depends_on_past), a run for an earlier day rebuilds the state
+    update_committer_summary = BigQueryInsertJobOperator(
+        task_id='update_committer_summary',
+        gcp_conn_id=Config.GCS_AIRR_LAB_CONNECTION,
         project_id=Config.PROJECT_ID,
         configuration={
             "query": {
-                'query': "{% include 'sql/merge_f_commits_hourly.sql' %}",
+                'query': "{% include 'sql/merge_committer_summary.sql' %}",
                 'useLegacySql': False,
             }    
-        }
+        },
+        depends_on_past=True
+    )
+
+    # Task 8: Apply the day's fact partition to the weekday x hour range heat map cube
+    # Days can be applied in any order, one at a time to avoid concurrent transactions on the cube
+    update_commits_heat_map = BigQueryInsertJobOperator(
+        task_id='update_commits_heat_map',
+        gcp_conn_id=Config.GCS_AIRR_LAB_CONNECTION,
+        project_id=Config.PROJECT_ID,
+        configuration={
+            "query": {
+                'query': "{% include 'sql/merge_commits_heat_map.sql' %}",
+                'useLegacySql': False,
+            }    
+        },
+        max_active_tis_per_dag=1
+    )
+
+    # Task 9: Record that the gold partition content is loaded, so unchanged re-runs skip Tasks 4-8
+    mark_gold_partition_loaded = GCSMarkPartitionLoadedOperator(
+        task_id='mark_gold_partition_loaded',
+        path=Config.GOLD_PATH,
+        storage_backend=Config.STORAGE_BACKEND,
+        repos=Config.GITHUB_REPOS
+    )
+
+    # Task 10: Compact the gold parts of the months changed since the last run into sorted monthly parquet
+    # Also runs when the day was unchanged (nothing to rewrite then), one run at a time as it owns the monthly manifest
+    compact_gold_monthly = GCSCompactGoldOperator(
+        task_id='compact_gold_monthly',
+        src_path=Config.GOLD_PATH,
+        dest_path=Config.GOLD_MONTHLY_PATH,
+        parquet_compression=Config.GOLD_PARQUET_COMPRESSION,
+        row_group_size=Config.GOLD_COMPACTION_ROW_GROUP_SIZE,
+        storage_backend=Config.STORAGE_BACKEND,
+        metrics_file_path=Config.METRICS_FILE_PATH,
+        trigger_rule='none_failed',
+        max_active_tis_per_dag=1
     )
 
     # Set task dependencies
     
-    # Ingest new data to staging table
-    init_table >> extract_github_raw_data_to_gcs >> transform_gcs_raw_to_staging_data >> convert_json_to_parquet_gcs_data >> update_staging_commits_table
+    # Ingest new data to staging table and fact
+    if fused:
+        init_table >> extract_github_raw_data_to_gcs >> transform_gcs_raw_to_staging_data >> [update_staging_commits_table, update_f_commits_hourly]
+    else:
+        init_table >> extract_github_raw_data_to_gcs >> transform_gcs_raw_to_staging_data >> convert_json_to_parquet_gcs_data >> [update_staging_commits_table, update_f_commits_hourly]
     
     # Update data mart
-    update_staging_commits_table >> [update_d_date, update_f_commits_hourly]
+    update_staging_commits_table >> update_d_date
+    update_f_commits_hourly >> [update_committer_summary, update_commits_heat_map]
+    [update_d_date, update_committer_summary, update_commits_heat_map] >> mark_gold_partition_loaded
+    
+    # Rebuild the monthly layout
+    mark_gold_partition_loaded >> compact_gold_monthly
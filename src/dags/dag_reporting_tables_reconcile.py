@@ -0,0 +1,55 @@
+from airflow import DAG
+from airflow.providers.google.cloud.operators.bigquery import BigQueryInsertJobOperator
+from datetime import timedelta
+
+from dags.config.config import Config
+
+import pendulum
+
+default_args = {
+    'owner': 'airflow',
+    'depends_on_past': False,
+    'email_on_failure': True,
+    'email_on_retry': False,
+    'retries': 1,
+    'retry_delay': timedelta(minutes=5),
+}
+
+# The reporting queries read committer_summary and commits_heat_map, maintained incrementally by
+# github_commits_etl. These checks recompute them (and the reporting query results) from the whole
+# f_commits_hourly history and fail on any difference; sql/rebuild_committer_summary.sql restores
+# the committer summary from the fact table.
+with DAG(
+    'reporting_tables_reconcile',
+    default_args=default_args,
+    description='Check the reporting tables against full scans of the commits fact table',
+    schedule_interval='0 12 * * 0',  # Weekly UTC, after the daily run
+    start_date=pendulum.datetime(2024, 1, 1, tz="UTC"),
+    catchup=False,
+    tags=['github', 'reconcile', 'airr_labs'],
+    max_active_runs=1
+) as dag:
+
+    reconcile_committer_summary = BigQueryInsertJobOperator(
+        task_id='reconcile_committer_summary',
+        gcp_conn_id=Config.GCS_AIRR_LAB_CONNECTION,
+        project_id=Config.PROJECT_ID,
+        configuration={
+            "query": {
+                'query': "{% include 'sql/reconcile_committer_summary.sql' %}",
+                'useLegacySql': False,
+            }
+        }
+    )
+
+    reconcile_commits_heat_map = BigQueryInsertJobOperator(
+        task_id='reconcile_commits_heat_map',
+        gcp_conn_id=Config.GCS_AIRR_LAB_CONNECTION,
+        project_id=Config.PROJECT_ID,
+        configuration={
+            "query": {
+                'query': "{% include 'sql/reconcile_commits_heat_map.sql' %}",
+                'useLegacySql': False,
+            }
+        }
+    )
@@ -1,38 +1,106 @@
-from airflow.providers.google.cloud.hooks.gcs import GCSHook
-from typing import List, Dict, Any
+from typing import List, Dict, Any, BinaryIO, Iterable, Iterator, Optional, Tuple, Union
+from contextlib import ExitStack, contextmanager
+import itertools
+import sys
 import json
-import pandas as pd
 from datetime import datetime
-from io import BytesIO
 import tempfile
 import os
 from dags.config.config import Config
+from plugins.storage import StorageBackend, create_storage_backend
+from plugins.utils.commits_hourly import F_COMMITS_HOURLY_BLOB_NAME, CommitsHourlyAggregator, write_commits_hourly_parquet
+from plugins.utils.compression import (
+    add_codec_suffix,
+    compress,
+    decompress,
+    get_codec_from_name,
+    open_compressed_writer,
+    open_decompressed_reader,
+    strip_codec_suffix,
+)
+from plugins.utils.json_utils import iter_json_records, to_ndjson_line
+from plugins.utils.metrics import NULL_METRICS, MeteredReader, MeteredWriter
+from plugins.utils.parallel import process_blobs_in_parallel, raise_on_blob_errors
+from plugins.utils.parquet_utils import read_silver_commits_table, write_gold_parquet
+from plugins.utils.repo_utils import get_repo_partition_prefix_str
+from plugins.utils.sha_index import CommitShaIndex
 from plugins.utils.time_utils import get_hive_partition_prefix_str
 
+import io
+
 import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
-import io
+
+# Partition-level metadata objects (e.g. `_manifest.json`) start with this prefix and are not data
+METADATA_BLOB_PREFIX = '_'
+
+# Records serialized per write when streaming NDJSON
+SERIALIZE_BATCH_ROWS = 1000
 
 class GCS:
     """
     Helper class for GCS operations with built-in partition date handling.
     """
     
-    def __init__(self, partition_date: datetime, gcp_conn_id = Config.GCS_AIRR_LAB_CONNECTION, log = None) -> None:
+    def __init__(
+        self,
+        partition_date: datetime,
+        gcp_conn_id = Config.GCS_AIRR_LAB_CONNECTION,
+        upload_chunk_size: int = Config.GCS_UPLOAD_CHUNK_SIZE,
+        download_chunk_size: int = Config.GCS_DOWNLOAD_CHUNK_SIZE,
+        log = None,
+        storage_backend: str = 'gcs',
+        storage: Optional[StorageBackend] = None,
+        metrics = None,
+        repo: Optional[str] = None
+    ) -> None:
         """
         Initialize GCSHelper with partition date.
         
         Args:
             partition_date: The partition date to use for operations
             gcp_conn_id: GCP connection ID for authentication
+            upload_chunk_size: Chunk size of streaming (resumable) uploads, a multiple of 256 KiB
+            download_chunk_size: Chunk size of streaming (ranged) downloads
             log: Logger instance for logging operations
+            storage_backend: Storage backend name, 'gcs' (GCSHook) or 'local' (filesystem with the same layout)
+            storage: Storage backend instance, overrides storage_backend
+            metrics: StageMetrics receiving phase timings and row / byte counts
+            repo: Repository full name (e.g. torvalds/linux); partitions are nested as dt=.../repo=...
         """
         self.partition_date = partition_date
-        self.hook_args = {'gcp_conn_id': gcp_conn_id}
-        self.gcs_hook = GCSHook(**self.hook_args)
+        self.repo = repo
+        self.upload_chunk_size = upload_chunk_size
+        self.download_chunk_size = download_chunk_size
+        self.storage = storage or create_storage_backend(storage_backend, gcp_conn_id=gcp_conn_id)
+        self.metrics = metrics or NULL_METRICS
         self.log = log
+    
+    @property
+    def partition_path(self) -> str:
+        """
+        Partition path relative to a layer prefix (dt=YYYY-MM-DD, or dt=YYYY-MM-DD/repo=owner__name).
+        """
+        partition_path = get_hive_partition_prefix_str(self.partition_date)
+        if self.repo:
+            partition_path = f"{partition_path}/{get_repo_partition_prefix_str(self.repo)}"
+        return partition_path
         
-    def process_bronze_files(self, src_gcs_bucket: str, src_prefix: str, dest_gcs_bucket: str, dest_prefix: str) -> List[Dict[str, str]]:
+    def process_bronze_files(
+        self,
+        src_gcs_bucket: str,
+        src_prefix: str,
+        dest_gcs_bucket: str,
+        dest_prefix: str,
+        parquet_compression: str = Config.GOLD_PARQUET_COMPRESSION,
+        row_group_size: int = Config.GOLD_PARQUET_ROW_GROUP_SIZE,
+        in_memory: bool = True,
+        max_concurrency: int = Config.BLOB_MAX_CONCURRENCY,
+        max_in_flight_bytes: int = Config.BLOB_MAX_IN_FLIGHT_BYTES,
+        aggregator: Optional[CommitsHourlyAggregator] = None,
+        sha_index: Optional[CommitShaIndex] = None
+    ) -> List[Dict[str, str]]:
         """
         Process JSON files from bronze layer and convert to parquet.
         
@@ -41,25 +109,32 @@ class GCS:
             src_prefix: Source prefix path in the bucket
             dest_gcs_bucket: Destination GCS bucket name
             dest_prefix: Destination prefix path in the bucket
+            parquet_compression: Parquet compression codec
+            row_group_size: Maximum number of rows per parquet row group
+            in_memory: Convert through in-memory buffers instead of temporary files
+            max_concurrency: Number of files downloaded, converted and uploaded at the same time
+            max_in_flight_bytes: Maximum total (estimated decompressed) size of the files being processed at once
+            aggregator: Receives every converted table, to build the hourly commit counts of the partition
+            sha_index: Drops the commits already kept by another partition (or another part) before writing
             
         Returns:
             List of processed files with their source and destination paths
         """
         # Format partition path using hive format
-        partition_path = get_hive_partition_prefix_str(self.partition_date)
-        full_src_prefix = f"{src_prefix}/{partition_path}"
+        partition_path = self.partition_path
         
-        # List all files in the partition
-        blobs = self.gcs_hook.list(bucket_name=src_gcs_bucket, prefix=full_src_prefix)
+        # List all part files in the partition, they form one logical partition
+        blobs = self.list_partition_blob_sizes(gcs_bucket=src_gcs_bucket, prefix=src_prefix, suffix='.json')
         
-        dirpath = tempfile.mkdtemp()
-        processed_files = []
-        for src_blob in blobs:
-            if not src_blob.endswith('.json'):
-                continue
-            
-            dest_file_name = os.path.basename(os.path.splitext(src_blob)[0])  + '.parquet'
+        # Drop parquet parts of a previous run so stale parts are not loaded
+        self.delete_partition(gcs_bucket=dest_gcs_bucket, prefix=dest_prefix)
+        
+        dirpath = None if in_memory else tempfile.mkdtemp()
+        
+        def process_blob(src_blob: str) -> Dict[str, str]:
+            dest_file_name = os.path.basename(os.path.splitext(strip_codec_suffix(src_blob))[0])  + '.parquet'
             dest_blob = f"{dest_prefix}/{partition_path}/{dest_file_name}"
+            part_name = os.path.splitext(dest_file_name)[0]
             
             if self.log:
                 self.log.info(f"Processing file: gs://{src_gcs_bucket}/{src_blob} -> gs://{dest_gcs_bucket}/{dest_blob}")
@@ -69,27 +144,137 @@ class GCS:
                 src_blob=src_blob,
                 dest_gcs_bucket=dest_gcs_bucket, 
                 dest_blob=dest_blob,
-                tmp_dir=dirpath
+                tmp_dir=dirpath,
+                parquet_compression=parquet_compression,
+                row_group_size=row_group_size,
+                part_name=part_name,
+                aggregator=aggregator,
+                sha_index=sha_index
             )
             
-            processed_files.append({
+            return {
                 "source": f"gs://{src_gcs_bucket}/{src_blob}",
                 "destination": f"gs://{dest_gcs_bucket}/{dest_blob}"
-            })
+            }
         
-        return processed_files
+        # Files are independent, so overlap their network I/O on a bounded worker pool
+        results = process_blobs_in_parallel(
+            blobs,
+            process_blob,
+            max_concurrency=max_concurrency,
+            max_in_flight_bytes=max_in_flight_bytes,
+            log=self.log
+        )
+        raise_on_blob_errors(results)
+        
+        # Duplicates across parts are settled once every part is read, so the output does not depend on the order parts finished in
+        if sha_index:
+            self.drop_commits_from_parts(
+                dest_gcs_bucket,
+                dest_prefix,
+                sha_index.resolve(),
+                parquet_compression=parquet_compression,
+                row_group_size=row_group_size,
+                aggregator=aggregator
+            )
+        
+        return [result["result"] for result in results]
     
-    def __download_json_upload_parquet(self, src_gcs_bucket: str, src_blob: str, dest_gcs_bucket: str, dest_blob: str, tmp_dir: str) -> None:
+    def drop_commits_from_parts(
+        self,
+        gcs_bucket: str,
+        prefix: str,
+        drops: Dict[str, pa.Array],
+        parquet_compression: str = Config.GOLD_PARQUET_COMPRESSION,
+        row_group_size: int = Config.GOLD_PARQUET_ROW_GROUP_SIZE,
+        aggregator: Optional[CommitsHourlyAggregator] = None
+    ) -> Dict[str, pa.Table]:
+        """
+        Rewrite gold parquet parts of the partition without some of their commits.
+        
+        Args:
+            gcs_bucket: The GCS bucket name
+            prefix: The prefix path of the gold layer in the bucket
+            drops: Mapping of part name (e.g. part-00001) to the SHAs to drop, as returned by CommitShaIndex.resolve
+            parquet_compression: Parquet compression codec
+            row_group_size: Maximum number of rows per parquet row group
+            aggregator: Uncounts the dropped commits, if any
+            
+        Returns:
+            Mapping of part name to its rewritten table
+        """
+        tables = {}
+        for part, shas in drops.items():
+            object_name = f"{prefix}/{self.partition_path}/{part}.parquet"
+            table = self.read_parquet_table(gcs_bucket=gcs_bucket, object_name=object_name)
+            dropped = pc.is_in(table['commit_sha'], value_set=shas)
+            if aggregator:
+                with self.metrics.phase('transform'):
+                    aggregator.remove(table.filter(dropped))
+            table = table.filter(pc.invert(dropped))
+            
+            if self.log:
+                self.log.info(f"Dropping {len(shas)} commits kept by a lower part from gs://{gcs_bucket}/{object_name}")
+            with self.open_blob_writer(gcs_bucket, object_name, content_type='application/octet-stream') as writer:
+                with self.metrics.phase('serialize'):
+                    write_gold_parquet([table], writer, compression=parquet_compression, row_group_size=row_group_size)
+            self.metrics.incr('rows_written', -len(shas))
+            tables[part] = table
+        return tables
+    
+    def __download_json_upload_parquet(
+        self,
+        src_gcs_bucket: str,
+        src_blob: str,
+        dest_gcs_bucket: str,
+        dest_blob: str,
+        tmp_dir: Optional[str],
+        parquet_compression: str,
+        row_group_size: int,
+        part_name: str,
+        aggregator: Optional[CommitsHourlyAggregator] = None,
+        sha_index: Optional[CommitShaIndex] = None
+    ) -> None:
         """
         Download JSON file from GCS, convert to parquet, and upload back to GCS.
         
         Args:
             src_gcs_bucket: Source GCS bucket name
-            src_blob: Source blob path (JSON file)
+            src_blob: Source blob path (JSON file, optionally compressed)
             dest_gcs_bucket: Destination GCS bucket name
             dest_blob: Destination blob path (Parquet file)
-            tmp_dir: Directory to store temporary files
+            tmp_dir: Directory to store temporary files, None to convert in memory
+            parquet_compression: Parquet compression codec
+            row_group_size: Maximum number of rows per parquet row group
+            part_name: Part name without extension (e.g. part-00001)
+            aggregator: Receives the converted table, if any
+            sha_index: Drops the duplicate commits of the converted table, if any
         """
+        if tmp_dir is None:
+            # In-memory round trip: no temporary files on local disk
+            parquet_buffer = io.BytesIO()
+            self.__convert_json_to_parquet(
+                json_input=io.BytesIO(self.download_bytes(gcs_bucket=src_gcs_bucket, object_name=src_blob)),
+                parquet_output=parquet_buffer,
+                parquet_compression=parquet_compression,
+                row_group_size=row_group_size,
+                part_name=part_name,
+                aggregator=aggregator,
+                sha_index=sha_index
+            )
+            
+            if self.log:
+                self.log.info(f"Uploading to GCS: gs://{dest_gcs_bucket}/{dest_blob}")
+            with self.metrics.phase('upload'):
+                self.storage.upload(
+                    bucket=dest_gcs_bucket,
+                    object_name=dest_blob,
+                    data=parquet_buffer.getvalue(),
+                    content_type='application/octet-stream'
+                )
+            self.metrics.incr('bytes_uploaded', parquet_buffer.tell())
+            return
+        
         # Generate temporary file paths with random suffixes
         temp_json = tempfile.NamedTemporaryFile(suffix='.json', dir=tmp_dir)
         temp_parquet = tempfile.NamedTemporaryFile(suffix='.parquet', dir=tmp_dir)
@@ -99,76 +284,443 @@ class GCS:
             self.log.info(f"Downloading from GCS: gs://{src_gcs_bucket}/{src_blob}")
             self.log.info(f"Writing to temporary file: {temp_json.name}")
             
-        json_input_path = self.gcs_hook.download(
-            bucket_name=src_gcs_bucket,
-            object_name=src_blob,
-            filename=temp_json.name
-        )
-        
-        if not json_input_path:
-            return
+        with self.metrics.phase('download'):
+            self.storage.download(
+                bucket=src_gcs_bucket,
+                object_name=src_blob,
+                filename=temp_json.name
+            )
+        self.metrics.incr('bytes_downloaded', os.path.getsize(temp_json.name))
         
-        self.__convert_json_to_parquet(json_input_path=json_input_path, parquet_output_path=temp_parquet.name)
+        with io.open(temp_json.name, 'rb') as raw_file, open_decompressed_reader(raw_file, get_codec_from_name(src_blob)) as json_input:
+            self.__convert_json_to_parquet(
+                json_input=json_input,
+                parquet_output=temp_parquet.name,
+                parquet_compression=parquet_compression,
+                row_group_size=row_group_size,
+                part_name=part_name,
+                aggregator=aggregator,
+                sha_index=sha_index
+            )
 
         # Upload parquet data
         if self.log:
             self.log.info(f"Uploading to GCS: gs://{dest_gcs_bucket}/{dest_blob}")
             self.log.info(f"Reading from temporary file: {temp_parquet.name}")
-        self.gcs_hook.upload(
-            bucket_name=dest_gcs_bucket,
-            object_name=dest_blob,
-            filename=temp_parquet.name,
-            mime_type='application/octet-stream'
-        )
+        with self.metrics.phase('upload'):
+            self.storage.upload(
+                bucket=dest_gcs_bucket,
+                object_name=dest_blob,
+                filename=temp_parquet.name,
+                content_type='application/octet-stream'
+            )
+        self.metrics.incr('bytes_uploaded', os.path.getsize(temp_parquet.name))
 
-    def __convert_json_to_parquet(self, json_input_path: str, parquet_output_path: str) -> None:
+    def __convert_json_to_parquet(
+        self,
+        json_input: BinaryIO,
+        parquet_output: Union[str, BinaryIO],
+        parquet_compression: str,
+        row_group_size: int,
+        part_name: str,
+        aggregator: Optional[CommitsHourlyAggregator] = None,
+        sha_index: Optional[CommitShaIndex] = None
+    ) -> None:
         """
         Convert JSON content to parquet format.
         
+        The JSON is read by pyarrow against the explicit gold schema (matching
+        `staging_commits`), no pandas DataFrame or schema inference involved.
+        
         Args:
-            json_input_path: Path to input JSON file
-            parquet_output_path: Path to save parquet file
+            json_input: Uncompressed JSON / NDJSON input stream
+            parquet_output: Path or buffer to write the parquet file to
+            parquet_compression: Parquet compression codec
+            row_group_size: Maximum number of rows per parquet row group
+            part_name: Part name without extension (e.g. part-00001)
+            aggregator: Receives the converted table, if any
+            sha_index: Drops the duplicate commits of the converted table, if any
         """
+        with self.metrics.phase('parse'):
+            table = read_silver_commits_table(json_input)
+        if sha_index:
+            table = sha_index.filter(table, part_name)
+        if aggregator:
+            with self.metrics.phase('transform'):
+                aggregator.add(table)
+        with self.metrics.phase('serialize'):
+            rows = write_gold_parquet([table], parquet_output, compression=parquet_compression, row_group_size=row_group_size)
+        self.metrics.incr('rows_written', rows)
+        
         if self.log:
-            self.log.info(f"json_input_path = {json_input_path}") 
-            self.log.info(f"parquet_output_path = {parquet_output_path}") 
+            self.log.info(f"Converted {rows} rows to parquet ({parquet_compression}, row groups of {row_group_size} rows)")
+    
+    def upload_to_gcs(self, gcs_bucket: str, prefix: str, blob_name: str, contents: Any, compression: str = 'none') -> str:
+        """
+        Upload JSON data to Google Cloud Storage.
         
-        with io.open(json_input_path, 'r', encoding='utf-8') as input_file:
-            file_content = input_file.read()
-            json_content = json.loads(file_content)
-            df = pd.DataFrame(json_content)
+        Args:
+            gcs_bucket: The GCS bucket name
+            prefix: The prefix path in the bucket
+            blob_name: The name of the file to upload
+            contents: The data to upload (will be JSON serialized)
+            compression: Compression codec, its suffix is appended to blob_name
             
-            # Only convert dt column to date if it exists
-            if 'dt' in df.columns:
-                df['dt'] = pd.to_datetime(df['dt']).dt.date
+        Returns:
+            Full GCS path of the uploaded file
+        """
+        
+        object_name = f"{prefix}/{self.partition_path}/{add_codec_suffix(blob_name, compression)}"
+        return self.upload_json(gcs_bucket, object_name, contents, compression=compression)
+    
+    def upload_json(self, gcs_bucket: str, object_name: str, contents: Any, compression: str = 'none') -> str:
+        """
+        Upload JSON data as a single object, replacing it at once if it exists.
+        
+        Args:
+            gcs_bucket: The GCS bucket name
+            object_name: Full object name in the bucket
+            contents: The data to upload (will be JSON serialized)
+            compression: Compression codec of the content
             
-            table = pa.Table.from_pandas(df)
-            pq.write_table(table, parquet_output_path)
+        Returns:
+            Full GCS path of the uploaded file
+        """
+        if self.log:
+            self.log.info(f"Uploading to GCS: gs://{gcs_bucket}/{object_name}")
+            
+        with self.metrics.phase('serialize'):
+            data = compress(json.dumps(contents, indent=2).encode('utf-8'), compression)
+        with self.metrics.phase('upload'):
+            self.storage.upload(
+                bucket=gcs_bucket,
+                object_name=object_name,
+                data=data,
+                content_type='application/json'
+            )
+        self.metrics.incr('bytes_uploaded', len(data))
+        
+        return f"gs://{gcs_bucket}/{object_name}"
     
-    def upload_to_gcs(self, gcs_bucket: str, prefix: str, blob_name: str, contents: Any) -> str:
+    def stream_to_gcs(self, gcs_bucket: str, prefix: str, blob_name: str, records: Iterable[Dict[str, Any]], compression: str = 'none') -> str:
         """
-        Upload JSON data to Google Cloud Storage.
+        Stream records to Google Cloud Storage as newline-delimited JSON.
+        
+        Records are serialized in small batches and sent through a chunked
+        resumable upload, so memory stays bounded by the upload chunk size
+        rather than the number of records.
         
         Args:
             gcs_bucket: The GCS bucket name
             prefix: The prefix path in the bucket
             blob_name: The name of the file to upload
-            contents: The data to upload (will be JSON serialized)
+            records: The records to upload (consumed lazily)
+            compression: Compression codec, its suffix is appended to blob_name
+            
+        Returns:
+            Full GCS path of the uploaded file
+        """
+        object_name = f"{prefix}/{self.partition_path}/{add_codec_suffix(blob_name, compression)}"
+        
+        records = iter(records)
+        with self.open_blob_writer(gcs_bucket, object_name, content_type='application/x-ndjson', compression=compression) as writer:
+            while True:
+                # Pulling records runs the upstream parse / transform phases
+                batch = list(itertools.islice(records, SERIALIZE_BATCH_ROWS))
+                if not batch:
+                    break
+                with self.metrics.phase('serialize'):
+                    writer.write(b''.join(to_ndjson_line(record) for record in batch))
+                self.metrics.incr('rows_written', len(batch))
+        
+        return f"gs://{gcs_bucket}/{object_name}"
+    
+    @contextmanager
+    def open_blob_writer(self, gcs_bucket: str, object_name: str, content_type: str, compression: str = 'none') -> Iterator[BinaryIO]:
+        """
+        Open an object for writing as a binary stream backed by a chunked
+        resumable upload, compressing on the fly.
+        
+        Args:
+            gcs_bucket: The GCS bucket name
+            object_name: Full object name in the bucket
+            content_type: Content type of the object
+            compression: Compression codec applied to the written bytes
+            
+        Returns:
+            Context manager yielding the writable stream; the upload is finalized on exit
+        """
+        if self.log:
+            self.log.info(f"Streaming to GCS: gs://{gcs_bucket}/{object_name}")
+        
+        # Opening and finalizing the upload are round trips too, account them outside the caller's writes
+        stack = ExitStack()
+        with self.metrics.phase('upload'):
+            raw_writer = stack.enter_context(
+                self.storage.open_writer(gcs_bucket, object_name, chunk_size=self.upload_chunk_size, content_type=content_type)
+            )
+        try:
+            with open_compressed_writer(MeteredWriter(raw_writer, self.metrics), compression) as writer:
+                yield writer
+        except BaseException:
+            if not stack.__exit__(*sys.exc_info()):
+                raise
+        else:
+            with self.metrics.phase('upload'):
+                stack.close()
+    
+    def upload_commits_hourly(self, gcs_bucket: str, prefix: str, table: pa.Table, parquet_compression: str = Config.GOLD_PARQUET_COMPRESSION) -> str:
+        """
+        Upload the hourly commit counts of the partition as its single parquet object.
+        
+        Args:
+            gcs_bucket: The GCS bucket name
+            prefix: The prefix path in the bucket
+            table: Counts with the F_COMMITS_HOURLY_SCHEMA layout
+            parquet_compression: Parquet compression codec
             
         Returns:
             Full GCS path of the uploaded file
         """
+        object_name = f"{prefix}/{self.partition_path}/{F_COMMITS_HOURLY_BLOB_NAME}"
         
-        prefix = f"{prefix}/{get_hive_partition_prefix_str(self.partition_date)}/{blob_name}"
+        with self.open_blob_writer(gcs_bucket, object_name, content_type='application/octet-stream') as writer:
+            with self.metrics.phase('serialize'):
+                rows = write_commits_hourly_parquet(table, writer, compression=parquet_compression)
         
         if self.log:
-            self.log.info(f"Uploading to GCS: gs://{gcs_bucket}/{prefix}")
+            self.log.info(f"Uploaded {rows} hourly commit counts to gs://{gcs_bucket}/{object_name}")
+        return f"gs://{gcs_bucket}/{object_name}"
+    
+    def download_from_gcs(self, gcs_bucket: str, prefix: str, blob_name: str) -> Optional[Any]:
+        """
+        Download and decode a JSON object from the partition, if it exists.
+        
+        Args:
+            gcs_bucket: The GCS bucket name
+            prefix: The prefix path in the bucket
+            blob_name: The name of the file to download
             
-        self.gcs_hook.upload(
-            bucket_name=gcs_bucket,
-            object_name=prefix,
-            data=json.dumps(contents, indent=2),
-            mime_type='application/json'
+        Returns:
+            The decoded JSON content, or None if the object does not exist
+        """
+        return self.download_json(gcs_bucket, f"{prefix}/{self.partition_path}/{blob_name}")
+    
+    def download_json(self, gcs_bucket: str, object_name: str) -> Optional[Any]:
+        """
+        Download and decode a JSON object, if it exists.
+        
+        Args:
+            gcs_bucket: The GCS bucket name
+            object_name: Full object name in the bucket
+            
+        Returns:
+            The decoded JSON content, or None if the object does not exist
+        """
+        with self.metrics.phase('download'):
+            if not self.storage.exists(bucket=gcs_bucket, object_name=object_name):
+                return None
+            content = self.storage.download(bucket=gcs_bucket, object_name=object_name)
+        
+        self.metrics.incr('bytes_downloaded', len(content))
+        return json.loads(content)
+    
+    def download_bytes(self, gcs_bucket: str, object_name: str) -> bytes:
+        """
+        Download an object, decompressing according to the object name.
+        
+        Args:
+            gcs_bucket: The GCS bucket name
+            object_name: Full object name in the bucket
+            
+        Returns:
+            The uncompressed object content
+        """
+        if self.log:
+            self.log.info(f"Downloading from GCS: gs://{gcs_bucket}/{object_name}")
+        
+        with self.metrics.phase('download'):
+            content = self.storage.download(bucket=gcs_bucket, object_name=object_name)
+        self.metrics.incr('bytes_downloaded', len(content))
+        return decompress(content, get_codec_from_name(object_name))
+    
+    @contextmanager
+    def open_blob_reader(self, gcs_bucket: str, object_name: str) -> Iterator[BinaryIO]:
+        """
+        Open an object as a binary stream that downloads in chunks and
+        decompresses according to the object name.
+        
+        Args:
+            gcs_bucket: The GCS bucket name
+            object_name: Full object name in the bucket
+            
+        Returns:
+            Context manager yielding the uncompressed stream
+        """
+        if self.log:
+            self.log.info(f"Streaming from GCS: gs://{gcs_bucket}/{object_name}")
+        
+        with self.storage.open_reader(gcs_bucket, object_name, chunk_size=self.download_chunk_size) as raw_reader:
+            with open_decompressed_reader(MeteredReader(raw_reader, self.metrics), get_codec_from_name(object_name)) as reader:
+                yield reader
+    
+    def read_parquet_table(self, gcs_bucket: str, object_name: str) -> pa.Table:
+        """
+        Download a parquet object and read it as an Arrow table.
+        
+        Args:
+            gcs_bucket: The GCS bucket name
+            object_name: Full object name in the bucket
+            
+        Returns:
+            The table stored in the object
+        """
+        # Parquet readers seek to the footer, so the object is downloaded rather than streamed
+        content = self.download_bytes(gcs_bucket=gcs_bucket, object_name=object_name)
+        with self.metrics.phase('parse'):
+            return pq.read_table(pa.BufferReader(content))
+    
+    def read_json_records(self, gcs_bucket: str, object_name: str) -> Iterator[Dict[str, Any]]:
+        """
+        Download a JSON / NDJSON object and iterate over its records,
+        decompressing according to the object name.
+        
+        Args:
+            gcs_bucket: The GCS bucket name
+            object_name: Full object name in the bucket
+            
+        Returns:
+            Iterator of records
+        """
+        return iter_json_records(self.download_bytes(gcs_bucket=gcs_bucket, object_name=object_name))
+    
+    @staticmethod
+    def _is_partition_object(name: str, full_prefix: str) -> bool:
+        # Objects of nested partitions (dt=.../repo=...) belong to those partitions
+        return '/' not in name[len(full_prefix):]
+    
+    def list_partition_blobs(self, gcs_bucket: str, prefix: str, suffix: Optional[str] = None) -> List[str]:
+        """
+        List the data objects of the partition in name order, skipping metadata objects.
+        
+        Args:
+            gcs_bucket: The GCS bucket name
+            prefix: The prefix path in the bucket
+            suffix: Only return objects ending with this suffix (ignoring any codec suffix)
+            
+        Returns:
+            Sorted list of object names
+        """
+        return [name for name, _ in self.list_partition_blob_sizes(gcs_bucket=gcs_bucket, prefix=prefix, suffix=suffix)]
+    
+    def list_partition_blob_sizes(self, gcs_bucket: str, prefix: str, suffix: Optional[str] = None) -> List[Tuple[str, int]]:
+        """
+        List the data objects of the partition with their stored size, in name order.
+        
+        Args:
+            gcs_bucket: The GCS bucket name
+            prefix: The prefix path in the bucket
+            suffix: Only return objects ending with this suffix (ignoring any codec suffix)
+            
+        Returns:
+            Sorted list of (object name, size in bytes)
+        """
+        full_prefix = f"{prefix}/{self.partition_path}/"
+        with self.metrics.phase('list'):
+            blobs = self.storage.list(bucket=gcs_bucket, prefix=full_prefix)
+        
+        return sorted(
+            (name, size) for name, size in blobs
+            if self._is_partition_object(name, full_prefix)
+            and not os.path.basename(name).startswith(METADATA_BLOB_PREFIX)
+            and (suffix is None or strip_codec_suffix(name).endswith(suffix))
         )
+    
+    def get_partition_checksums(self, gcs_bucket: str, prefix: str) -> Dict[str, str]:
+        """
+        Content checksums of the data objects of the partition, skipping metadata objects.
+        
+        Args:
+            gcs_bucket: The GCS bucket name
+            prefix: The prefix path in the bucket
+            
+        Returns:
+            Mapping of object name (relative to the partition) to content checksum
+        """
+        full_prefix = f"{prefix}/{self.partition_path}/"
+        with self.metrics.phase('list'):
+            checksums = self.storage.list_checksums(bucket=gcs_bucket, prefix=full_prefix)
+        
+        return {
+            name[len(full_prefix):]: checksum for name, checksum in checksums.items()
+            if self._is_partition_object(name, full_prefix)
+            and not os.path.basename(name).startswith(METADATA_BLOB_PREFIX)
+        }
+    
+    def get_layer_checksums(self, gcs_bucket: str, prefix: str) -> Dict[str, str]:
+        """
+        Content checksums of the data objects of a whole layer (every partition), skipping metadata objects.
+        
+        Args:
+            gcs_bucket: The GCS bucket name
+            prefix: The prefix path of the layer in the bucket
+            
+        Returns:
+            Mapping of object name (relative to the layer prefix) to content checksum
+        """
+        full_prefix = f"{prefix}/"
+        with self.metrics.phase('list'):
+            checksums = self.storage.list_checksums(bucket=gcs_bucket, prefix=full_prefix)
+        
+        return {
+            name[len(full_prefix):]: checksum for name, checksum in checksums.items()
+            if not os.path.basename(name).startswith(METADATA_BLOB_PREFIX)
+        }
+    
+    def copy_blob(self, gcs_bucket: str, source_object: str, destination_object: str) -> None:
+        """
+        Copy a single object within the bucket.
+        
+        Args:
+            gcs_bucket: The GCS bucket name
+            source_object: Full object name of the source
+            destination_object: Full object name of the copy
+        """
+        if self.log:
+            self.log.info(f"Copying in GCS: gs://{gcs_bucket}/{source_object} to gs://{gcs_bucket}/{destination_object}")
+        with self.metrics.phase('upload'):
+            self.storage.copy(bucket=gcs_bucket, source_object=source_object, destination_object=destination_object)
+    
+    def delete_blob(self, gcs_bucket: str, object_name: str) -> None:
+        """
+        Delete a single object.
+        
+        Args:
+            gcs_bucket: The GCS bucket name
+            object_name: Full object name in the bucket
+        """
+        if self.log:
+            self.log.info(f"Deleting from GCS: gs://{gcs_bucket}/{object_name}")
+        with self.metrics.phase('delete'):
+            self.storage.delete(bucket=gcs_bucket, object_name=object_name)
+    
+    def delete_partition(self, gcs_bucket: str, prefix: str) -> None:
+        """
+        Delete every object (data and metadata) of the partition.
         
-        return f"gs://{gcs_bucket}/{prefix}"
+        Args:
+            gcs_bucket: The GCS bucket name
+            prefix: The prefix path in the bucket
+        """
+        full_prefix = f"{prefix}/{self.partition_path}/"
+        
+        with self.metrics.phase('list'):
+            blobs = self.storage.list(bucket=gcs_bucket, prefix=full_prefix)
+        
+        for blob, _ in blobs:
+            if not self._is_partition_object(blob, full_prefix):
+                continue
+            if self.log:
+                self.log.info(f"Deleting from GCS: gs://{gcs_bucket}/{blob}")
+            with self.metrics.phase('delete'):
+                self.storage.delete(bucket=gcs_bucket, object_name=blob)
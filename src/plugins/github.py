@@ -0,0 +1,415 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+import re
+import time
+
+import curlify
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from plugins.utils.metrics import NULL_METRICS
+from plugins.utils.rate_limit import RateLimitGovernor
+from plugins.utils.response_cache import ResponseCache
+
+# Response headers replayed from the cache when GitHub answers 304 Not Modified
+CACHED_HEADERS = ('Link',)
+
+LINK_LAST_PATTERN = re.compile(r'<([^>]+)>;\s*rel="last"')
+
+# Commits of the default branch in a time window, requesting only the fields the silver layer keeps
+COMMIT_HISTORY_QUERY = """
+query ($owner: String!, $name: String!, $since: GitTimestamp, $until: GitTimestamp, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(since: $since, until: $until, first: $first, after: $after) {
+            pageInfo { hasNextPage endCursor }
+            nodes {
+              oid
+              committer { name email date user { databaseId } }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+def graphql_commit_to_rest(node: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a commit of the GraphQL history into the REST commit layout,
+    keeping only the projected fields (sha, committer id / name / email / date).
+
+    GraphQL dates carry the committer's UTC offset, they are normalized to
+    the `YYYY-MM-DDTHH:MM:SSZ` form of the REST API.
+
+    Args:
+        node: Commit node of COMMIT_HISTORY_QUERY
+
+    Returns:
+        Commit dictionary in the REST layout
+    """
+    committer = node['committer']
+    committed_at = datetime.fromisoformat(committer['date'].replace('Z', '+00:00')).astimezone(timezone.utc)
+    user = committer.get('user')
+    return {
+        "sha": node['oid'],
+        "commit": {
+            "committer": {
+                "name": committer['name'],
+                "email": committer['email'],
+                "date": committed_at.strftime('%Y-%m-%dT%H:%M:%SZ')
+            }
+        },
+        "committer": {"id": user['databaseId']} if user else None
+    }
+
+def parse_last_page(link_header: Optional[str]) -> Optional[int]:
+    """
+    Extract the last page number from a GitHub `Link` response header.
+
+    Args:
+        link_header: Value of the `Link` header (may be None)
+
+    Returns:
+        The page number of the rel="last" link, or None if absent
+    """
+    if not link_header:
+        return None
+
+    match = LINK_LAST_PATTERN.search(link_header)
+    if not match:
+        return None
+
+    page = parse_qs(urlparse(match.group(1)).query).get('page')
+    return int(page[0]) if page else None
+
+def is_rate_limited(response: requests.Response) -> bool:
+    """
+    Check whether a response was rejected by GitHub's (primary or secondary) rate limit.
+
+    Args:
+        response: Response to inspect
+
+    Returns:
+        True if the request should be retried after the limit resets
+    """
+    if response.status_code not in (403, 429):
+        return False
+    return response.headers.get('X-RateLimit-Remaining') == '0' or 'Retry-After' in response.headers
+
+def get_rate_limit_reset(response: requests.Response) -> Optional[float]:
+    """
+    Compute when a rate-limited request may be retried.
+
+    Args:
+        response: Rate-limited response
+
+    Returns:
+        Epoch seconds of the retry time, or None if the response does not say
+    """
+    if 'Retry-After' in response.headers:
+        return time.time() + int(response.headers['Retry-After'])
+    if 'X-RateLimit-Reset' in response.headers:
+        return float(response.headers['X-RateLimit-Reset'])
+    return None
+
+class GitHub:
+    """
+    Helper class for GitHub REST (and GraphQL) API operations over a pooled keep-alive session.
+    """
+
+    def __init__(
+        self,
+        github_token: str,
+        max_concurrency: int = 8,
+        governor: Optional[RateLimitGovernor] = None,
+        cache: Optional[ResponseCache] = None,
+        log = None,
+        metrics = None
+    ) -> None:
+        """
+        Initialize GitHub helper.
+
+        Args:
+            github_token: GitHub API token
+            max_concurrency: Maximum number of pages fetched in parallel
+            governor: Rate-limit governor shared with other workers using the same token
+            cache: Response cache used to send conditional requests
+            log: Logger instance for logging operations
+            metrics: StageMetrics receiving fetch timings, API call and retry counts
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.governor = governor
+        self.cache = cache
+        self.log = log
+        self.metrics = metrics or NULL_METRICS
+        self.last_page = None
+
+        # One connection per worker so keep-alive connections are reused across pages
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"token {github_token}",
+            "Accept": "application/vnd.github.v3+json"
+        })
+
+    def get_page(self, url: str, params: Dict, page: int) -> requests.Response:
+        """
+        Fetch a single page from a paginated GitHub endpoint.
+
+        Args:
+            url: API endpoint URL
+            params: Query parameters (page is added to a copy)
+            page: Page number to fetch (1-based)
+
+        Returns:
+            The successful response
+        """
+        page_params = dict(params, page=page)
+
+        # Conditional requests answered with 304 do not count against the rate limit
+        cached = self.cache.get(url, page_params) if self.cache else None
+        conditional_headers = {}
+        if cached and cached.get('etag'):
+            conditional_headers['If-None-Match'] = cached['etag']
+        if cached and cached.get('last_modified'):
+            conditional_headers['If-Modified-Since'] = cached['last_modified']
+
+        try:
+            response = self._send('GET', url, f"page {page}", params=page_params, headers=conditional_headers)
+
+            if response.status_code == 304 and cached:
+                self.metrics.incr('api_not_modified')
+                if self.cache:
+                    self.cache.record(hit=True)
+                return self._build_cached_response(response, cached)
+
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as e:
+            if self.log:
+                self.log.error(f"HTTP error occurred while fetching commits: {str(e)}")
+                self.log.error(f"Response status code: {response.status_code}")
+            raise ValueError('Error when call api')
+
+        if response.status_code != 200:
+            if self.log:
+                self.log.error(f"Unexpected response while fetching page {page}")
+                self.log.error(f"Response status code: {response.status_code}")
+            raise ValueError('Response status code not equal 200')
+
+        if self.cache:
+            self.cache.record(hit=False)
+            self.cache.put(
+                url,
+                page_params,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+                headers={name: response.headers[name] for name in CACHED_HEADERS if name in response.headers},
+                body=response.text
+            )
+
+        return response
+
+    def _send(self, method: str, url: str, description: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the rate-limit governor, waiting and retrying while rate limited.
+
+        Args:
+            method: HTTP method
+            url: API endpoint URL
+            description: What is requested, for logging (e.g. page 3)
+            **kwargs: Arguments of requests.Session.request
+
+        Returns:
+            The first response that is not rate limited
+        """
+        while True:
+            if self.governor:
+                with self.metrics.phase('rate_limit_wait'):
+                    self.governor.acquire()
+
+            with self.metrics.phase('fetch'):
+                response = self.session.request(method, url, **kwargs)
+            self.metrics.incr('api_calls')
+            self.metrics.incr('api_bytes', len(response.content))
+
+            if self.governor:
+                self.governor.update(response.headers)
+
+            if not is_rate_limited(response):
+                return response
+
+            # Being rate limited is not a failure: wait for the budget to refill and try again
+            if self.log:
+                self.log.warning(f"Rate limited on {description} (status {response.status_code}), waiting for reset")
+            self.metrics.incr('api_retries')
+            reset = get_rate_limit_reset(response)
+            with self.metrics.phase('rate_limit_wait'):
+                if self.governor:
+                    self.governor.block_until(reset)
+                else:
+                    time.sleep(max(0, (reset or time.time() + 60) - time.time()) + 1)
+
+    @staticmethod
+    def _build_cached_response(not_modified: requests.Response, cached: dict) -> requests.Response:
+        """
+        Rebuild a 200 response from a cache entry after a 304 Not Modified.
+
+        Args:
+            not_modified: The 304 response returned by the API
+            cached: Cache entry for the request
+
+        Returns:
+            Response carrying the cached body and headers
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.encoding = 'utf-8'
+        response.headers = CaseInsensitiveDict(not_modified.headers)
+        response.headers.update(cached.get('headers', {}))
+        response._content = cached['body'].encode('utf-8')
+        return response
+
+    def iter_pages(self, url: str, params: Dict, start_page: int = 1, last_page: Optional[int] = None) -> Iterator[Tuple[int, List[dict]]]:
+        """
+        Iterate over the pages of a paginated endpoint in page order.
+
+        Unless both `start_page` > 1 and `last_page` are known (resuming), the
+        first page is fetched alone to read the `Link: rel="last"` header. The
+        remaining pages are fetched concurrently (at most `max_concurrency` in
+        flight) and yielded in ascending page order. The page count is exposed
+        as `self.last_page` once known.
+
+        Args:
+            url: API endpoint URL
+            params: Query parameters shared by every page
+            start_page: First page to yield
+            last_page: Page count recorded by a previous, interrupted sweep
+
+        Returns:
+            Iterator of (page number, page items)
+        """
+        self.last_page = last_page
+
+        if start_page <= 1 or last_page is None:
+            first_response = self.get_page(url, params, 1)
+            with self.metrics.phase('parse'):
+                first_items = first_response.json()
+
+            if not first_items:
+                self.last_page = 0
+                if self.log:
+                    self.log.info(f"curl: {curlify.to_curl(first_response.request)}")
+                return
+
+            self.last_page = parse_last_page(first_response.headers.get('Link')) or 1
+            if start_page <= 1:
+                if self.log:
+                    self.log.info(f"Fetched page 1 with {len(first_items)} items (last page: {self.last_page})")
+                yield 1, first_items
+            start_page = max(start_page, 2)
+
+        if start_page > self.last_page:
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            pages = iter(range(start_page, self.last_page + 1))
+            in_flight = []
+
+            # Keep a sliding window of futures so memory stays bounded while order is preserved
+            for page in pages:
+                in_flight.append((page, executor.submit(self.get_page, url, params, page)))
+                if len(in_flight) >= self.max_concurrency:
+                    break
+
+            while in_flight:
+                page, future = in_flight.pop(0)
+                response = future.result()
+                with self.metrics.phase('parse'):
+                    items = response.json()
+
+                next_page = next(pages, None)
+                if next_page is not None:
+                    in_flight.append((next_page, executor.submit(self.get_page, url, params, next_page)))
+
+                if self.log:
+                    self.log.info(f"Fetched page {page} with {len(items)} items")
+                yield page, items
+
+    def iter_history(
+        self,
+        graphql_url: str,
+        owner: str,
+        name: str,
+        since: str,
+        until: str,
+        page_size: int = 100,
+        after: Optional[str] = None
+    ) -> Iterator[Tuple[List[dict], Optional[str], bool]]:
+        """
+        Iterate over the commits of the default branch in a time window
+        through the GraphQL API, following the history cursor.
+
+        Only the projected fields are requested, and commits are returned in
+        the REST layout (see graphql_commit_to_rest), newest first as with
+        the REST endpoint. Pages are fetched one after another since each
+        cursor comes from the previous page.
+
+        Args:
+            graphql_url: GraphQL endpoint URL
+            owner: Repository owner
+            name: Repository name
+            since: Window start (ISO timestamp)
+            until: Window end (ISO timestamp)
+            page_size: Commits per page (at most 100)
+            after: Cursor to continue from (end cursor of the last processed page)
+
+        Returns:
+            Iterator of (page commits, end cursor of the page, whether more pages follow)
+        """
+        variables = {"owner": owner, "name": name, "since": since, "until": until, "first": page_size, "after": after}
+        while True:
+            try:
+                response = self._send('POST', graphql_url, f"history after {variables['after']}", json={"query": COMMIT_HISTORY_QUERY, "variables": variables})
+                response.raise_for_status()
+            except requests.exceptions.HTTPError as e:
+                if self.log:
+                    self.log.error(f"HTTP error occurred while fetching commits: {str(e)}")
+                    self.log.error(f"Response status code: {response.status_code}")
+                raise ValueError('Error when call api')
+
+            with self.metrics.phase('parse'):
+                payload = response.json()
+            if payload.get('errors'):
+                if self.log:
+                    self.log.error(f"GraphQL errors: {payload['errors']}")
+                raise ValueError('Error when call api')
+
+            repository = (payload.get('data') or {}).get('repository')
+            branch = repository and repository.get('defaultBranchRef')
+            if not branch:
+                raise ValueError(f"Repository {owner}/{name} not found or has no default branch")
+
+            history = branch['target']['history']
+            with self.metrics.phase('parse'):
+                commits = [graphql_commit_to_rest(node) for node in history['nodes']]
+            cursor = history['pageInfo']['endCursor']
+
+            if self.log:
+                self.log.info(f"Fetched {len(commits)} commits (has next page: {history['pageInfo']['hasNextPage']})")
+            if commits:
+                yield commits, cursor, history['pageInfo']['hasNextPage']
+
+            if not history['pageInfo']['hasNextPage']:
+                return
+            variables['after'] = cursor
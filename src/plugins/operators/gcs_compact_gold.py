@@ -0,0 +1,168 @@
+from airflow.models import BaseOperator
+from typing import TYPE_CHECKING, Any, Dict, Optional
+from datetime import datetime, timezone
+from plugins.utils.manifest import compute_content_hash
+from plugins.utils.metrics import NULL_METRICS, instrument_execute
+
+# plugins.gcs (pyarrow) is imported at run time, so parsing the DAG does not load it
+if TYPE_CHECKING:
+    from plugins.gcs import GCS
+
+class GCSCompactGoldOperator(BaseOperator):
+    """
+    Operator that compacts the daily gold parquet parts into one parquet
+    object per month, sorted by dt and committer_email.
+
+    Only months whose gold parts changed since the last compaction are
+    rewritten. Every version of a month is written under a new name, and
+    the compaction manifest, replaced in a single upload, is what makes
+    it current; objects referenced neither by it nor by the previous
+    manifest are deleted afterwards.
+    """
+
+    def __init__(
+        self,
+        *,
+        src_path: str,
+        dest_path: str,
+        parquet_compression: str = 'snappy',
+        row_group_size: int = 64 * 1024,
+        storage_backend: str = 'gcs',
+        metrics_file_path: Optional[str] = None,
+        **kwargs
+    ) -> None:
+        """
+        Initialize the operator.
+
+        Args:
+            src_path: GCS path of the gold layer (gs://bucket/path)
+            dest_path: GCS path of the monthly layer (gs://bucket/path)
+            parquet_compression: Parquet compression codec (snappy, zstd, gzip, none)
+            row_group_size: Maximum number of rows per parquet row group
+            storage_backend: Storage backend, 'gcs' or 'local' (filesystem with the same layout)
+            metrics_file_path: NDJSON file also receiving the stage metrics (besides XCom and StatsD)
+        """
+        super().__init__(**kwargs)
+        self.src_path = src_path
+        self.dest_path = dest_path
+        self.parquet_compression = parquet_compression
+        self.row_group_size = row_group_size
+        self.storage_backend = storage_backend
+        self.metrics_file_path = metrics_file_path
+        self.metrics = NULL_METRICS
+
+
+    @instrument_execute
+    def execute(self, context) -> Dict[str, Any]:
+        """
+        Execute the operator to compact the changed months.
+
+        Args:
+            context: Airflow context containing execution_date
+
+        Returns:
+            The compaction manifest
+        """
+        from plugins.gcs import GCS
+        from plugins.utils.compaction import COMPACTION_MANIFEST_BLOB_NAME, COMPACTION_SORT_KEYS, group_gold_parts_by_month
+
+        src_bucket, src_blob = self.src_path.replace("gs://", "").split("/", 1)
+        dest_bucket, dest_blob = self.dest_path.replace("gs://", "").split("/", 1)
+        manifest_name = f"{dest_blob}/{COMPACTION_MANIFEST_BLOB_NAME}"
+
+        gcs = GCS(partition_date=context['execution_date'], log=self.log, storage_backend=self.storage_backend, metrics=self.metrics)
+
+        previous = gcs.download_json(gcs_bucket=dest_bucket, object_name=manifest_name) or {}
+        previous_months = previous.get('months', {})
+        gold_months = group_gold_parts_by_month(gcs.get_layer_checksums(gcs_bucket=src_bucket, prefix=src_blob))
+        monthly_checksums = gcs.get_layer_checksums(gcs_bucket=dest_bucket, prefix=dest_blob)
+
+        months = {}
+        compacted = []
+        for month, inputs in sorted(gold_months.items()):
+            input_hash = compute_content_hash(inputs)
+            entry = previous_months.get(month)
+            if entry and entry.get('input_hash') == input_hash and monthly_checksums.get(entry['object']) == entry.get('output_checksum'):
+                months[month] = entry
+                self.metrics.incr('months_skipped')
+                continue
+
+            months[month] = self._compact_month(gcs, src_bucket, src_blob, dest_bucket, dest_blob, month, inputs, input_hash)
+            compacted.append(month)
+            self.metrics.incr('months_compacted')
+
+        # Checksums of the objects just written, to detect later that a month object was altered or removed
+        if compacted:
+            monthly_checksums = gcs.get_layer_checksums(gcs_bucket=dest_bucket, prefix=dest_blob)
+            for month in compacted:
+                months[month]['output_checksum'] = monthly_checksums.get(months[month]['object'])
+
+        for month in sorted(set(previous_months) - set(months)):
+            self.log.info(f"Month {month} no longer has gold parts, dropping it from the layout")
+
+        manifest = {
+            "layout": "monthly",
+            "sort_by": COMPACTION_SORT_KEYS,
+            "months": months,
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }
+        # Readers switch to the new month objects only once the manifest is replaced
+        gcs.upload_json(gcs_bucket=dest_bucket, object_name=manifest_name, contents=manifest)
+
+        # Objects of the previous manifest are kept for readers that loaded it, and collected on the next run
+        referenced = {entry['object'] for entry in list(months.values()) + list(previous_months.values())}
+        for name in sorted(set(monthly_checksums) - referenced):
+            gcs.delete_blob(gcs_bucket=dest_bucket, object_name=f"{dest_blob}/{name}")
+            self.metrics.incr('objects_deleted')
+
+        self.log.info(f"Compacted {len(compacted)} of {len(months)} months into {self.dest_path}")
+        return manifest
+
+    def _compact_month(
+        self,
+        gcs: 'GCS',
+        src_bucket: str,
+        src_blob: str,
+        dest_bucket: str,
+        dest_blob: str,
+        month: str,
+        inputs: Dict[str, str],
+        input_hash: str
+    ) -> Dict[str, Any]:
+        """
+        Merge the gold parts of a month into its sorted monthly object.
+
+        Args:
+            gcs: GCS helper of the run
+            src_bucket: Bucket name of the gold layer
+            src_blob: Prefix path of the gold layer
+            dest_bucket: Bucket name of the monthly layer
+            dest_blob: Prefix path of the monthly layer
+            month: Month (YYYY-MM)
+            inputs: Checksums of the month's gold parts, relative to the gold prefix
+            input_hash: Content hash of the inputs
+
+        Returns:
+            Manifest entry of the month, without the output checksum
+        """
+        from plugins.utils.compaction import compact_month_tables, get_month_object_name, write_compacted_parquet
+
+        tables = [gcs.read_parquet_table(gcs_bucket=src_bucket, object_name=f"{src_blob}/{name}") for name in sorted(inputs)]
+        with self.metrics.phase('transform'):
+            table = compact_month_tables(tables)
+
+        object_name = get_month_object_name(month, input_hash)
+        with gcs.open_blob_writer(dest_bucket, f"{dest_blob}/{object_name}", content_type='application/octet-stream') as writer:
+            with self.metrics.phase('serialize'):
+                rows = write_compacted_parquet(table, writer, compression=self.parquet_compression, row_group_size=self.row_group_size)
+        self.metrics.incr('rows_written', rows)
+
+        self.log.info(f"Compacted {len(inputs)} gold parts of {month} ({rows} rows) into {object_name}")
+        return {
+            "object": object_name,
+            "input_hash": input_hash,
+            "inputs": inputs,
+            "rows": rows,
+            "output_checksum": None,
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }
@@ -1,9 +1,14 @@
 from airflow.models import BaseOperator
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from datetime import datetime
-from plugins.gcs import GCS
+from plugins.utils.manifest import PartitionManifest
+from plugins.utils.metrics import NULL_METRICS, instrument_execute
 from plugins.utils.time_utils import get_execution_date_as_datetime
 
+# plugins.gcs (pyarrow) is imported at run time, so parsing the DAG does not load it
+if TYPE_CHECKING:
+    from plugins.gcs import GCS
+
 class GCSJsonToParquetOperator(BaseOperator):
     """
     Operator that converts JSON data from GCS to Parquet format.
@@ -14,6 +19,17 @@ class GCSJsonToParquetOperator(BaseOperator):
         *,
         src_path: str,
         dest_path: str,
+        parquet_compression: str = 'snappy',
+        row_group_size: int = 128 * 1024,
+        in_memory: bool = True,
+        max_concurrency: int = 4,
+        max_in_flight_bytes: int = 256 * 1024 * 1024,
+        storage_backend: str = 'gcs',
+        metrics_file_path: Optional[str] = None,
+        skip_unchanged: bool = True,
+        repo: Optional[str] = None,
+        fact_path: Optional[str] = None,
+        sha_index_path: Optional[str] = None,
         **kwargs
     ) -> None:
         """
@@ -22,12 +38,38 @@ class GCSJsonToParquetOperator(BaseOperator):
         Args:
             src_path: Source GCS path with JSON files (gs://bucket/path)
             dest_path: Destination GCS path for parquet files (gs://bucket/path)
+            parquet_compression: Parquet compression codec (snappy, zstd, gzip, none)
+            row_group_size: Maximum number of rows per parquet row group
+            in_memory: Convert through in-memory buffers instead of temporary files
+            max_concurrency: Number of files converted at the same time
+            max_in_flight_bytes: Maximum total (estimated decompressed) size of the files being converted at once
+            storage_backend: Storage backend, 'gcs' or 'local' (filesystem with the same layout)
+            metrics_file_path: NDJSON file also receiving the stage metrics (besides XCom and StatsD)
+            skip_unchanged: Skip the partition when its silver content hash matches the previous run's
+                manifest, and skip the downstream load when the gold output is already loaded
+            repo: Repository full name (e.g. torvalds/linux), selects the repo= partitions
+            fact_path: GCS path of the hourly commit counts (gs://bucket/path), aggregated while converting
+            sha_index_path: GCS path of the commit SHA index (gs://bucket/path); commits already kept by another
+                partition of the repository are dropped, and the SHAs kept here are indexed
         """
         super().__init__(**kwargs)
         self.src_path = src_path
         self.dest_path = dest_path
+        self.parquet_compression = parquet_compression
+        self.row_group_size = row_group_size
+        self.in_memory = in_memory
+        self.max_concurrency = max_concurrency
+        self.max_in_flight_bytes = max_in_flight_bytes
+        self.storage_backend = storage_backend
+        self.metrics_file_path = metrics_file_path
+        self.skip_unchanged = skip_unchanged
+        self.repo = repo
+        self.fact_path = fact_path
+        self.sha_index_path = sha_index_path
+        self.metrics = NULL_METRICS
         
 
+    @instrument_execute
     def execute(self, context) -> None:
         """
         Execute the operator to convert JSON files to parquet format.
@@ -35,6 +77,9 @@ class GCSJsonToParquetOperator(BaseOperator):
         Args:
             context: Airflow context containing execution_date
         """
+        from plugins.gcs import GCS
+        from plugins.utils.commits_hourly import CommitsHourlyAggregator
+        from plugins.utils.sha_index import CommitShaIndex
         
         partition_date = context['execution_date']
         
@@ -45,9 +90,61 @@ class GCSJsonToParquetOperator(BaseOperator):
         src_bucket, src_blob = self.src_path.replace("gs://", "").split("/", 1)
         dest_bucket, dest_blob = self.dest_path.replace("gs://", "").split("/", 1)
         
-        gcs = GCS(partition_date=partition_date, log=self.log)
-        processed_files = gcs.process_bronze_files(src_bucket, src_blob, dest_bucket, dest_blob)
+        gcs = GCS(partition_date=partition_date, log=self.log, storage_backend=self.storage_backend, metrics=self.metrics, repo=self.repo)
+        
+        manifest = PartitionManifest(gcs, self.task_id, src_bucket, src_blob, dest_bucket, dest_blob, log=self.log)
+        if self.skip_unchanged and manifest.is_unchanged() and self._has_fact_output(gcs):
+            manifest.skip_if_loaded()
+            return
+        
+        aggregator = CommitsHourlyAggregator() if self.fact_path else None
+        sha_index = None
+        if self.sha_index_path:
+            index_bucket, index_blob = self.sha_index_path.replace("gs://", "").split("/", 1)
+            sha_index = CommitShaIndex(gcs, index_bucket, index_blob, repo=self.repo, log=self.log, metrics=self.metrics)
+        
+        processed_files = gcs.process_bronze_files(
+            src_bucket,
+            src_blob,
+            dest_bucket,
+            dest_blob,
+            parquet_compression=self.parquet_compression,
+            row_group_size=self.row_group_size,
+            in_memory=self.in_memory,
+            max_concurrency=self.max_concurrency,
+            max_in_flight_bytes=self.max_in_flight_bytes,
+            aggregator=aggregator,
+            sha_index=sha_index
+        )
         
         self.log.info(f"Successfully converted {len(processed_files)} files to parquet for partition date: {partition_date.strftime('%Y-%m-%d')}")
         for file_info in processed_files:
             self.log.info(f"Converted: {file_info['source']} -> {file_info['destination']}")
+        
+        # Written for every run, also without commits, so loading it replaces the fact partition
+        if aggregator:
+            fact_bucket, fact_blob = self.fact_path.replace("gs://", "").split("/", 1)
+            gcs.delete_partition(gcs_bucket=fact_bucket, prefix=fact_blob)
+            gcs.upload_commits_hourly(fact_bucket, fact_blob, aggregator.to_table(), parquet_compression=self.parquet_compression)
+        
+        if sha_index:
+            sha_index.commit(parquet_compression=self.parquet_compression)
+        
+        manifest.commit()
+        if self.skip_unchanged:
+            manifest.skip_if_loaded()
+
+    def _has_fact_output(self, gcs: 'GCS') -> bool:
+        """
+        Check that the hourly commit counts exist, e.g. not for partitions converted before they were introduced.
+        
+        Args:
+            gcs: GCS helper of the partition
+            
+        Returns:
+            True if no counts are produced or they are present
+        """
+        if not self.fact_path:
+            return True
+        fact_bucket, fact_blob = self.fact_path.replace("gs://", "").split("/", 1)
+        return bool(gcs.list_partition_blobs(gcs_bucket=fact_bucket, prefix=fact_blob, suffix='.parquet'))
@@ -0,0 +1,58 @@
+from airflow.models import BaseOperator
+from typing import List, Optional
+from plugins.utils.manifest import mark_partition_loaded
+
+class GCSMarkPartitionLoadedOperator(BaseOperator):
+    """
+    Operator that records in the gold partition manifest that its current
+    content is loaded into the warehouse, so an unchanged re-run can skip
+    the load and merges.
+    
+    With `repos` set, the partition of every repository of the day is
+    marked, since one load covers all of them.
+    """
+    
+    def __init__(
+        self,
+        *,
+        path: str,
+        storage_backend: str = 'gcs',
+        repos: Optional[List[str]] = None,
+        **kwargs
+    ) -> None:
+        """
+        Initialize the operator.
+        
+        Args:
+            path: GCS path of the loaded layer (gs://bucket/path)
+            storage_backend: Storage backend, 'gcs' or 'local' (filesystem with the same layout)
+            repos: Repository full names (e.g. torvalds/linux) whose repo= partitions were loaded
+        """
+        super().__init__(**kwargs)
+        self.path = path
+        self.storage_backend = storage_backend
+        self.repos = repos
+
+    def execute(self, context) -> None:
+        """
+        Execute the operator to mark the partition as loaded.
+        
+        Args:
+            context: Airflow context containing execution_date
+        """
+        # Imported at run time, so parsing the DAG does not load pyarrow
+        from plugins.gcs import GCS
+        
+        bucket, prefix = self.path.replace("gs://", "").split("/", 1)
+        
+        storage = None
+        for repo in self.repos or [None]:
+            gcs = GCS(partition_date=context['execution_date'], log=self.log, storage_backend=self.storage_backend, storage=storage, repo=repo)
+            storage = gcs.storage
+            manifest = mark_partition_loaded(gcs, bucket, prefix)
+            
+            if manifest is None:
+                self.log.info(f"No manifest found for {self.path}/{gcs.partition_path}, nothing to mark")
+                continue
+            
+            self.log.info(f"Marked {gcs.partition_path} as loaded (hash {manifest['loaded_output_hash']})")
@@ -1,20 +1,57 @@
 from airflow.models import BaseOperator
-from typing import List, Dict
-import json
+from typing import TYPE_CHECKING, BinaryIO, Dict, Iterable, Iterator, List, Optional
+from contextlib import ExitStack
+import itertools
+import os
 from datetime import datetime, timedelta
-from plugins.gcs import GCS
+from plugins.utils.compression import add_codec_suffix, strip_codec_suffix
+from plugins.utils.json_utils import iter_json_stream, to_ndjson_line
+from plugins.utils.manifest import PartitionManifest
+from plugins.utils.metrics import NULL_METRICS, instrument_execute
+from plugins.utils.parallel import process_blobs_in_parallel, raise_on_blob_errors
 from plugins.utils.time_utils import get_hive_partition_prefix_str,get_execution_date_as_datetime
 
+# plugins.gcs and the Arrow / parquet helpers are imported by the methods using them, so parsing the DAG does not load pyarrow
+if TYPE_CHECKING:
+    import pyarrow as pa
+    from plugins.gcs import GCS
+    from plugins.utils.commits_hourly import CommitsHourlyAggregator
+    from plugins.utils.sha_index import CommitShaIndex
+
+# Rows per Arrow table when the python engine feeds the fused parquet writer
+PYTHON_ENGINE_BATCH_ROWS = 10000
+# Bronze records parsed at a time by the python engine before being transformed
+PYTHON_ENGINE_PARSE_BATCH_ROWS = 1000
+
 class GCSTransformOperator(BaseOperator):
     
     """
     Operator that transforms GitHub commits data and saves to staging area.
+    
+    With `gold_path` set it runs in fused mode: bronze is read once and
+    written straight to gold parquet, silver NDJSON becoming an optional
+    side output (`write_silver`).
     """
     def __init__(
         self,
         *,
         src_path: str,
         dest_path: str,
+        compression: str = 'none',
+        transform_engine: str = 'columnar',
+        block_size: int = 1024 * 1024,
+        gold_path: Optional[str] = None,
+        write_silver: bool = True,
+        parquet_compression: str = 'snappy',
+        row_group_size: int = 128 * 1024,
+        max_concurrency: int = 4,
+        max_in_flight_bytes: int = 256 * 1024 * 1024,
+        storage_backend: str = 'gcs',
+        metrics_file_path: Optional[str] = None,
+        skip_unchanged: bool = True,
+        repo: Optional[str] = None,
+        fact_path: Optional[str] = None,
+        sha_index_path: Optional[str] = None,
         **kwargs
     ) -> None:
         """
@@ -23,10 +60,42 @@ class GCSTransformOperator(BaseOperator):
         Args:
             src_path: Source GCS path (gs://bucket/path)
             dest_path: Destination GCS path for transformed data (gs://bucket/path)
+            compression: Compression codec of the silver output (none, gzip or zstd)
+            transform_engine: 'columnar' (pyarrow, vectorized) or 'python' (row by row); both produce identical output
+            block_size: Bytes of bronze parsed at a time when streaming
+            gold_path: Gold GCS path for parquet files (gs://bucket/path); enables fused mode
+            write_silver: In fused mode, also write the silver NDJSON side output
+            parquet_compression: In fused mode, parquet compression codec of gold
+            row_group_size: In fused mode, maximum number of rows per gold row group
+            max_concurrency: Number of bronze parts transformed at the same time
+            max_in_flight_bytes: Maximum total (estimated decompressed) size of the bronze parts being transformed at once
+            storage_backend: Storage backend, 'gcs' or 'local' (filesystem with the same layout)
+            metrics_file_path: NDJSON file also receiving the stage metrics (besides XCom and StatsD)
+            skip_unchanged: Skip the partition when its bronze content hash matches the previous run's manifest
+            repo: Repository full name (e.g. torvalds/linux); selects the repo= partitions and fills the `repo` column
+            fact_path: In fused mode, GCS path of the hourly commit counts (gs://bucket/path), aggregated while writing gold
+            sha_index_path: In fused mode, GCS path of the commit SHA index (gs://bucket/path); commits already kept by
+                another partition of the repository are dropped, and the SHAs kept here are indexed
         """
         super().__init__(**kwargs)
         self.src_path = src_path
         self.dest_path = dest_path
+        self.compression = compression
+        self.transform_engine = transform_engine
+        self.block_size = block_size
+        self.gold_path = gold_path
+        self.write_silver = write_silver
+        self.parquet_compression = parquet_compression
+        self.row_group_size = row_group_size
+        self.max_concurrency = max_concurrency
+        self.max_in_flight_bytes = max_in_flight_bytes
+        self.storage_backend = storage_backend
+        self.metrics_file_path = metrics_file_path
+        self.skip_unchanged = skip_unchanged
+        self.repo = repo
+        self.fact_path = fact_path
+        self.sha_index_path = sha_index_path
+        self.metrics = NULL_METRICS
 
     def transform_github_commits(self, commits_data: List[Dict]) -> List[Dict]:
         """
@@ -38,7 +107,18 @@ class GCSTransformOperator(BaseOperator):
         Returns:
             List[Dict]: Transformed commit data with only required fields
         """
-        transformed_data = []
+        return list(self.iter_transform_github_commits(commits_data))
+
+    def iter_transform_github_commits(self, commits_data: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Lazily transform GitHub commits, one commit at a time.
+        
+        Args:
+            commits_data: Iterable of commit data dictionaries
+            
+        Returns:
+            Iterator of transformed commits with only required fields
+        """
         for commit in commits_data:
             commit_date = datetime.strptime(commit['commit']['committer']['date'], '%Y-%m-%dT%H:%M:%SZ')
             transformed_commit = {
@@ -47,12 +127,281 @@ class GCSTransformOperator(BaseOperator):
                 'committer_name': commit['commit']['committer']['name'],
                 'committer_email': commit['commit']['committer']['email'],
                 'committer_date': commit['commit']['committer']['date'],
-                'dt': (commit_date + timedelta(hours=7)).strftime('%Y-%m-%d')
+                'dt': (commit_date + timedelta(hours=7)).strftime('%Y-%m-%d'),
+                'repo': self.repo
+            }
+            
+            yield transformed_commit
+
+    def stream_transform_github_commits(self, stream: BinaryIO) -> Iterator[Dict]:
+        """
+        Parse bronze commits from a stream and transform them incrementally,
+        so memory stays bounded by one parse block regardless of file size.
+        
+        Args:
+            stream: Binary stream of bronze content (already decompressed)
+            
+        Returns:
+            Iterator of transformed commits
+        """
+        if self.transform_engine == 'columnar':
+            from plugins.utils.arrow_transform import iter_github_commits_batches, transform_github_commits_table
+            
+            batches = iter_github_commits_batches(stream, block_size=self.block_size)
+            while True:
+                with self.metrics.phase('parse'):
+                    batch = next(batches, None)
+                if batch is None:
+                    return
+                with self.metrics.phase('transform'):
+                    transformed = transform_github_commits_table(batch, repo=self.repo).to_pylist()
+                yield from transformed
+        
+        for chunk in self._iter_parsed_chunks(stream):
+            with self.metrics.phase('transform'):
+                transformed = self.transform_github_commits(chunk)
+            yield from transformed
+
+    def _iter_parsed_chunks(self, stream: BinaryIO) -> Iterator[List[Dict]]:
+        """
+        Parse bronze commits from a stream in small lists (python engine).
+        
+        Args:
+            stream: Binary stream of bronze content (already decompressed)
+            
+        Returns:
+            Iterator of lists of at most PYTHON_ENGINE_PARSE_BATCH_ROWS commits
+        """
+        records = iter_json_stream(stream, chunk_size=self.block_size)
+        while True:
+            with self.metrics.phase('parse'):
+                chunk = list(itertools.islice(records, PYTHON_ENGINE_PARSE_BATCH_ROWS))
+            if not chunk:
+                return
+            yield chunk
+
+    def stream_transform_github_commits_tables(self, stream: BinaryIO) -> Iterator['pa.Table']:
+        """
+        Parse and transform bronze commits from a stream into Arrow tables
+        with the SILVER_COMMIT_SCHEMA layout, one parse block at a time.
+        
+        Args:
+            stream: Binary stream of bronze content (already decompressed)
+            
+        Returns:
+            Iterator of transformed tables
+        """
+        import pyarrow as pa
+        from plugins.utils.arrow_transform import SILVER_COMMIT_SCHEMA, iter_github_commits_batches, transform_github_commits_table
+        
+        if self.transform_engine == 'columnar':
+            batches = iter_github_commits_batches(stream, block_size=self.block_size)
+            while True:
+                with self.metrics.phase('parse'):
+                    batch = next(batches, None)
+                if batch is None:
+                    return
+                with self.metrics.phase('transform'):
+                    table = transform_github_commits_table(batch, repo=self.repo)
+                yield table
+        
+        # Accumulate full-size tables so the parquet row groups are not fragmented
+        rows = []
+        chunks = self._iter_parsed_chunks(stream)
+        for chunk in itertools.chain(chunks, [None]):
+            with self.metrics.phase('transform'):
+                if chunk:
+                    rows.extend(self.iter_transform_github_commits(chunk))
+                table = None
+                if rows and (chunk is None or len(rows) >= PYTHON_ENGINE_BATCH_ROWS):
+                    table, rows = pa.Table.from_pylist(rows, schema=SILVER_COMMIT_SCHEMA), []
+            if table is not None:
+                yield table
+
+    def _transform_part_fused(
+        self,
+        gcs: 'GCS',
+        reader: BinaryIO,
+        part_name: str,
+        silver_bucket: str,
+        silver_prefix: str,
+        gold_bucket: str,
+        gold_prefix: str,
+        aggregator: Optional['CommitsHourlyAggregator'] = None,
+        sha_index: Optional['CommitShaIndex'] = None
+    ) -> List[str]:
+        """
+        Transform one bronze part straight into a gold parquet part (and optionally a silver part).
+        
+        Args:
+            gcs: GCS helper of the partition
+            reader: Binary stream of the bronze part (already decompressed)
+            part_name: Part name without extension (e.g. part-00001)
+            silver_bucket: Silver GCS bucket name
+            silver_prefix: Silver prefix path in the bucket
+            gold_bucket: Gold GCS bucket name
+            gold_prefix: Gold prefix path in the bucket
+            aggregator: Receives every gold table, to build the hourly commit counts of the partition
+            sha_index: Drops the commits already kept by another partition (or another part) before writing
+            
+        Returns:
+            Paths of the written objects, empty if the part has no commits
+        """
+        from plugins.utils.arrow_transform import to_gold_commits_table
+        from plugins.utils.parquet_utils import write_gold_parquet
+        
+        tables = self.stream_transform_github_commits_tables(reader)
+        first_table = next(tables, None)
+        if first_table is None:
+            return []
+        
+        partition_path = gcs.partition_path
+        gold_object = f"{gold_prefix}/{partition_path}/{part_name}.parquet"
+        silver_object = f"{silver_prefix}/{partition_path}/{add_codec_suffix(part_name + '.json', self.compression)}"
+        
+        with ExitStack() as stack:
+            gold_writer = stack.enter_context(gcs.open_blob_writer(gold_bucket, gold_object, content_type='application/octet-stream'))
+            silver_writer = None
+            if self.write_silver:
+                silver_writer = stack.enter_context(
+                    gcs.open_blob_writer(silver_bucket, silver_object, content_type='application/x-ndjson', compression=self.compression)
+                )
+            
+            def gold_tables() -> Iterator['pa.Table']:
+                for table in itertools.chain([first_table], tables):
+                    if sha_index:
+                        table = sha_index.filter(table, part_name)
+                    with self.metrics.phase('serialize'):
+                        if silver_writer:
+                            silver_writer.write(b''.join(to_ndjson_line(record) for record in table.to_pylist()))
+                        gold_table = to_gold_commits_table(table)
+                    if aggregator:
+                        with self.metrics.phase('transform'):
+                            aggregator.add(gold_table)
+                    yield gold_table
+            
+            # Pulling the tables runs the parse / transform phases, the rest is parquet encoding
+            with self.metrics.phase('serialize'):
+                rows = write_gold_parquet(gold_tables(), gold_writer, compression=self.parquet_compression, row_group_size=self.row_group_size)
+            self.metrics.incr('rows_written', rows)
+        
+        written = [f"gs://{gold_bucket}/{gold_object}"]
+        if self.write_silver:
+            written.append(f"gs://{silver_bucket}/{silver_object}")
+        return written
+
+    def _transform_part(
+        self,
+        gcs: 'GCS',
+        src_bucket: str,
+        src_blob_path: str,
+        dest_bucket: str,
+        dest_blob: str,
+        gold_bucket: Optional[str],
+        gold_blob: Optional[str],
+        aggregator: Optional['CommitsHourlyAggregator'] = None,
+        sha_index: Optional['CommitShaIndex'] = None
+    ) -> Optional[Dict[str, str]]:
+        """
+        Transform one bronze part into its silver part (or gold part in fused mode).
+        
+        Args:
+            gcs: GCS helper of the partition
+            src_bucket: Bronze GCS bucket name
+            src_blob_path: Bronze object name
+            dest_bucket: Silver GCS bucket name
+            dest_blob: Silver prefix path in the bucket
+            gold_bucket: Gold GCS bucket name, None unless in fused mode
+            gold_blob: Gold prefix path in the bucket, None unless in fused mode
+            aggregator: In fused mode, receives every gold table
+            sha_index: In fused mode, drops the duplicate commits before writing
+            
+        Returns:
+            Source and destination paths, None if the part has no commits
+        """
+        self.log.info(f"Processing file: gs://{src_bucket}/{src_blob_path}")
+        
+        if self.gold_path:
+            part_name = os.path.splitext(strip_codec_suffix(os.path.basename(src_blob_path)))[0]
+            with gcs.open_blob_reader(gcs_bucket=src_bucket, object_name=src_blob_path) as reader:
+                written = self._transform_part_fused(gcs, reader, part_name, dest_bucket, dest_blob, gold_bucket, gold_blob, aggregator, sha_index)
+            
+            if not written:
+                return None
+            return {
+                "source": f"gs://{src_bucket}/{src_blob_path}",
+                "destination": ", ".join(written)
             }
+        
+        # Stream, transform and upload record by record (bronze may be NDJSON or a legacy JSON array, optionally compressed)
+        with gcs.open_blob_reader(gcs_bucket=src_bucket, object_name=src_blob_path) as reader:
+            transformed_data = self.stream_transform_github_commits(reader)
             
-            transformed_data.append(transformed_commit)
-        return transformed_data
+            first_commit = next(transformed_data, None)
+            if first_commit is None:
+                return None
+            
+            # Upload transformed data as NDJSON, keeping the part name and switching to the silver codec
+            dest_blob_path = gcs.stream_to_gcs(
+                gcs_bucket=dest_bucket,
+                prefix=dest_blob,
+                blob_name=strip_codec_suffix(os.path.basename(src_blob_path)),
+                records=itertools.chain([first_commit], transformed_data),
+                compression=self.compression
+            )
+        
+        self.log.info(f"Saved transformed data to: {dest_blob_path}")
+        
+        return {
+            "source": f"gs://{src_bucket}/{src_blob_path}",
+            "destination": dest_blob_path
+        }
+
+    def _drop_duplicates_from_parts(
+        self,
+        gcs: 'GCS',
+        silver_bucket: str,
+        silver_prefix: str,
+        gold_bucket: str,
+        gold_prefix: str,
+        sha_index: 'CommitShaIndex',
+        aggregator: Optional['CommitsHourlyAggregator'] = None
+    ) -> None:
+        """
+        Rewrite the gold parts (and their silver side output) holding commits kept by a lower part.
+        
+        Args:
+            gcs: GCS helper of the partition
+            silver_bucket: Silver GCS bucket name
+            silver_prefix: Silver prefix path in the bucket
+            gold_bucket: Gold GCS bucket name
+            gold_prefix: Gold prefix path in the bucket
+            sha_index: Index of the partition, every part already filtered
+            aggregator: Uncounts the dropped commits, if any
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        
+        tables = gcs.drop_commits_from_parts(
+            gold_bucket,
+            gold_prefix,
+            sha_index.resolve(),
+            parquet_compression=self.parquet_compression,
+            row_group_size=self.row_group_size,
+            aggregator=aggregator
+        )
+        if not self.write_silver:
+            return
+        
+        for part_name, table in tables.items():
+            # Silver holds the same rows as gold, with dt as a string
+            silver = table.set_column(table.schema.get_field_index('dt'), 'dt', pc.cast(table['dt'], pa.string()))
+            silver_object = f"{silver_prefix}/{gcs.partition_path}/{add_codec_suffix(part_name + '.json', self.compression)}"
+            with gcs.open_blob_writer(silver_bucket, silver_object, content_type='application/x-ndjson', compression=self.compression) as writer:
+                with self.metrics.phase('serialize'):
+                    writer.write(b''.join(to_ndjson_line(record) for record in silver.to_pylist()))
 
+    @instrument_execute
     def execute(self, context) -> None:
         """
         Execute the operator to transform GitHub commits data and save to staging.
@@ -60,11 +409,15 @@ class GCSTransformOperator(BaseOperator):
         Args:
             context: Airflow context containing execution_date
         """
+        from plugins.gcs import GCS
+        from plugins.utils.commits_hourly import CommitsHourlyAggregator
+        from plugins.utils.sha_index import CommitShaIndex
         
         partition_date = context['execution_date']
+        gcs = GCS(partition_date=partition_date, log=self.log, storage_backend=self.storage_backend, metrics=self.metrics, repo=self.repo)
         
-        # Process files in partition
-        partition_path = get_hive_partition_prefix_str(partition_date)
+        # Process files in partition (dt=..., or dt=.../repo=... with a repository)
+        partition_path = gcs.partition_path
         
         self.log.info(f"Starting transformation for partition date: {partition_path}")
         self.log.info(f"Source path: {self.src_path}")
@@ -72,48 +425,76 @@ class GCSTransformOperator(BaseOperator):
         src_bucket, src_blob = self.src_path.replace("gs://", "").split("/", 1)
         dest_bucket, dest_blob = self.dest_path.replace("gs://", "").split("/", 1)
         
-        full_src_prefix = f"{src_blob}/{partition_path}"
+        gold_bucket, gold_blob = None, None
+        if self.gold_path:
+            self.log.info(f"Fused mode, writing gold parquet to: {self.gold_path} (silver side output: {self.write_silver})")
+            gold_bucket, gold_blob = self.gold_path.replace("gs://", "").split("/", 1)
         
-        gcs = GCS(partition_date=partition_date, log=self.log)        
-        blobs = gcs.gcs_hook.list(bucket_name=src_bucket, prefix=full_src_prefix)
-        processed_files = []
+        # The manifest lives next to the final output of this task: gold in fused mode, silver otherwise
+        manifest = PartitionManifest(
+            gcs,
+            self.task_id,
+            src_bucket,
+            src_blob,
+            gold_bucket if self.gold_path else dest_bucket,
+            gold_blob if self.gold_path else dest_blob,
+            log=self.log
+        )
         
-        for src_blob_path in blobs:
-            if not src_blob_path.endswith('.json'):
-                continue
-                
-            self.log.info(f"Processing file: gs://{src_bucket}/{src_blob_path}")
-            
-            # Download and transform
-            file_content = gcs.gcs_hook.download(
-                bucket_name=src_bucket,
-                object_name=src_blob_path
-            )
-            
-            if not file_content:
-                continue
-            
-            # Transform the data
-            json_content = json.loads(file_content)
-            transformed_data = self.transform_github_commits(json_content)
-            
-            # Upload transformed data
-            dest_blob_path = f"{dest_blob}/{partition_path}/{src_blob_path.split('/')[-1]}"
-            
-            self.log.info(f"Saving transformed data to: gs://{dest_bucket}/{dest_blob_path}")
-            
-            gcs.gcs_hook.upload(
-                bucket_name=dest_bucket,
-                object_name=dest_blob_path,
-                data=json.dumps(transformed_data, indent=2),
-                mime_type='application/json'
-            )
-            
-            processed_files.append({
-                "source": f"gs://{src_bucket}/{src_blob_path}",
-                "destination": f"gs://{dest_bucket}/{dest_blob_path}"
-            })
+        # Hourly commit counts are aggregated from gold, so only in fused mode
+        fact_bucket, fact_blob = None, None
+        if self.gold_path and self.fact_path:
+            fact_bucket, fact_blob = self.fact_path.replace("gs://", "").split("/", 1)
+        
+        # Partitions written before the counts were introduced are processed again to produce them
+        has_fact_output = not fact_bucket or bool(gcs.list_partition_blobs(gcs_bucket=fact_bucket, prefix=fact_blob, suffix='.parquet'))
+        if self.skip_unchanged and has_fact_output and manifest.is_unchanged():
+            if self.gold_path:
+                manifest.skip_if_loaded()
+            return
+        
+        # Bronze part files (part-00001.json, ...) together form the partition
+        blobs = gcs.list_partition_blob_sizes(gcs_bucket=src_bucket, prefix=src_blob, suffix='.json')
+        gcs.delete_partition(gcs_bucket=dest_bucket, prefix=dest_blob)
+        if self.gold_path:
+            gcs.delete_partition(gcs_bucket=gold_bucket, prefix=gold_blob)
+        
+        aggregator = CommitsHourlyAggregator() if fact_bucket else None
+        
+        # Duplicates are dropped by the stage writing gold, so only in fused mode
+        sha_index = None
+        if self.gold_path and self.sha_index_path:
+            index_bucket, index_blob = self.sha_index_path.replace("gs://", "").split("/", 1)
+            sha_index = CommitShaIndex(gcs, index_bucket, index_blob, repo=self.repo, log=self.log, metrics=self.metrics)
+        
+        # Parts are independent, so overlap their download, transform and upload on a bounded worker pool
+        results = process_blobs_in_parallel(
+            blobs,
+            lambda src_blob_path: self._transform_part(gcs, src_bucket, src_blob_path, dest_bucket, dest_blob, gold_bucket, gold_blob, aggregator, sha_index),
+            max_concurrency=self.max_concurrency,
+            max_in_flight_bytes=self.max_in_flight_bytes,
+            log=self.log
+        )
+        raise_on_blob_errors(results)
+        
+        # Duplicates across parts are settled once every part is read, so the output does not depend on the order parts finished in
+        if sha_index:
+            self._drop_duplicates_from_parts(gcs, dest_bucket, dest_blob, gold_bucket, gold_blob, sha_index, aggregator)
+        
+        processed_files = [result["result"] for result in results if result["result"]]
         
         self.log.info(f"Successfully transformed {len(processed_files)} files for partition date: {partition_path}")
         for file_info in processed_files:
             self.log.info(f"Transformed: {file_info['source']} -> {file_info['destination']}")
+        
+        # Written for every run, also without commits, so loading it replaces the fact partition
+        if aggregator:
+            gcs.delete_partition(gcs_bucket=fact_bucket, prefix=fact_blob)
+            gcs.upload_commits_hourly(fact_bucket, fact_blob, aggregator.to_table(), parquet_compression=self.parquet_compression)
+        
+        if sha_index:
+            sha_index.commit(parquet_compression=self.parquet_compression)
+        
+        manifest.commit()
+        if self.gold_path and self.skip_unchanged:
+            manifest.skip_if_loaded()
@@ -1,13 +1,40 @@
 from airflow.models import BaseOperator
-from typing import List
-import requests
-import json
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime, timedelta
-from plugins.gcs import GCS
+import os
+from plugins.utils.metrics import NULL_METRICS, instrument_execute
+from plugins.utils.rate_limit import RateLimitGovernor
+from plugins.utils.repo_utils import get_repo_api_url, get_repo_from_api_url
+from plugins.utils.response_cache import ResponseCache
 from plugins.utils.time_utils import get_execution_date_as_datetime
-import curlify
+
+# plugins.gcs (pyarrow) and plugins.github (requests, curlify) are imported by the methods
+# using them, so parsing the DAG does not load them
+
+MANIFEST_BLOB_NAME = "_manifest.json"
+
+# Appended to the bronze prefix, parts of a backfill sweep are staged there until the sweep completes
+BACKFILL_STAGING_SUFFIX = "_backfill_staging"
 
 class GitHubToGCSOperator(BaseOperator):
+    """
+    Operator that extracts GitHub commits of a day into bronze part files.
+    
+    With `backfill_start_date` / `backfill_end_date` set it instead sweeps
+    the whole date range in one paginated pass and splits the commits into
+    the daily bronze partitions, identical to what daily runs produce.
+    
+    With `repo` set, `api_url` is formatted with it (`{repo}` placeholder)
+    and the output goes to the dt=.../repo=... partitions, so one operator
+    can be mapped over several repositories sharing the same API budget.
+    
+    With `api_mode='graphql'` commits are read from the GraphQL commit
+    history, requesting only the fields the silver layer keeps, and stored
+    in the REST layout so the downstream stages are unchanged.
+    """
+    
+    # github_token is usually a variable template, resolved (and masked) at run time instead of at parse
+    template_fields = ('github_token', 'backfill_start_date', 'backfill_end_date')
 
     def __init__(
         self,
@@ -18,6 +45,19 @@ class GitHubToGCSOperator(BaseOperator):
         api_url: str,
         
         batch_size: int = 100,
+        max_concurrency: int = 8,
+        rate_limit_state_path: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        cache_max_bytes: int = 512 * 1024 * 1024,
+        compression: str = 'none',
+        storage_backend: str = 'gcs',
+        metrics_file_path: Optional[str] = None,
+        backfill_start_date: Optional[str] = None,
+        backfill_end_date: Optional[str] = None,
+        skip_backfilled: bool = False,
+        repo: Optional[str] = None,
+        api_mode: str = 'rest',
+        graphql_url: str = 'https://api.github.com/graphql',
         **kwargs
     ):
         super().__init__(task_id=task_id, **kwargs)
@@ -25,42 +65,204 @@ class GitHubToGCSOperator(BaseOperator):
         self.bronze_path = bronze_path
         self.api_url = api_url
         self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.rate_limit_state_path = rate_limit_state_path
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        self.compression = compression
+        self.storage_backend = storage_backend
+        self.metrics_file_path = metrics_file_path
+        self.backfill_start_date = backfill_start_date
+        self.backfill_end_date = backfill_end_date
+        self.skip_backfilled = skip_backfilled
+        self.repo = repo
+        self.api_mode = api_mode
+        self.graphql_url = graphql_url
+        self.metrics = NULL_METRICS
         
+    @instrument_execute
     def execute(self, context):
+        from plugins.gcs import GCS
+        
+        if self.backfill_start_date and self.backfill_end_date:
+            self._execute_backfill()
+            return
         
         # Get execution date
         run_date = context['execution_date']
-            
-        # Fetch commits for the execution date
-        commits = self._fetch_commits(run_date)
-        if not commits:
-            self.log.info(f"No commits found for date {run_date}")
-            return
         
         bucket, prefix = self.bronze_path.replace("gs://", "").split("/", 1)
+        gcs = GCS(partition_date=run_date, log=self.log, storage_backend=self.storage_backend, metrics=self.metrics, repo=self.repo)
+        since, until = self._get_time_window(run_date)
+        
+        # Resume an interrupted extraction of the same window, otherwise start from a clean partition
+        manifest = gcs.download_from_gcs(gcs_bucket=bucket, prefix=prefix, blob_name=MANIFEST_BLOB_NAME)
+        if self.skip_backfilled and manifest and manifest['complete'] and manifest.get('backfill') and (manifest['since'], manifest['until']) == (since, until):
+            self.log.info(f"Partition already extracted by a backfill ({manifest['commit_count']} commits), skipping")
+            return
         
-        # Initialize GCS client and upload
-        gcs = GCS(partition_date=run_date, log=self.log)
-        gcs_path = gcs.upload_to_gcs(
-            gcs_bucket=bucket, 
-            prefix=prefix, 
-            blob_name="commits.json", 
-            contents=commits
+        if manifest and not manifest['complete'] and (manifest['since'], manifest['until'], manifest.get('api_mode', 'rest')) == (since, until, self.api_mode):
+            self.log.info(f"Resuming extraction after page {manifest['last_completed_page']} of {manifest['last_page']}")
+        else:
+            gcs.delete_partition(gcs_bucket=bucket, prefix=prefix)
+            manifest = {
+                "since": since,
+                "until": until,
+                "last_page": None,
+                "last_completed_page": 0,
+                "commit_count": 0,
+                "complete": False,
+                "api_mode": self.api_mode
+            }
+        
+        # Persist every page as its own part so a retry continues where this attempt stopped
+        pages = self._fetch_commits(
+            since,
+            until,
+            start_page=manifest['last_completed_page'] + 1,
+            last_page=manifest['last_page'],
+            cursor=manifest.get('cursor')
         )
+        for page, last_page, page_commits, cursor in pages:
+            gcs.stream_to_gcs(
+                gcs_bucket=bucket,
+                prefix=prefix,
+                blob_name=f"part-{page:05d}.json",
+                records=page_commits,
+                compression=self.compression
+            )
+            manifest['last_page'] = last_page
+            manifest['last_completed_page'] = page
+            manifest['commit_count'] += len(page_commits)
+            if cursor:
+                manifest['cursor'] = cursor
+            gcs.upload_to_gcs(gcs_bucket=bucket, prefix=prefix, blob_name=MANIFEST_BLOB_NAME, contents=manifest)
         
-        self.log.info(f"Saved {len(commits)} commits to {gcs_path}")
-
-    def _fetch_commits(self, date: datetime) -> List[dict]:
-        headers = {
-            "Authorization": f"token {self.github_token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
+        manifest['complete'] = True
+        gcs_path = gcs.upload_to_gcs(gcs_bucket=bucket, prefix=prefix, blob_name=MANIFEST_BLOB_NAME, contents=manifest)
         
+        if not manifest['commit_count']:
+            self.log.info(f"No commits found for date {run_date}")
+            return
+        
+        self.log.info(f"Saved {manifest['commit_count']} commits in {manifest['last_completed_page']} parts, manifest: {gcs_path}")
+
+    def _get_time_window(self, date: datetime) -> Tuple[str, str]:
         # Format date for GitHub API
         since = (date - timedelta(days=1)).replace(hour=17, minute=0, second=0).strftime('%Y-%m-%dT%H:%M:%S') + 'Z'
         until = date.replace(hour=16, minute=59, second=59).strftime('%Y-%m-%dT%H:%M:%S') + 'Z'
+        return since, until
+
+    def _get_partition_date(self, commit: dict) -> str:
+        # Inverse of _get_time_window: the window of day D starts at D-1 17:00Z, i.e. the day in UTC+7
+        commit_date = datetime.strptime(commit['commit']['committer']['date'], '%Y-%m-%dT%H:%M:%SZ')
+        return (commit_date + timedelta(hours=7)).strftime('%Y-%m-%d')
+
+    def _execute_backfill(self) -> None:
+        """
+        Extract every day of the backfill range with a single paginated sweep.
+        
+        Commits are routed to the partition of their day and written in parts
+        of `batch_size` commits in API order, so each partition holds the same
+        parts a daily run would have fetched page by page. Parts are staged
+        under a separate prefix and the partitions are only replaced once the
+        sweep has fetched every day, so a failed sweep leaves them as they
+        were and is restarted from scratch; days left without a complete
+        manifest are re-extracted by their daily runs.
+        """
+        from plugins.gcs import GCS
+        
+        start_date = datetime.strptime(self.backfill_start_date, '%Y-%m-%d')
+        end_date = datetime.strptime(self.backfill_end_date, '%Y-%m-%d')
+        if end_date < start_date:
+            raise ValueError(f"Backfill end date {self.backfill_end_date} is before start date {self.backfill_start_date}")
+        
+        bucket, prefix = self.bronze_path.replace("gs://", "").split("/", 1)
+        staging_prefix = f"{prefix}{BACKFILL_STAGING_SUFFIX}"
+        since, _ = self._get_time_window(start_date)
+        _, until = self._get_time_window(end_date)
+        self.log.info(f"Backfilling {self.backfill_start_date} to {self.backfill_end_date} in one sweep")
+        
+        storage = None
+        partitions: Dict[str, dict] = {}
+        for offset in range((end_date - start_date).days + 1):
+            day = start_date + timedelta(days=offset)
+            gcs = GCS(partition_date=day, log=self.log, storage_backend=self.storage_backend, storage=storage, metrics=self.metrics, repo=self.repo)
+            storage = gcs.storage
+            # Leftovers of a failed sweep
+            gcs.delete_partition(gcs_bucket=bucket, prefix=staging_prefix)
+            
+            day_since, day_until = self._get_time_window(day)
+            partitions[day.strftime('%Y-%m-%d')] = {
+                "gcs": gcs,
+                "buffer": [],
+                "manifest": {
+                    "since": day_since,
+                    "until": day_until,
+                    "last_page": None,
+                    "last_completed_page": 0,
+                    "commit_count": 0,
+                    "complete": False,
+                    "api_mode": self.api_mode,
+                    "backfill": True
+                }
+            }
+        
+        def flush(partition: dict) -> None:
+            manifest = partition['manifest']
+            manifest['last_completed_page'] += 1
+            manifest['commit_count'] += len(partition['buffer'])
+            partition['gcs'].stream_to_gcs(
+                gcs_bucket=bucket,
+                prefix=staging_prefix,
+                blob_name=f"part-{manifest['last_completed_page']:05d}.json",
+                records=partition['buffer'],
+                compression=self.compression
+            )
+            partition['buffer'] = []
         
-        self.log.info(f"Call Github API: {self.api_url}")
+        for _, _, page_commits, _ in self._fetch_commits(since, until):
+            for commit in page_commits:
+                partition = partitions.get(self._get_partition_date(commit))
+                if partition is None:
+                    continue
+                partition['buffer'].append(commit)
+                if len(partition['buffer']) >= self.batch_size:
+                    flush(partition)
+        
+        for dt, partition in partitions.items():
+            if partition['buffer']:
+                flush(partition)
+            manifest = partition['manifest']
+            if manifest['last_completed_page']:
+                manifest['last_page'] = manifest['last_completed_page']
+            manifest['complete'] = True
+            
+            # Every day is fetched, the partition is replaced by its staged parts
+            gcs = partition['gcs']
+            staged = gcs.list_partition_blobs(gcs_bucket=bucket, prefix=staging_prefix)
+            gcs.delete_partition(gcs_bucket=bucket, prefix=prefix)
+            for name in staged:
+                gcs.copy_blob(gcs_bucket=bucket, source_object=name, destination_object=f"{prefix}/{gcs.partition_path}/{os.path.basename(name)}")
+            gcs.upload_to_gcs(gcs_bucket=bucket, prefix=prefix, blob_name=MANIFEST_BLOB_NAME, contents=manifest)
+            for name in staged:
+                gcs.delete_blob(gcs_bucket=bucket, object_name=name)
+            self.log.info(f"Backfilled dt={dt}: {manifest['commit_count']} commits in {manifest['last_completed_page']} parts")
+
+    def _fetch_commits(
+        self,
+        since: str,
+        until: str,
+        start_page: int = 1,
+        last_page: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Iterator[Tuple[int, Optional[int], List[dict], Optional[str]]]:
+        api_url = get_repo_api_url(self.api_url, self.repo)
+        if self.api_mode == 'graphql':
+            yield from self._fetch_commits_graphql(api_url, since, until, start_page=start_page, cursor=cursor)
+            return
+        
+        self.log.info(f"Call Github API: {api_url}")
         self.log.info(f"since: {since}")
         self.log.info(f"until: {until}")
         
@@ -70,39 +272,58 @@ class GitHubToGCSOperator(BaseOperator):
             "per_page": self.batch_size
         }
         
-        commits = []
-        page = 1
+        from plugins.github import GitHub
         
-        while True:
-            
-            try:
-                params["page"] = page
-                
-                response = requests.get(
-                    self.api_url,
-                    headers=headers,
-                    params=params
-                )
-                
-                response.raise_for_status()
-            except requests.exceptions.HTTPError as e:
-                self.log.error(f"HTTP error occurred while fetching commits: {str(e)}")
-                self.log.error(f"Response status code: {response.status_code}")
-                raise ValueError('Error when call api')
-            
-            if response.status_code != 200:
-                self.log.error(f"HTTP error occurred while fetching commits: {str(e)}")
-                self.log.error(f"Response status code: {response.status_code}")
-                raise ValueError('Response status code not equal 200')
-            
-            page_commits = response.json()
-            
-            if not page_commits:
-                self.log.info(f"curl: {curlify.to_curl(response.request)}")
-                break
-            
-            commits.extend(page_commits)
+        cache = ResponseCache(cache_dir=self.cache_dir, max_bytes=self.cache_max_bytes, log=self.log) if self.cache_dir else None
+        github = GitHub(
+            github_token=self.github_token,
+            max_concurrency=self.max_concurrency,
+            governor=self._create_governor(self.rate_limit_state_path),
+            cache=cache,
+            log=self.log,
+            metrics=self.metrics
+        )
+        
+        # Pages are yielded in page order, so the bronze output stays deterministic
+        for page, page_commits in github.iter_pages(api_url, params, start_page=start_page, last_page=last_page):
+            yield page, github.last_page, page_commits, None
+        
+        if cache:
+            self.log.info(f"Response cache: {cache.hits} hits, {cache.misses} misses")
+
+    def _fetch_commits_graphql(
+        self,
+        api_url: str,
+        since: str,
+        until: str,
+        start_page: int = 1,
+        cursor: Optional[str] = None
+    ) -> Iterator[Tuple[int, Optional[int], List[dict], Optional[str]]]:
+        from plugins.github import GitHub
+        
+        owner, name = (self.repo or get_repo_from_api_url(api_url)).split('/', 1)
+        self.log.info(f"Call Github GraphQL API: {self.graphql_url} ({owner}/{name})")
+        self.log.info(f"since: {since}")
+        self.log.info(f"until: {until}")
+        
+        # GraphQL calls are charged to their own (points) budget, tracked next to the REST one
+        state_path = None
+        if self.rate_limit_state_path:
+            root, ext = os.path.splitext(self.rate_limit_state_path)
+            state_path = f"{root}_graphql{ext}"
+        
+        github = GitHub(
+            github_token=self.github_token,
+            governor=self._create_governor(state_path),
+            log=self.log,
+            metrics=self.metrics
+        )
+        
+        # Pages of the same size as the REST ones, so the parts hold the same commits; the page count is known at the last page
+        page = start_page - 1
+        for page_commits, cursor, has_next_page in github.iter_history(self.graphql_url, owner, name, since, until, page_size=self.batch_size, after=cursor):
             page += 1
-            self.log.info(f"Fetched page {page-1} with {len(page_commits)} commits")
-            
-        return commits
+            yield page, None if has_next_page else page, page_commits, cursor
+
+    def _create_governor(self, state_path: Optional[str]) -> Optional[RateLimitGovernor]:
+        return RateLimitGovernor(state_path=state_path, log=self.log) if state_path else None
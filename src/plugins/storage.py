@@ -0,0 +1,384 @@
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import time
+
+from dags.config.config import Config
+
+class StorageBackend(ABC):
+    """
+    Object storage operations used by the GCS helper.
+
+    Objects are addressed by bucket and object name, names use `/` as the
+    path separator (e.g. `bronze/github_commits/dt=2025-01-01/part-00001.json.gz`).
+    """
+
+    @abstractmethod
+    def list(self, bucket: str, prefix: str) -> List[Tuple[str, int]]:
+        """
+        List objects under a prefix.
+
+        Args:
+            bucket: Bucket name
+            prefix: Object name prefix
+
+        Returns:
+            List of (object name, size in bytes)
+        """
+
+    @abstractmethod
+    def list_checksums(self, bucket: str, prefix: str) -> Dict[str, str]:
+        """
+        List objects under a prefix with a checksum of their content.
+
+        Args:
+            bucket: Bucket name
+            prefix: Object name prefix
+
+        Returns:
+            Mapping of object name to content checksum
+        """
+
+    @abstractmethod
+    def exists(self, bucket: str, object_name: str) -> bool:
+        """
+        Check whether an object exists.
+
+        Args:
+            bucket: Bucket name
+            object_name: Full object name in the bucket
+
+        Returns:
+            True if the object exists
+        """
+
+    @abstractmethod
+    def download(self, bucket: str, object_name: str, filename: Optional[str] = None) -> Optional[bytes]:
+        """
+        Download an object into memory, or to a local file.
+
+        Args:
+            bucket: Bucket name
+            object_name: Full object name in the bucket
+            filename: Local file to download to, None to return the content
+
+        Returns:
+            The object content, None when downloaded to a file
+        """
+
+    @abstractmethod
+    def upload(self, bucket: str, object_name: str, data: Optional[bytes] = None, filename: Optional[str] = None, content_type: str = 'application/octet-stream') -> None:
+        """
+        Upload an object from memory or from a local file.
+
+        Args:
+            bucket: Bucket name
+            object_name: Full object name in the bucket
+            data: Object content
+            filename: Local file to upload, used when data is None
+            content_type: Content type of the object
+        """
+
+    @abstractmethod
+    def open_reader(self, bucket: str, object_name: str, chunk_size: int) -> Iterator[BinaryIO]:
+        """
+        Open an object as a readable binary stream, downloaded in chunks.
+
+        Args:
+            bucket: Bucket name
+            object_name: Full object name in the bucket
+            chunk_size: Bytes fetched per request
+
+        Returns:
+            Context manager yielding the stream
+        """
+
+    @abstractmethod
+    def open_writer(self, bucket: str, object_name: str, chunk_size: int, content_type: str = 'application/octet-stream') -> Iterator[BinaryIO]:
+        """
+        Open an object as a writable binary stream, uploaded in chunks.
+
+        Args:
+            bucket: Bucket name
+            object_name: Full object name in the bucket
+            chunk_size: Bytes sent per request
+            content_type: Content type of the object
+
+        Returns:
+            Context manager yielding the stream; the object is finalized on exit
+        """
+
+    @abstractmethod
+    def copy(self, bucket: str, source_object: str, destination_object: str) -> None:
+        """
+        Copy an object within a bucket, replacing the destination if it exists.
+
+        Args:
+            bucket: Bucket name
+            source_object: Full object name of the source
+            destination_object: Full object name of the copy
+        """
+
+    @abstractmethod
+    def delete(self, bucket: str, object_name: str) -> None:
+        """
+        Delete an object.
+
+        Args:
+            bucket: Bucket name
+            object_name: Full object name in the bucket
+        """
+
+class GCSHookStorage(StorageBackend):
+    """
+    Google Cloud Storage through Airflow's GCSHook.
+    """
+
+    def __init__(self, gcp_conn_id: str = Config.GCS_AIRR_LAB_CONNECTION) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            gcp_conn_id: GCP connection ID for authentication
+        """
+        from airflow.providers.google.cloud.hooks.gcs import GCSHook
+
+        self.gcs_hook = GCSHook(gcp_conn_id=gcp_conn_id)
+
+    def list(self, bucket: str, prefix: str) -> List[Tuple[str, int]]:
+        # One listing call returns the sizes too, no per-object metadata request is needed
+        blobs = self.gcs_hook.get_conn().bucket(bucket).list_blobs(prefix=prefix)
+        return [(blob.name, blob.size or 0) for blob in blobs]
+
+    def list_checksums(self, bucket: str, prefix: str) -> Dict[str, str]:
+        # CRC32C is computed by GCS for every object and returned by the listing
+        blobs = self.gcs_hook.get_conn().bucket(bucket).list_blobs(prefix=prefix)
+        return {blob.name: blob.crc32c for blob in blobs}
+
+    def exists(self, bucket: str, object_name: str) -> bool:
+        return self.gcs_hook.exists(bucket_name=bucket, object_name=object_name)
+
+    def download(self, bucket: str, object_name: str, filename: Optional[str] = None) -> Optional[bytes]:
+        content = self.gcs_hook.download(bucket_name=bucket, object_name=object_name, filename=filename)
+        return None if filename else content
+
+    def upload(self, bucket: str, object_name: str, data: Optional[bytes] = None, filename: Optional[str] = None, content_type: str = 'application/octet-stream') -> None:
+        self.gcs_hook.upload(
+            bucket_name=bucket,
+            object_name=object_name,
+            data=data,
+            filename=None if data is not None else filename,
+            mime_type=content_type
+        )
+
+    @contextmanager
+    def open_reader(self, bucket: str, object_name: str, chunk_size: int) -> Iterator[BinaryIO]:
+        blob = self.gcs_hook.get_conn().bucket(bucket).blob(object_name)
+        with blob.open('rb', chunk_size=chunk_size) as reader:
+            yield reader
+
+    @contextmanager
+    def open_writer(self, bucket: str, object_name: str, chunk_size: int, content_type: str = 'application/octet-stream') -> Iterator[BinaryIO]:
+        blob = self.gcs_hook.get_conn().bucket(bucket).blob(object_name)
+        with blob.open('wb', chunk_size=chunk_size, content_type=content_type) as writer:
+            yield writer
+
+    def copy(self, bucket: str, source_object: str, destination_object: str) -> None:
+        # Server-side copy, the content does not go through the worker
+        self.gcs_hook.copy(source_bucket=bucket, source_object=source_object, destination_bucket=bucket, destination_object=destination_object)
+
+    def delete(self, bucket: str, object_name: str) -> None:
+        self.gcs_hook.delete(bucket_name=bucket, object_name=object_name)
+
+class LocalStorage(StorageBackend):
+    """
+    Local filesystem stand-in for GCS, keeping the `bucket/prefix/dt=...` layout
+    under a root directory (`<root>/<bucket>/<object name>`).
+
+    With `latency` set, every request (listing, metadata, whole-object transfer
+    and each chunk of a streamed transfer) sleeps that long first, imitating
+    object-store round trips so that I/O overlap can be measured offline.
+    Writes land in a temporary file and are renamed on success, so a failed
+    upload never leaves a partial object behind.
+    """
+
+    def __init__(self, root_dir: str = Config.LOCAL_STORAGE_ROOT, latency: float = 0.0) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            root_dir: Directory holding one sub-directory per bucket
+            latency: Seconds added to every request, 0 to disable
+        """
+        self.root_dir = root_dir
+        self.latency = latency
+
+    def _round_trip(self) -> None:
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def _path(self, bucket: str, object_name: str) -> str:
+        return os.path.join(self.root_dir, bucket, *object_name.split('/'))
+
+    def list(self, bucket: str, prefix: str) -> List[Tuple[str, int]]:
+        self._round_trip()
+        bucket_dir = os.path.join(self.root_dir, bucket)
+        # Only walk the deepest directory fully contained in the prefix
+        search_dir = os.path.join(bucket_dir, *prefix.split('/')[:-1])
+
+        objects = []
+        for dirpath, _, filenames in os.walk(search_dir):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                object_name = os.path.relpath(path, bucket_dir).replace(os.sep, '/')
+                if object_name.startswith(prefix) and not filename.startswith('.tmp-'):
+                    objects.append((object_name, os.path.getsize(path)))
+        return sorted(objects)
+
+    def list_checksums(self, bucket: str, prefix: str) -> Dict[str, str]:
+        checksums = {}
+        for object_name, _ in self.list(bucket, prefix):
+            digest = hashlib.md5()
+            with open(self._path(bucket, object_name), 'rb') as source:
+                for block in iter(lambda: source.read(1024 * 1024), b''):
+                    digest.update(block)
+            checksums[object_name] = digest.hexdigest()
+        return checksums
+
+    def exists(self, bucket: str, object_name: str) -> bool:
+        self._round_trip()
+        return os.path.isfile(self._path(bucket, object_name))
+
+    def download(self, bucket: str, object_name: str, filename: Optional[str] = None) -> Optional[bytes]:
+        self._round_trip()
+        path = self._path(bucket, object_name)
+        if filename:
+            shutil.copyfile(path, filename)
+            return None
+        with open(path, 'rb') as source:
+            return source.read()
+
+    def upload(self, bucket: str, object_name: str, data: Optional[bytes] = None, filename: Optional[str] = None, content_type: str = 'application/octet-stream') -> None:
+        self._round_trip()
+        with self._atomic_file(bucket, object_name) as target:
+            if data is not None:
+                target.write(data)
+            else:
+                with open(filename, 'rb') as source:
+                    shutil.copyfileobj(source, target)
+
+    @contextmanager
+    def open_reader(self, bucket: str, object_name: str, chunk_size: int) -> Iterator[BinaryIO]:
+        with open(self._path(bucket, object_name), 'rb') as source:
+            yield _ChunkedReader(source, chunk_size, self._round_trip) if self.latency > 0 else source
+
+    @contextmanager
+    def open_writer(self, bucket: str, object_name: str, chunk_size: int, content_type: str = 'application/octet-stream') -> Iterator[BinaryIO]:
+        with self._atomic_file(bucket, object_name) as target:
+            if self.latency <= 0:
+                yield target
+                return
+            writer = _ChunkedWriter(target, chunk_size, self._round_trip)
+            yield writer
+            writer.close()
+
+    def copy(self, bucket: str, source_object: str, destination_object: str) -> None:
+        self._round_trip()
+        with open(self._path(bucket, source_object), 'rb') as source, self._atomic_file(bucket, destination_object) as target:
+            shutil.copyfileobj(source, target)
+
+    def delete(self, bucket: str, object_name: str) -> None:
+        self._round_trip()
+        os.remove(self._path(bucket, object_name))
+
+    @contextmanager
+    def _atomic_file(self, bucket: str, object_name: str) -> Iterator[BinaryIO]:
+        path = self._path(bucket, object_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as target:
+                yield target
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+class _ChunkedReader(io.RawIOBase):
+    """
+    Reader paying one round trip for every chunk fetched from the wrapped file.
+    """
+
+    def __init__(self, raw: BinaryIO, chunk_size: int, round_trip) -> None:
+        self.raw = raw
+        self.chunk_size = chunk_size
+        self.round_trip = round_trip
+        self.buffer = b''
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        if not self.buffer:
+            self.round_trip()
+            self.buffer = self.raw.read(self.chunk_size)
+        size = min(len(target), len(self.buffer))
+        target[:size] = self.buffer[:size]
+        self.buffer = self.buffer[size:]
+        return size
+
+class _ChunkedWriter(io.RawIOBase):
+    """
+    Writer paying one round trip for every chunk sent to the wrapped file.
+    """
+
+    def __init__(self, raw: BinaryIO, chunk_size: int, round_trip) -> None:
+        self.raw = raw
+        self.chunk_size = chunk_size
+        self.round_trip = round_trip
+        self.pending = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.pending += len(data)
+        while self.pending >= self.chunk_size:
+            self.round_trip()
+            self.pending -= self.chunk_size
+        return self.raw.write(data)
+
+    def tell(self) -> int:
+        return self.raw.tell()
+
+    def close(self) -> None:
+        if not self.closed and self.pending:
+            # Final (partial) chunk of the upload
+            self.round_trip()
+            self.pending = 0
+        super().close()
+
+def create_storage_backend(storage_backend: str = 'gcs', gcp_conn_id: str = Config.GCS_AIRR_LAB_CONNECTION) -> StorageBackend:
+    """
+    Create a storage backend by name.
+
+    The local backend reads its root directory and injected latency from
+    Config at call time, so they can be overridden before a run.
+
+    Args:
+        storage_backend: 'gcs' (GCSHook) or 'local' (filesystem)
+        gcp_conn_id: GCP connection ID, used by the gcs backend
+
+    Returns:
+        The storage backend
+    """
+    if storage_backend == 'gcs':
+        return GCSHookStorage(gcp_conn_id=gcp_conn_id)
+    if storage_backend == 'local':
+        return LocalStorage(root_dir=Config.LOCAL_STORAGE_ROOT, latency=Config.LOCAL_STORAGE_LATENCY_SECONDS)
+    raise ValueError(f"Unsupported storage backend: {storage_backend}")
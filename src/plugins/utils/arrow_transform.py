@@ -0,0 +1,168 @@
+import io
+import itertools
+import json
+from datetime import timedelta
+from typing import BinaryIO, Iterator, Optional, Union
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.json as pa_json
+
+from plugins.utils.json_utils import iter_json_stream
+
+# Only the fields the silver layer keeps; everything else in the API payload is skipped while parsing
+GITHUB_COMMIT_SCHEMA = pa.schema([
+    ('sha', pa.string()),
+    ('commit', pa.struct([
+        ('committer', pa.struct([
+            ('name', pa.string()),
+            ('email', pa.string()),
+            ('date', pa.string()),
+        ])),
+    ])),
+    # login is only read to tell an empty committer object from a committer without id
+    ('committer', pa.struct([
+        ('id', pa.int64()),
+        ('login', pa.string()),
+    ])),
+])
+
+# Silver output, in the same column order as GCSTransformOperator.transform_github_commits
+SILVER_COMMIT_SCHEMA = pa.schema([
+    ('commit_sha', pa.string()),
+    ('committer_id', pa.int64()),
+    ('committer_name', pa.string()),
+    ('committer_email', pa.string()),
+    ('committer_date', pa.string()),
+    ('dt', pa.string()),
+    ('repo', pa.string()),
+])
+
+# Partition day is computed in GMT+7
+DT_OFFSET = pa.scalar(timedelta(hours=7), type=pa.duration('s'))
+
+def read_github_commits_table(content: Union[str, bytes]) -> pa.Table:
+    """
+    Parse bronze commits (NDJSON, or a legacy JSON array) into an Arrow table
+    holding only the projected fields of GITHUB_COMMIT_SCHEMA.
+
+    Args:
+        content: Bronze object content (already decompressed)
+
+    Returns:
+        Arrow table of commits
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+
+    stripped = content.lstrip()
+    if not stripped:
+        return GITHUB_COMMIT_SCHEMA.empty_table()
+
+    if stripped.startswith(b'['):
+        return pa.Table.from_pylist(json.loads(stripped), schema=GITHUB_COMMIT_SCHEMA)
+
+    return pa_json.read_json(
+        io.BytesIO(content),
+        parse_options=pa_json.ParseOptions(
+            explicit_schema=GITHUB_COMMIT_SCHEMA,
+            unexpected_field_behavior='ignore'
+        )
+    )
+
+def iter_github_commits_batches(stream: BinaryIO, block_size: int = 1024 * 1024) -> Iterator[pa.RecordBatch]:
+    """
+    Incrementally parse bronze commits from a binary stream into record
+    batches of the projected GITHUB_COMMIT_SCHEMA, holding roughly one block
+    of input in memory at a time.
+
+    Args:
+        stream: Binary stream of bronze content (already decompressed)
+        block_size: Bytes parsed per batch
+
+    Returns:
+        Iterator of record batches
+    """
+    stream = io.BufferedReader(stream, buffer_size=block_size) if not hasattr(stream, 'peek') else stream
+    head = stream.peek(block_size).lstrip()
+    if not head:
+        return
+
+    if head.startswith(b'['):
+        # Legacy JSON-array layout: parse record by record and batch up
+        records = iter_json_stream(stream, chunk_size=block_size)
+        while True:
+            batch = list(itertools.islice(records, 10000))
+            if not batch:
+                return
+            yield pa.RecordBatch.from_pylist(batch, schema=GITHUB_COMMIT_SCHEMA)
+
+    reader = pa_json.open_json(
+        stream,
+        read_options=pa_json.ReadOptions(block_size=block_size),
+        parse_options=pa_json.ParseOptions(
+            explicit_schema=GITHUB_COMMIT_SCHEMA,
+            unexpected_field_behavior='ignore'
+        )
+    )
+    for batch in reader:
+        if batch.num_rows:
+            yield batch
+
+def transform_github_commits_table(commits: Union[pa.Table, pa.RecordBatch], repo: Optional[str] = None) -> pa.Table:
+    """
+    Columnar equivalent of GCSTransformOperator.transform_github_commits.
+
+    Nested fields are flattened in bulk, `dt` is derived with vectorized
+    timestamp arithmetic and missing or empty committers map to
+    committer_id = -1 without per-row branching.
+
+    Args:
+        commits: Arrow table (or record batch) with the GITHUB_COMMIT_SCHEMA layout
+        repo: Repository full name filled into the `repo` column
+
+    Returns:
+        Arrow table with the SILVER_COMMIT_SCHEMA layout
+    """
+    if isinstance(commits, pa.RecordBatch):
+        commits = pa.Table.from_batches([commits])
+
+    commit_committer = pc.struct_field(commits['commit'], 'committer')
+    committer = commits['committer']
+    committer_date = pc.struct_field(commit_committer, 'date')
+
+    # As in the row-wise path, a missing or empty committer object falls back to -1 and a committer without id
+    # stays null; an object holding none of the projected fields (e.g. {"id": null}) counts as empty
+    committer_id = pc.struct_field(committer, 'id')
+    is_empty = pc.and_(pc.is_null(committer_id), pc.is_null(pc.struct_field(committer, 'login')))
+    committer_id = pc.if_else(is_empty, pa.scalar(-1, pa.int64()), committer_id)
+
+    commit_time = pc.strptime(committer_date, format='%Y-%m-%dT%H:%M:%SZ', unit='s')
+    dt = pc.strftime(pc.add(commit_time, DT_OFFSET), format='%Y-%m-%d')
+
+    return pa.Table.from_arrays(
+        [
+            pc.fill_null(commits['sha'], ''),
+            committer_id,
+            pc.struct_field(commit_committer, 'name'),
+            pc.struct_field(commit_committer, 'email'),
+            committer_date,
+            dt,
+            pa.repeat(pa.scalar(repo, pa.string()), len(commits)),
+        ],
+        schema=SILVER_COMMIT_SCHEMA
+    )
+
+def to_gold_commits_table(silver: pa.Table) -> pa.Table:
+    """
+    Convert transformed (silver layout) commits to the gold parquet layout,
+    where `dt` is a DATE as in the staging_commits table.
+
+    Args:
+        silver: Arrow table with the SILVER_COMMIT_SCHEMA layout
+
+    Returns:
+        Arrow table ready to be written as gold parquet
+    """
+    dt = pc.cast(pc.strptime(silver['dt'], format='%Y-%m-%d', unit='s'), pa.date32())
+    return silver.set_column(silver.schema.get_field_index('dt'), 'dt', dt)
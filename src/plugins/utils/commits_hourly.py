@@ -0,0 +1,125 @@
+import threading
+from datetime import timedelta
+from typing import BinaryIO, List, Union
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# Matches `f_commits_hourly` in sql/init_table.sql, in the same column order
+F_COMMITS_HOURLY_SCHEMA = pa.schema([
+    ('d_date_id', pa.int64()),
+    ('d_time_id', pa.int64()),
+    ('committer_id', pa.int64()),
+    ('committer_email', pa.string()),
+    ('commit_count', pa.int64()),
+    ('dt', pa.date32()),
+    ('repo', pa.string()),
+])
+
+# Grouping columns of the fact, every column but commit_count
+F_COMMITS_HOURLY_KEYS = ['d_date_id', 'd_time_id', 'committer_id', 'committer_email', 'dt', 'repo']
+
+# Object holding the aggregated fact of a partition
+F_COMMITS_HOURLY_BLOB_NAME = 'f_commits_hourly.parquet'
+
+# Hours are bucketed in GMT+7, as the partition day
+HOUR_OFFSET = pa.scalar(timedelta(hours=7), type=pa.duration('s'))
+
+def aggregate_commits_hourly(gold: pa.Table) -> pa.Table:
+    """
+    Count commits per day, hour (GMT+7), committer and repository,
+    as the former MERGE into `f_commits_hourly` did from `staging_commits`.
+
+    Args:
+        gold: Commits with the gold parquet layout
+
+    Returns:
+        Arrow table with the F_COMMITS_HOURLY_SCHEMA layout
+    """
+    if not gold.num_rows:
+        return F_COMMITS_HOURLY_SCHEMA.empty_table()
+
+    commit_time = pc.strptime(gold['committer_date'], format='%Y-%m-%dT%H:%M:%SZ', unit='s')
+    keys = pa.table({
+        'd_date_id': pc.cast(pc.strftime(pc.cast(gold['dt'], pa.timestamp('s')), format='%Y%m%d'), pa.int64()),
+        'd_time_id': pc.cast(pc.hour(pc.add(commit_time, HOUR_OFFSET)), pa.int64()),
+        'committer_id': gold['committer_id'],
+        'committer_email': gold['committer_email'],
+        'dt': gold['dt'],
+        'repo': gold['repo'],
+    })
+    # Null keys (e.g. a committer without id) form their own group, as in GROUP BY
+    counts = keys.group_by(F_COMMITS_HOURLY_KEYS).aggregate([([], 'count_all')])
+    return _to_fact_layout(counts, 'count_all')
+
+def _to_fact_layout(grouped: pa.Table, count_column: str) -> pa.Table:
+    grouped = grouped.rename_columns(['commit_count' if name == count_column else name for name in grouped.column_names])
+    return grouped.select(F_COMMITS_HOURLY_SCHEMA.names).cast(F_COMMITS_HOURLY_SCHEMA)
+
+class CommitsHourlyAggregator:
+    """
+    Thread-safe accumulator of the hourly commit counts of a partition.
+
+    Every gold table is reduced to its counts as it is written, so the
+    partition is aggregated without reading gold back; the partial counts
+    are summed at the end.
+    """
+
+    def __init__(self) -> None:
+        self._partials: List[pa.Table] = []
+        self._lock = threading.Lock()
+
+    def add(self, gold: pa.Table) -> None:
+        """
+        Count the commits of a gold table.
+
+        Args:
+            gold: Commits with the gold parquet layout
+        """
+        partial = aggregate_commits_hourly(gold)
+        with self._lock:
+            self._partials.append(partial)
+
+    def remove(self, gold: pa.Table) -> None:
+        """
+        Uncount the commits of a gold table added before (e.g. duplicates dropped from a written part).
+
+        Args:
+            gold: Commits with the gold parquet layout
+        """
+        partial = aggregate_commits_hourly(gold)
+        partial = partial.set_column(partial.schema.get_field_index('commit_count'), 'commit_count', pc.negate(partial['commit_count']))
+        with self._lock:
+            self._partials.append(partial)
+
+    def to_table(self) -> pa.Table:
+        """
+        Sum the partial counts.
+
+        Returns:
+            Arrow table with the F_COMMITS_HOURLY_SCHEMA layout, sorted by its keys
+        """
+        with self._lock:
+            partials = pa.concat_tables([F_COMMITS_HOURLY_SCHEMA.empty_table()] + self._partials)
+
+        totals = _to_fact_layout(partials.group_by(F_COMMITS_HOURLY_KEYS).aggregate([('commit_count', 'sum')]), 'commit_count_sum')
+        # Groups whose commits were all removed again
+        totals = totals.filter(pc.greater(totals['commit_count'], 0))
+        return totals.sort_by([(key, 'ascending') for key in F_COMMITS_HOURLY_KEYS])
+
+def write_commits_hourly_parquet(table: pa.Table, sink: Union[str, BinaryIO], compression: str = 'snappy') -> int:
+    """
+    Write the hourly commit counts as a single parquet file (also when empty,
+    so loading it truncates the fact partition).
+
+    Args:
+        table: Table with the F_COMMITS_HOURLY_SCHEMA layout
+        sink: Path or binary stream to write to
+        compression: Parquet compression codec (snappy, zstd, gzip, none)
+
+    Returns:
+        Number of rows written
+    """
+    pq.write_table(table.cast(F_COMMITS_HOURLY_SCHEMA), sink, compression=compression)
+    return table.num_rows
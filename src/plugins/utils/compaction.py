@@ -0,0 +1,92 @@
+import re
+from collections import defaultdict
+from typing import BinaryIO, Dict, Iterable, Union
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from plugins.utils.parquet_utils import DICTIONARY_COLUMNS, GOLD_COMMIT_SCHEMA
+
+# Written at the root of the monthly layer, it lists the current object of every month
+COMPACTION_MANIFEST_BLOB_NAME = "_compaction_manifest.json"
+
+# Rows of a month are ordered by day and committer (repo and sha only make the order deterministic)
+COMPACTION_SORT_KEYS = ['dt', 'committer_email', 'repo', 'commit_sha']
+
+# Gold parts of the repository partitions (the objects loaded into BigQuery), relative to the gold prefix
+GOLD_PART_PATTERN = re.compile(r'^dt=(?P<dt>(?P<month>\d{4}-\d{2})-\d{2})/repo=[^/]+/[^/]+\.parquet$')
+
+def group_gold_parts_by_month(checksums: Dict[str, str]) -> Dict[str, Dict[str, str]]:
+    """
+    Group the gold parts of a layer listing by month.
+
+    Args:
+        checksums: Mapping of object name (relative to the gold prefix) to content checksum
+
+    Returns:
+        Mapping of month (YYYY-MM) to the checksums of its parts
+    """
+    months: Dict[str, Dict[str, str]] = defaultdict(dict)
+    for name, checksum in checksums.items():
+        match = GOLD_PART_PATTERN.match(name)
+        if match:
+            months[match.group('month')][name] = checksum
+    return dict(months)
+
+def get_month_object_name(month: str, input_hash: str) -> str:
+    """
+    Object of a compacted month, relative to the monthly prefix.
+
+    The name is derived from the input hash, so a new version never
+    overwrites the object that the current manifest points to.
+
+    Args:
+        month: Month (YYYY-MM)
+        input_hash: Content hash of the month's gold parts
+
+    Returns:
+        Object name (e.g. month=2024-10/commits-0123456789abcdef.parquet)
+    """
+    return f"month={month}/commits-{input_hash[:16]}.parquet"
+
+def compact_month_tables(tables: Iterable[pa.Table]) -> pa.Table:
+    """
+    Merge the gold tables of a month into one table sorted by COMPACTION_SORT_KEYS.
+
+    Args:
+        tables: Tables with the GOLD_COMMIT_SCHEMA layout
+
+    Returns:
+        The sorted table
+    """
+    merged = pa.concat_tables([GOLD_COMMIT_SCHEMA.empty_table()] + [table.cast(GOLD_COMMIT_SCHEMA) for table in tables])
+    return merged.sort_by([(key, 'ascending') for key in COMPACTION_SORT_KEYS])
+
+def write_compacted_parquet(table: pa.Table, sink: Union[str, BinaryIO], compression: str = 'snappy', row_group_size: int = 64 * 1024) -> int:
+    """
+    Write a sorted month as a single parquet file.
+
+    Row groups and pages carry min / max statistics (and a page index), and
+    the sort order is recorded in the file metadata, so readers filtering on
+    dt or committer_email can skip row groups and pages.
+
+    Args:
+        table: Table sorted by COMPACTION_SORT_KEYS, with the GOLD_COMMIT_SCHEMA layout
+        sink: Path or binary stream to write to
+        compression: Parquet compression codec (snappy, zstd, gzip, none)
+        row_group_size: Maximum number of rows per row group
+
+    Returns:
+        Number of rows written
+    """
+    pq.write_table(
+        table.cast(GOLD_COMMIT_SCHEMA),
+        sink,
+        row_group_size=row_group_size,
+        compression=compression,
+        use_dictionary=DICTIONARY_COLUMNS,
+        write_statistics=True,
+        write_page_index=True,
+        sorting_columns=pq.SortingColumn.from_ordering(GOLD_COMMIT_SCHEMA, [(key, 'ascending') for key in COMPACTION_SORT_KEYS])
+    )
+    return table.num_rows
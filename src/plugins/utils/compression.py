@@ -0,0 +1,186 @@
+import gzip
+import io
+from typing import BinaryIO
+
+# Object-name suffix identifying each codec
+CODEC_SUFFIXES = {
+    'none': '',
+    'gzip': '.gz',
+    'zstd': '.zst',
+}
+
+# Typical size of GitHub commit NDJSON once decompressed, relative to the stored object (rounded up)
+CODEC_EXPANSION_RATIOS = {
+    'none': 1,
+    'gzip': 10,
+    'zstd': 10,
+}
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("zstd compression requires the 'zstandard' package") from e
+    return zstandard
+
+def validate_codec(codec: str) -> str:
+    """
+    Normalize and validate a compression codec name.
+
+    Args:
+        codec: Codec name (none, gzip or zstd); None means none
+
+    Returns:
+        The normalized codec name
+    """
+    codec = (codec or 'none').lower()
+    if codec not in CODEC_SUFFIXES:
+        raise ValueError(f"Unsupported compression codec: {codec}")
+    return codec
+
+def add_codec_suffix(name: str, codec: str) -> str:
+    """
+    Append the codec suffix to an object name.
+
+    Args:
+        name: Uncompressed object name (e.g. part-00001.json)
+        codec: Compression codec
+
+    Returns:
+        Object name identifying the codec (e.g. part-00001.json.gz)
+    """
+    return name + CODEC_SUFFIXES[validate_codec(codec)]
+
+def get_codec_from_name(name: str) -> str:
+    """
+    Detect the compression codec of an object from its name.
+
+    Args:
+        name: Object name
+
+    Returns:
+        The codec name, 'none' if the object is not compressed
+    """
+    for codec, suffix in CODEC_SUFFIXES.items():
+        if suffix and name.endswith(suffix):
+            return codec
+    return 'none'
+
+def estimate_decompressed_size(name: str, size: int) -> int:
+    """
+    Estimate the decompressed size of an object from its stored size.
+
+    Args:
+        name: Object name, its suffix identifies the codec
+        size: Stored size in bytes
+
+    Returns:
+        Estimated size in bytes once decompressed
+    """
+    return size * CODEC_EXPANSION_RATIOS[get_codec_from_name(name)]
+
+def strip_codec_suffix(name: str) -> str:
+    """
+    Remove the codec suffix from an object name.
+
+    Args:
+        name: Object name, possibly compressed
+
+    Returns:
+        The uncompressed object name
+    """
+    suffix = CODEC_SUFFIXES[get_codec_from_name(name)]
+    return name[:-len(suffix)] if suffix else name
+
+def compress(data: bytes, codec: str) -> bytes:
+    """
+    Compress a payload.
+
+    Args:
+        data: Uncompressed bytes
+        codec: Compression codec
+
+    Returns:
+        Compressed bytes
+    """
+    codec = validate_codec(codec)
+    if codec == 'gzip':
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if codec == 'zstd':
+        return _zstandard().ZstdCompressor(level=3).compress(data)
+    return data
+
+def decompress(data: bytes, codec: str) -> bytes:
+    """
+    Decompress a payload.
+
+    Args:
+        data: Compressed bytes
+        codec: Compression codec
+
+    Returns:
+        Uncompressed bytes
+    """
+    codec = validate_codec(codec)
+    if codec == 'gzip':
+        return gzip.decompress(data)
+    if codec == 'zstd':
+        return _zstandard().ZstdDecompressor().decompressobj().decompress(data)
+    return data
+
+def open_compressed_writer(raw: BinaryIO, codec: str) -> BinaryIO:
+    """
+    Wrap a binary stream so that writes are compressed on the fly.
+
+    Closing the returned stream flushes the codec but leaves `raw` open.
+    The output is deterministic (no gzip timestamp), so identical content
+    gives identical objects and content hashes.
+
+    Args:
+        raw: Destination stream
+        codec: Compression codec
+
+    Returns:
+        Writable binary stream
+    """
+    codec = validate_codec(codec)
+    if codec == 'gzip':
+        return gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6, mtime=0)
+    if codec == 'zstd':
+        return _zstandard().ZstdCompressor(level=3).stream_writer(raw, closefd=False)
+    return _UnclosableWriter(raw)
+
+def open_decompressed_reader(raw: BinaryIO, codec: str) -> BinaryIO:
+    """
+    Wrap a binary stream so that reads are decompressed on the fly.
+
+    Args:
+        raw: Source stream
+        codec: Compression codec
+
+    Returns:
+        Readable binary stream
+    """
+    codec = validate_codec(codec)
+    if codec == 'gzip':
+        return gzip.GzipFile(fileobj=raw, mode='rb')
+    if codec == 'zstd':
+        return _zstandard().ZstdDecompressor().stream_reader(raw, closefd=False)
+    return raw
+
+class _UnclosableWriter(io.RawIOBase):
+    """
+    Pass-through writer whose close() leaves the wrapped stream open.
+    """
+
+    def __init__(self, raw: BinaryIO) -> None:
+        self.raw = raw
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        return self.raw.write(data)
+
+    def tell(self) -> int:
+        return self.raw.tell()
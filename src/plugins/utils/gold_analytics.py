@@ -0,0 +1,276 @@
+"""
+Reporting queries computed locally from the gold parquet with pyarrow.
+
+The three reports of sql/query/ (top committers, longest daily streak and
+the weekday x hour range heat map) are computed from the gold commits,
+daily parts (dt=YYYY-MM-DD/repo=owner__name/) or the monthly layout listed
+in the compaction manifest, without BigQuery. Only the needed columns are
+read, days outside the requested range are pruned from the file listing
+(daily parts) or through the row group statistics (monthly objects), and
+the files are scanned on the Arrow thread pool.
+
+The results follow the SQL definitions over f_commits_hourly, so they can
+also serve to check the reporting tables.
+
+Usage (from src/):
+    python -m plugins.utils.gold_analytics all --path /tmp/airflow/local_storage/airr-labs-interview/gold/github_commits
+    python -m plugins.utils.gold_analytics heat-map --layout monthly --start-date 2024-09-01 --end-date 2024-11-30
+"""
+import argparse
+import json
+import math
+import time
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+
+from dags.config.config import Config
+from plugins.utils.commits_hourly import HOUR_OFFSET
+from plugins.utils.compaction import COMPACTION_MANIFEST_BLOB_NAME, GOLD_PART_PATTERN
+from plugins.utils.parquet_utils import GOLD_COMMIT_SCHEMA
+
+def _d_time_hour_range(hour: int) -> str:
+    # Same expression as the d_time rows in sql/init_table.sql, evaluated as BigQuery does
+    # (`/` is a FLOAT64 division and CAST to INT64 rounds half away from zero)
+    if hour == 0:
+        return '22-00'
+    start = math.floor(((hour - 1) / 3) * 3 + 1 + 0.5)
+    end = math.floor(((hour - 1) / 3) * 3 + 3 + 0.5)
+    return f"{start:02d}-{end:02d}"
+
+# hour_range_str of each d_time_id (hour of the day in GMT+7)
+D_TIME_HOUR_RANGES = pa.array([_d_time_hour_range(hour) for hour in range(24)])
+
+# Columns of the heat map query (sql/query/3-generate-heat-map.sql)
+HEAT_MAP_COLUMNS = ['01-03', '04-06', '07-09', '10-12', '13-15', '16-18', '19-21', '22-00']
+
+# Columns read by each report
+REPORT_COLUMNS = {
+    'top-committers': ['committer_email', 'dt'],
+    'longest-streak': ['committer_email', 'dt'],
+    'heat-map': ['committer_date', 'dt'],
+}
+
+DEFAULT_GOLD_PATHS = {
+    'daily': f"{Config.LOCAL_STORAGE_ROOT}/{Config.GCS_BUCKET}/{Config.GOLD_PREFIX_PATH}",
+    'monthly': f"{Config.LOCAL_STORAGE_ROOT}/{Config.GCS_BUCKET}/{Config.GOLD_MONTHLY_PREFIX_PATH}",
+}
+
+def list_gold_files(path: str, layout: str = 'daily', start_date: Optional[date] = None, end_date: Optional[date] = None) -> Tuple[pafs.FileSystem, List[str]]:
+    """
+    List the gold parquet files that may hold commits of the date range.
+
+    Args:
+        path: Local path or URI (e.g. gs://bucket/gold/github_commits) of the layer
+        layout: 'daily' (dt=/repo= parts) or 'monthly' (objects of the compaction manifest)
+        start_date: First day to read, inclusive (None: no lower bound)
+        end_date: Last day to read, inclusive (None: no upper bound)
+
+    Returns:
+        The filesystem of the layer and the paths of the files to scan
+    """
+    filesystem, root = pafs.FileSystem.from_uri(path) if '://' in path else (pafs.LocalFileSystem(), path)
+    root = root.rstrip('/')
+    first = start_date.isoformat() if start_date else '0000-00-00'
+    last = end_date.isoformat() if end_date else '9999-99-99'
+
+    if layout == 'monthly':
+        with filesystem.open_input_stream(f"{root}/{COMPACTION_MANIFEST_BLOB_NAME}") as manifest_file:
+            months = json.loads(manifest_file.read())['months']
+        return filesystem, [
+            f"{root}/{entry['object']}" for month, entry in sorted(months.items())
+            if first[:7] <= month <= last[:7]
+        ]
+
+    files = []
+    for info in filesystem.get_file_info(pafs.FileSelector(root, recursive=True, allow_not_found=True)):
+        match = GOLD_PART_PATTERN.match(info.path[len(root) + 1:])
+        if match and first <= match.group('dt') <= last:
+            files.append(info.path)
+    return filesystem, sorted(files)
+
+def scan_gold_commits(
+    path: str,
+    columns: List[str],
+    layout: str = 'daily',
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    use_threads: bool = True
+) -> pa.Table:
+    """
+    Read the given columns of the gold commits of a date range.
+
+    Args:
+        path: Local path or URI of the layer
+        columns: Columns to read
+        layout: 'daily' or 'monthly', see list_gold_files
+        start_date: First day to read, inclusive (None: no lower bound)
+        end_date: Last day to read, inclusive (None: no upper bound)
+        use_threads: Scan files and row groups on the Arrow thread pool
+
+    Returns:
+        Arrow table with the requested columns of GOLD_COMMIT_SCHEMA
+    """
+    filesystem, files = list_gold_files(path, layout, start_date, end_date)
+    dataset = ds.dataset(files, schema=GOLD_COMMIT_SCHEMA, format='parquet', filesystem=filesystem)
+
+    condition = None
+    if start_date:
+        condition = ds.field('dt') >= pa.scalar(start_date, pa.date32())
+    if end_date:
+        upper = ds.field('dt') <= pa.scalar(end_date, pa.date32())
+        condition = upper if condition is None else condition & upper
+
+    return dataset.to_table(columns=columns, filter=condition, use_threads=use_threads)
+
+def top_committers(commits: pa.Table, limit: int = 5) -> pa.Table:
+    """
+    Committers ranked by commit count, as sql/query/1-top-5-committers.sql.
+
+    Args:
+        commits: Gold commits with committer_email
+        limit: Number of rows returned
+
+    Returns:
+        Table of committer_email, sum_count and r (RANK, ties share a rank)
+    """
+    counts = commits.filter(pc.is_valid(commits['committer_email'])) \
+        .group_by('committer_email').aggregate([([], 'count_all')]) \
+        .sort_by([('count_all', 'descending'), ('committer_email', 'ascending')])
+
+    sums = counts['count_all'].to_pylist()
+    ranks = []
+    for index, total in enumerate(sums):
+        ranks.append(ranks[-1] if index and total == sums[index - 1] else index + 1)
+
+    return pa.table({
+        'committer_email': counts['committer_email'],
+        'sum_count': counts['count_all'],
+        'r': pa.array(ranks, pa.int64()),
+    }).slice(0, limit)
+
+def longest_streak(commits: pa.Table) -> pa.Table:
+    """
+    Committers with the longest run of consecutive days with commits,
+    as sql/query/2-committer-longest-streak-by-day.sql.
+
+    Args:
+        commits: Gold commits with committer_email and dt
+
+    Returns:
+        Table of committer_email and longest_streak, every committer ranked first
+    """
+    days = commits.filter(pc.is_valid(commits['committer_email'])) \
+        .group_by(['committer_email', 'dt']).aggregate([]) \
+        .sort_by([('committer_email', 'ascending'), ('dt', 'ascending')])
+    if not days.num_rows:
+        return pa.table({'committer_email': pa.array([], pa.string()), 'longest_streak': pa.array([], pa.int64())})
+
+    emails = days['committer_email'].combine_chunks()
+    day_numbers = pc.cast(days['dt'].combine_chunks(), pa.int32())
+
+    # A streak goes on while the committer is the same and the day follows the previous one
+    same_committer = pa.concat_arrays([pa.array([False]), pc.equal(emails[1:], emails[:-1])])
+    next_day = pc.fill_null(pc.equal(pc.pairwise_diff(day_numbers), 1), False)
+    new_streak = pc.invert(pc.and_(same_committer, next_day))
+
+    streaks = pa.table({
+        'committer_email': emails,
+        'streak_group': pc.cumulative_sum(pc.cast(new_streak, pa.int64())),
+    }).group_by(['committer_email', 'streak_group']).aggregate([([], 'count_all')])
+
+    longest = streaks.group_by('committer_email').aggregate([('count_all', 'max')])
+    best = pc.max(longest['count_all_max'])
+    return pa.table({
+        'committer_email': longest['committer_email'],
+        'longest_streak': longest['count_all_max'],
+    }).filter(pc.equal(longest['count_all_max'], best)).sort_by('committer_email')
+
+def heat_map(commits: pa.Table) -> pa.Table:
+    """
+    Commit counts per weekday and 3-hour range (GMT+7), as
+    sql/query/3-generate-heat-map.sql over the commits_heat_map cube.
+
+    Args:
+        commits: Gold commits with committer_date and dt
+
+    Returns:
+        Table of weekday and one column per HEAT_MAP_COLUMNS range, Monday first
+    """
+    commit_time = pc.strptime(commits['committer_date'], format='%Y-%m-%dT%H:%M:%SZ', unit='s')
+    cells = pa.table({
+        'weekday_number': pc.add(pc.day_of_week(commits['dt']), 1),
+        'weekday': pc.strftime(pc.cast(commits['dt'], pa.timestamp('s')), format='%A'),
+        'hour_range_str': pc.take(D_TIME_HOUR_RANGES, pc.hour(pc.add(commit_time, HOUR_OFFSET))),
+    })
+    # Commits without a time have no d_time row and are not in the cube
+    cells = cells.filter(pc.is_valid(cells['hour_range_str']))
+    counts = cells.group_by(['weekday_number', 'weekday', 'hour_range_str']).aggregate([([], 'count_all')])
+
+    rows: Dict[int, Dict] = {}
+    for cell in counts.to_pylist():
+        row = rows.setdefault(cell['weekday_number'], {'weekday': cell['weekday'], **{column: 0 for column in HEAT_MAP_COLUMNS}})
+        if cell['hour_range_str'] in row:
+            row[cell['hour_range_str']] += cell['count_all']
+
+    schema = pa.schema([('weekday', pa.string())] + [(column, pa.int64()) for column in HEAT_MAP_COLUMNS])
+    return pa.Table.from_pylist([rows[number] for number in sorted(rows)], schema=schema)
+
+REPORTS = {
+    'top-committers': top_committers,
+    'longest-streak': longest_streak,
+    'heat-map': heat_map,
+}
+
+def print_table(name: str, table: pa.Table) -> None:
+    widths = [max([len(column)] + [len(str(value)) for value in table[column].to_pylist()]) for column in table.column_names]
+    print(f"\n{name}")
+    print("  ".join(f"{column:>{width}}" for column, width in zip(table.column_names, widths)))
+    for row in table.to_pylist():
+        print("  ".join(f"{str(value):>{width}}" for value, width in zip(row.values(), widths)))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("report", choices=list(REPORTS) + ['all'], help="Report to compute")
+    parser.add_argument("--layout", choices=['daily', 'monthly'], default='daily', help="Gold layout to read")
+    parser.add_argument("--path", help="Local path or URI of the layer (default: the local storage backend layout)")
+    parser.add_argument("--start-date", type=date.fromisoformat, help="First day (YYYY-MM-DD), inclusive")
+    parser.add_argument("--end-date", type=date.fromisoformat, help="Last day (YYYY-MM-DD), inclusive")
+    parser.add_argument("--limit", type=int, default=5, help="Rows of the top committers report")
+    parser.add_argument("--no-threads", action='store_true', help="Scan on a single thread")
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    args = parser.parse_args()
+
+    names = list(REPORTS) if args.report == 'all' else [args.report]
+    columns = sorted({column for name in names for column in REPORT_COLUMNS[name]})
+
+    started_at = time.perf_counter()
+    commits = scan_gold_commits(
+        args.path or DEFAULT_GOLD_PATHS[args.layout],
+        columns,
+        layout=args.layout,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        use_threads=not args.no_threads
+    )
+    scan_seconds = time.perf_counter() - started_at
+
+    results = {}
+    for name in names:
+        started_at = time.perf_counter()
+        table = top_committers(commits, args.limit) if name == 'top-committers' else REPORTS[name](commits)
+        print_table(f"{name} ({time.perf_counter() - started_at:.3f}s)", table)
+        results[name] = table.to_pylist()
+
+    print(f"\nscanned {commits.num_rows} commits ({', '.join(columns)}) in {scan_seconds:.3f}s")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(results, output_file, indent=2, default=str)
+
+if __name__ == '__main__':
+    main()
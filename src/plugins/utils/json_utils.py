@@ -0,0 +1,115 @@
+import codecs
+import json
+from typing import Any, BinaryIO, Dict, Iterator, Union
+
+def to_ndjson_line(record: Dict[str, Any]) -> bytes:
+    """
+    Serialize one record as a compact newline-delimited JSON line.
+
+    Args:
+        record: The record to serialize
+
+    Returns:
+        UTF-8 encoded JSON followed by a newline
+    """
+    return json.dumps(record, separators=(',', ':'), ensure_ascii=False).encode('utf-8') + b'\n'
+
+def iter_json_records(content: Union[str, bytes]) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the records of a JSON document in either layout the pipeline
+    has written: newline-delimited JSON, or (legacy) a single JSON array.
+
+    Args:
+        content: Document content
+
+    Returns:
+        Iterator of records
+    """
+    if isinstance(content, bytes):
+        content = content.decode('utf-8')
+
+    stripped = content.lstrip()
+    if not stripped:
+        return
+
+    if stripped.startswith('['):
+        yield from json.loads(stripped)
+        return
+
+    for line in stripped.splitlines():
+        if line.strip():
+            yield json.loads(line)
+
+def iter_json_stream(stream: BinaryIO, chunk_size: int = 1024 * 1024) -> Iterator[Dict[str, Any]]:
+    """
+    Incrementally parse records from a binary stream holding either
+    newline-delimited JSON or a (legacy) JSON array, reading `chunk_size`
+    bytes at a time so memory stays bounded by the chunk and one record.
+
+    Args:
+        stream: Binary stream to read from
+        chunk_size: Bytes read per chunk
+
+    Returns:
+        Iterator of records
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    eof = False
+
+    def read_more() -> bool:
+        nonlocal buffer, eof
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer += utf8.decode(chunk or b'', final=eof)
+        return not eof
+
+    # Detect the layout from the first non-whitespace character
+    while not buffer.lstrip() and read_more():
+        pass
+    buffer = buffer.lstrip()
+    if not buffer:
+        return
+
+    if not buffer.startswith('['):
+        while True:
+            lines = buffer.split('\n')
+            buffer = lines.pop()
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+            if not read_more():
+                break
+        if buffer.strip():
+            yield json.loads(buffer)
+        return
+
+    position = 1
+    while True:
+        # Skip separators between array elements
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if position < len(buffer) or not read_more():
+                break
+        if position >= len(buffer) or buffer[position] == ']':
+            return
+
+        try:
+            record, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # Element is cut by the chunk boundary: drop consumed text and read more
+            buffer = buffer[position:]
+            position = 0
+            if not read_more():
+                raise
+            continue
+
+        yield record
+        position = end
+
+        # Release parsed text so the buffer does not grow with the document
+        if position >= chunk_size:
+            buffer = buffer[position:]
+            position = 0
@@ -0,0 +1,127 @@
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from airflow.exceptions import AirflowSkipException
+
+# Written next to the data of each silver / gold partition
+STAGE_MANIFEST_BLOB_NAME = "_stage_manifest.json"
+
+def compute_content_hash(checksums: Dict[str, str]) -> str:
+    """
+    Hash a set of objects from their names and content checksums.
+
+    Args:
+        checksums: Mapping of object name (relative to the partition) to content checksum
+
+    Returns:
+        Hex SHA-256 digest, independent of the mapping order
+    """
+    digest = hashlib.sha256()
+    for name in sorted(checksums):
+        digest.update(f"{name}\0{checksums[name]}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+class PartitionManifest:
+    """
+    Content-hash manifest of a stage output partition.
+
+    The manifest records the hash of the stage inputs and outputs, so a
+    re-run can short-circuit when the inputs are unchanged and the outputs
+    are still the ones it produced. For the gold partition it also records
+    the output hash last loaded into BigQuery (`loaded_output_hash`), so the
+    load and merges can be skipped as well.
+    """
+
+    def __init__(self, gcs, stage: str, src_bucket: str, src_prefix: str, dest_bucket: str, dest_prefix: str, log = None) -> None:
+        """
+        Initialize the manifest and hash the current inputs.
+
+        Args:
+            gcs: GCS helper of the partition
+            stage: Stage name, usually the task id
+            src_bucket: Input bucket name
+            src_prefix: Input prefix path in the bucket
+            dest_bucket: Output bucket name (the manifest is written there)
+            dest_prefix: Output prefix path in the bucket
+            log: Logger instance for logging operations
+        """
+        self.gcs = gcs
+        self.stage = stage
+        self.dest_bucket = dest_bucket
+        self.dest_prefix = dest_prefix
+        self.log = log
+        self.input_checksums = gcs.get_partition_checksums(gcs_bucket=src_bucket, prefix=src_prefix)
+        self.input_hash = compute_content_hash(self.input_checksums)
+        self.previous = gcs.download_from_gcs(gcs_bucket=dest_bucket, prefix=dest_prefix, blob_name=STAGE_MANIFEST_BLOB_NAME)
+        self.current: Optional[Dict[str, Any]] = None
+
+    def is_unchanged(self) -> bool:
+        """
+        Check whether the previous run processed the same inputs and its outputs are intact.
+
+        Returns:
+            True if the stage can be skipped
+        """
+        if not self.previous or self.previous.get('input_hash') != self.input_hash:
+            return False
+
+        output_hash = compute_content_hash(self.gcs.get_partition_checksums(gcs_bucket=self.dest_bucket, prefix=self.dest_prefix))
+        if output_hash != self.previous.get('output_hash'):
+            if self.log:
+                self.log.info("Inputs unchanged but outputs differ from the manifest, reprocessing")
+            return False
+
+        self.current = self.previous
+        if self.log:
+            self.log.info(f"Inputs unchanged since {self.previous.get('updated_at')} (hash {self.input_hash}), skipping {self.stage}")
+        return True
+
+    def commit(self) -> Dict[str, Any]:
+        """
+        Hash the outputs just written and store the manifest next to them.
+
+        Returns:
+            The manifest
+        """
+        output_checksums = self.gcs.get_partition_checksums(gcs_bucket=self.dest_bucket, prefix=self.dest_prefix)
+        self.current = {
+            "stage": self.stage,
+            "input_hash": self.input_hash,
+            "output_hash": compute_content_hash(output_checksums),
+            "inputs": self.input_checksums,
+            "outputs": output_checksums,
+            # Identical outputs (e.g. bronze changed only in fields that are not kept) need no reload
+            "loaded_output_hash": (self.previous or {}).get('loaded_output_hash'),
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }
+        self.gcs.upload_to_gcs(gcs_bucket=self.dest_bucket, prefix=self.dest_prefix, blob_name=STAGE_MANIFEST_BLOB_NAME, contents=self.current)
+        return self.current
+
+    def skip_if_loaded(self) -> None:
+        """
+        Skip the task, and through the trigger rules the downstream load and
+        merges, when these outputs were already loaded into BigQuery.
+        """
+        if self.current and self.current.get('loaded_output_hash') == self.current['output_hash']:
+            raise AirflowSkipException(f"Partition outputs (hash {self.current['output_hash']}) are already loaded")
+
+def mark_partition_loaded(gcs, bucket: str, prefix: str) -> Optional[Dict[str, Any]]:
+    """
+    Record in the partition manifest that its current outputs are loaded.
+
+    Args:
+        gcs: GCS helper of the partition
+        bucket: Bucket name of the partition
+        prefix: Prefix path in the bucket
+
+    Returns:
+        The updated manifest, None if the partition has no manifest
+    """
+    manifest = gcs.download_from_gcs(gcs_bucket=bucket, prefix=prefix, blob_name=STAGE_MANIFEST_BLOB_NAME)
+    if not manifest:
+        return None
+
+    manifest['loaded_output_hash'] = manifest['output_hash']
+    gcs.upload_to_gcs(gcs_bucket=bucket, prefix=prefix, blob_name=STAGE_MANIFEST_BLOB_NAME, contents=manifest)
+    return manifest
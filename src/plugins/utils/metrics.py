@@ -0,0 +1,261 @@
+import functools
+import io
+import json
+import os
+import resource
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional
+
+from dags.config.config import Config
+
+class StatsdMetricsSink:
+    """
+    Emit stage metrics through Airflow's StatsD integration (a no-op unless `[metrics] statsd_on` is set).
+    """
+
+    def __init__(self, prefix: str) -> None:
+        """
+        Initialize the sink.
+
+        Args:
+            prefix: Prefix of every metric name (e.g. github_commits_etl)
+        """
+        self.prefix = prefix
+
+    def emit(self, metrics: Dict[str, Any]) -> None:
+        from airflow.stats import Stats
+
+        name = f"{self.prefix}.{metrics['stage']}"
+        Stats.timing(f"{name}.wall", metrics['wall_seconds'] * 1000)
+        for phase, seconds in metrics['phase_seconds'].items():
+            Stats.timing(f"{name}.phase.{phase}", seconds * 1000)
+        for counter, value in metrics['counters'].items():
+            Stats.incr(f"{name}.{counter}", value)
+        Stats.gauge(f"{name}.peak_rss_mb", metrics['peak_rss_mb'])
+
+class FileMetricsSink:
+    """
+    Append stage metrics as one JSON line per task run to a local file.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize the sink.
+
+        Args:
+            path: NDJSON file to append to
+        """
+        self.path = path
+
+    def emit(self, metrics: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as metrics_file:
+            metrics_file.write(json.dumps(metrics) + '\n')
+
+class StageMetrics:
+    """
+    Performance metrics of one task run: wall time per phase
+    (fetch, rate_limit_wait, list, download, parse, transform, dedup,
+    serialize, upload, delete), counters (rows, bytes, API calls, retries, ...) and
+    peak memory.
+
+    Phases are timed exclusively per thread: entering a phase inside another
+    one pauses the outer phase, so e.g. the download time spent inside a
+    parse is not counted twice. With several worker threads the phase times
+    are summed over the threads and may exceed the wall time.
+    """
+
+    def __init__(self, stage: str, sinks: Optional[List[Any]] = None) -> None:
+        """
+        Initialize the metrics.
+
+        Args:
+            stage: Stage name, usually the task id
+            sinks: Sinks receiving the metrics on emit (objects with an emit(dict) method)
+        """
+        self.stage = stage
+        self.sinks = sinks or []
+        self.phase_seconds: Dict[str, float] = defaultdict(float)
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.started_at = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time a phase of the work done by the current thread.
+
+        Args:
+            name: Phase name
+        """
+        stack = self._local.__dict__.setdefault('stack', [])
+        now = time.perf_counter()
+        if stack:
+            # Pause the enclosing phase
+            outer = stack[-1]
+            self._add_time(outer[0], now - outer[1])
+        stack.append([name, now])
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self._add_time(name, now - stack.pop()[1])
+            if stack:
+                # Resume the enclosing phase
+                stack[-1][1] = now
+
+    def _add_time(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.phase_seconds[name] += seconds
+
+    def incr(self, name: str, value: int = 1) -> None:
+        """
+        Increase a counter.
+
+        Args:
+            name: Counter name (e.g. rows_written, bytes_uploaded, api_calls)
+            value: Amount to add
+        """
+        with self._lock:
+            self.counters[name] += value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Snapshot of the metrics.
+
+        Returns:
+            JSON-serializable metrics
+        """
+        with self._lock:
+            return {
+                "stage": self.stage,
+                "wall_seconds": time.perf_counter() - self.started_at,
+                "phase_seconds": dict(self.phase_seconds),
+                "counters": dict(self.counters),
+                # ru_maxrss is reported in KiB on Linux
+                "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            }
+
+    def emit(self, context: Optional[Dict] = None, log = None) -> Dict[str, Any]:
+        """
+        Push the metrics as the `metrics` XCom of the task instance and send them to every sink.
+
+        Args:
+            context: Airflow context of the task run, if any
+            log: Logger instance for logging operations
+
+        Returns:
+            The emitted metrics
+        """
+        metrics = self.to_dict()
+        if context and context.get('ti'):
+            context['ti'].xcom_push(key='metrics', value=metrics)
+        for sink in self.sinks:
+            sink.emit(metrics)
+        if log:
+            log.info(f"Stage metrics: {json.dumps(metrics)}")
+        return metrics
+
+class NullMetrics:
+    """
+    Stand-in used when no metrics are collected.
+    """
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        yield
+
+    def incr(self, name: str, value: int = 1) -> None:
+        pass
+
+NULL_METRICS = NullMetrics()
+
+def create_stage_metrics(stage: str, prefix: str = Config.METRICS_PREFIX, file_path: Optional[str] = None) -> StageMetrics:
+    """
+    Create the metrics of a task run, emitted to StatsD and optionally to a local file.
+
+    Args:
+        stage: Stage name, usually the task id
+        prefix: StatsD metric name prefix
+        file_path: NDJSON file also receiving the metrics, None to disable
+
+    Returns:
+        The stage metrics
+    """
+    sinks = [StatsdMetricsSink(prefix)]
+    if file_path:
+        sinks.append(FileMetricsSink(file_path))
+    return StageMetrics(stage, sinks=sinks)
+
+def instrument_execute(execute: Callable) -> Callable:
+    """
+    Decorate an operator's execute() so that `self.metrics` collects the
+    metrics of the run, emitted (XCom, StatsD, optional file) even if it fails.
+    Errors of the sinks are only logged, the task keeps its own outcome.
+
+    The operator must have a `metrics_file_path` attribute.
+
+    Args:
+        execute: The operator's execute method
+
+    Returns:
+        The instrumented method
+    """
+    @functools.wraps(execute)
+    def wrapper(self, context, *args, **kwargs):
+        self.metrics = create_stage_metrics(self.task_id, file_path=self.metrics_file_path)
+        try:
+            return execute(self, context, *args, **kwargs)
+        finally:
+            # A failing sink (XCom, StatsD, metrics file) must not change the outcome of the task
+            try:
+                self.metrics.emit(context, log=self.log)
+            except Exception:
+                self.log.warning("Could not emit the stage metrics", exc_info=True)
+            self.metrics = NULL_METRICS
+    return wrapper
+
+class MeteredReader(io.RawIOBase):
+    """
+    Reader accounting reads of the wrapped stream to the `download` phase and `bytes_downloaded`.
+    """
+
+    def __init__(self, raw: BinaryIO, metrics) -> None:
+        self.raw = raw
+        self.metrics = metrics
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        with self.metrics.phase('download'):
+            data = self.raw.read(len(target))
+        size = len(data)
+        target[:size] = data
+        self.metrics.incr('bytes_downloaded', size)
+        return size
+
+class MeteredWriter(io.RawIOBase):
+    """
+    Writer accounting writes to the wrapped stream to the `upload` phase and `bytes_uploaded`.
+    """
+
+    def __init__(self, raw: BinaryIO, metrics) -> None:
+        self.raw = raw
+        self.metrics = metrics
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        with self.metrics.phase('upload'):
+            written = self.raw.write(data)
+        self.metrics.incr('bytes_uploaded', len(data))
+        return written
+
+    def tell(self) -> int:
+        return self.raw.tell()
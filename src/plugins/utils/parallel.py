@@ -0,0 +1,106 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+from plugins.utils.compression import estimate_decompressed_size
+
+class ByteBudget:
+    """
+    Counting limit on the number of bytes in flight across workers.
+
+    A single item larger than the whole budget is still admitted once
+    nothing else is in flight, so oversized objects cannot deadlock.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        """
+        Initialize the budget.
+
+        Args:
+            max_bytes: Maximum number of bytes in flight
+        """
+        self.max_bytes = max_bytes
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, size: int) -> None:
+        """
+        Block until `size` bytes fit in the budget, then reserve them.
+
+        Args:
+            size: Bytes to reserve
+        """
+        with self._condition:
+            while self.in_flight and self.in_flight + size > self.max_bytes:
+                self._condition.wait()
+            self.in_flight += size
+
+    def release(self, size: int) -> None:
+        """
+        Return reserved bytes to the budget.
+
+        Args:
+            size: Bytes to release
+        """
+        with self._condition:
+            self.in_flight -= size
+            self._condition.notify_all()
+
+def process_blobs_in_parallel(
+    blobs: List[Tuple[str, int]],
+    process_blob: Callable[[str], Any],
+    max_concurrency: int = 4,
+    max_in_flight_bytes: int = 256 * 1024 * 1024,
+    log = None
+) -> List[Dict[str, Any]]:
+    """
+    Run `process_blob` over blobs on a worker pool, overlapping the download,
+    conversion and upload of different blobs while bounding the bytes in flight.
+
+    Workers hold the decompressed content of their blob, so compressed blobs
+    count for their estimated decompressed size (estimate_decompressed_size).
+
+    Args:
+        blobs: (object name, object size in bytes) pairs, processed in this order
+        process_blob: Function processing one object name and returning its result
+        max_concurrency: Maximum number of blobs processed at the same time
+        max_in_flight_bytes: Maximum total (estimated decompressed) size of the blobs being processed
+        log: Logger instance for logging operations
+
+    Returns:
+        One entry per blob, in input order, with `blob`, `result` and `error` (None on success)
+    """
+    budget = ByteBudget(max_in_flight_bytes)
+    futures: List[Tuple[str, Future]] = []
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+        for blob, stored_size in blobs:
+            size = estimate_decompressed_size(blob, stored_size)
+            budget.acquire(size)
+            future = executor.submit(process_blob, blob)
+            future.add_done_callback(lambda _, size=size: budget.release(size))
+            futures.append((blob, future))
+
+    results = []
+    for blob, future in futures:
+        error = future.exception()
+        if error is not None and log:
+            log.error(f"Failed to process {blob}: {error!r}")
+        results.append({
+            "blob": blob,
+            "result": None if error is not None else future.result(),
+            "error": error
+        })
+    return results
+
+def raise_on_blob_errors(results: List[Dict[str, Any]]) -> None:
+    """
+    Raise a single error summarizing every failed blob.
+
+    Args:
+        results: Output of process_blobs_in_parallel
+    """
+    failed = [result for result in results if result["error"] is not None]
+    if failed:
+        details = "; ".join(f"{result['blob']}: {result['error']!r}" for result in failed)
+        raise ValueError(f"{len(failed)} of {len(results)} blobs failed: {details}")
@@ -0,0 +1,84 @@
+import io
+import json
+from typing import BinaryIO, Iterable, Union
+
+import pyarrow as pa
+import pyarrow.json as pa_json
+import pyarrow.parquet as pq
+
+from plugins.utils.arrow_transform import SILVER_COMMIT_SCHEMA, to_gold_commits_table
+
+# Matches `staging_commits` in sql/init_table.sql
+GOLD_COMMIT_SCHEMA = pa.schema([
+    ('commit_sha', pa.string()),
+    ('committer_id', pa.int64()),
+    ('committer_name', pa.string()),
+    ('committer_email', pa.string()),
+    ('committer_date', pa.string()),
+    ('dt', pa.date32()),
+    ('repo', pa.string()),
+])
+
+# Every column is dictionary-encoded (dt, repo and committer_id shrink to almost nothing) except the ones
+# unique or close to unique per commit, whose dictionary would be as large as the column itself
+PLAIN_COLUMNS = ['commit_sha', 'committer_date']
+DICTIONARY_COLUMNS = [name for name in GOLD_COMMIT_SCHEMA.names if name not in PLAIN_COLUMNS]
+
+def read_silver_commits_table(source: Union[str, BinaryIO], block_size: int = 1024 * 1024) -> pa.Table:
+    """
+    Read silver commits (NDJSON, or a legacy JSON array) straight into an
+    Arrow table with the gold schema, without going through pandas.
+
+    Args:
+        source: Path or binary stream of the silver content (already decompressed)
+        block_size: Bytes parsed per block by the JSON reader
+
+    Returns:
+        Arrow table with the GOLD_COMMIT_SCHEMA layout
+    """
+    if isinstance(source, str):
+        with open(source, 'rb') as source_file:
+            return read_silver_commits_table(source_file, block_size)
+
+    source = io.BufferedReader(source, buffer_size=block_size) if not hasattr(source, 'peek') else source
+    head = source.peek(block_size).lstrip()
+    if not head:
+        return GOLD_COMMIT_SCHEMA.empty_table()
+
+    if head.startswith(b'['):
+        silver = pa.Table.from_pylist(json.load(source), schema=SILVER_COMMIT_SCHEMA)
+    else:
+        silver = pa_json.read_json(
+            source,
+            read_options=pa_json.ReadOptions(block_size=block_size),
+            parse_options=pa_json.ParseOptions(explicit_schema=SILVER_COMMIT_SCHEMA, unexpected_field_behavior='ignore')
+        )
+
+    return to_gold_commits_table(silver)
+
+def write_gold_parquet(tables: Iterable[pa.Table], sink: Union[str, BinaryIO], compression: str = 'snappy', row_group_size: int = 128 * 1024) -> int:
+    """
+    Write gold commit tables to a single parquet file with the explicit
+    gold schema, dictionary encoding (but for PLAIN_COLUMNS) and bounded row groups.
+
+    Args:
+        tables: Tables with the GOLD_COMMIT_SCHEMA layout (consumed lazily)
+        sink: Path or binary stream to write to
+        compression: Parquet compression codec (snappy, zstd, gzip, none)
+        row_group_size: Maximum number of rows per row group
+
+    Returns:
+        Number of rows written
+    """
+    rows = 0
+    with pq.ParquetWriter(
+        sink,
+        GOLD_COMMIT_SCHEMA,
+        compression=compression,
+        use_dictionary=DICTIONARY_COLUMNS,
+        write_statistics=True
+    ) as writer:
+        for table in tables:
+            writer.write_table(table.cast(GOLD_COMMIT_SCHEMA), row_group_size=row_group_size)
+            rows += table.num_rows
+    return rows
@@ -0,0 +1,151 @@
+import fcntl
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+class RateLimitGovernor:
+    """
+    Token-bucket governor for the GitHub API rate limit.
+
+    The bucket is the `X-RateLimit-Remaining` budget, refilled at
+    `X-RateLimit-Reset`. State lives in a small JSON file guarded by an
+    exclusive lock, so every task sharing the same token on a worker draws
+    from the same budget.
+    """
+
+    def __init__(self, state_path: str, reserve: int = 50, pace_below: int = 500, limit: int = 5000, window: int = 3600, log = None) -> None:
+        """
+        Initialize the governor.
+
+        Args:
+            state_path: Path of the shared state file
+            reserve: Number of calls kept back; at or below it callers sleep until reset
+            pace_below: Below this budget calls are spread evenly until reset
+            limit: Calls per window assumed until a response reports X-RateLimit-Limit
+            window: Length of a rate limit window in seconds
+            log: Logger instance for logging operations
+        """
+        self.state_path = state_path
+        self.reserve = reserve
+        self.pace_below = pace_below
+        self.limit = limit
+        self.window = window
+        self.log = log
+
+    @contextmanager
+    def _locked_state(self) -> Iterator[Dict]:
+        """
+        Open the state file under an exclusive lock and persist changes on exit.
+
+        Returns:
+            Iterator yielding the mutable state dictionary
+        """
+        os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+        with open(self.state_path, 'a+', encoding='utf-8') as state_file:
+            fcntl.flock(state_file, fcntl.LOCK_EX)
+            try:
+                state_file.seek(0)
+                content = state_file.read()
+                state = json.loads(content) if content else {}
+                yield state
+                state_file.seek(0)
+                state_file.truncate()
+                state_file.write(json.dumps(state))
+                state_file.flush()
+            finally:
+                fcntl.flock(state_file, fcntl.LOCK_UN)
+
+    def acquire(self) -> None:
+        """
+        Take one call from the shared budget, sleeping when the budget is exhausted
+        or pacing the call when it is running low.
+        """
+        while True:
+            with self._locked_state() as state:
+                now = time.time()
+                remaining = state.get('remaining')
+                reset = state.get('reset', 0)
+
+                # Unknown budget or the window already rolled over: assume a fresh window and count the calls
+                # issued against it, until a response reports the actual budget (see update)
+                if remaining is None or now >= reset:
+                    remaining = state.get('limit', self.limit)
+                    reset = now + self.window
+                    state.update({'remaining': remaining, 'reset': reset, 'next_slot': 0, 'estimated': True})
+
+                if remaining > self.reserve:
+                    state['remaining'] = remaining - 1
+                    wait = 0
+                    if remaining < self.pace_below:
+                        # Hand out evenly spaced slots so all callers together spread the budget until reset
+                        slot = max(now, state.get('next_slot', 0))
+                        state['next_slot'] = slot + (reset - now) / (remaining - self.reserve)
+                        wait = slot - now
+                else:
+                    wait = None
+
+            if wait is None:
+                self._sleep_until(reset)
+                continue
+
+            if wait > 0:
+                time.sleep(wait)
+            return
+
+    def update(self, headers: Dict[str, str]) -> None:
+        """
+        Record the budget reported by the API in a response.
+
+        Args:
+            headers: Response headers containing X-RateLimit-Remaining / X-RateLimit-Reset
+        """
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+
+        remaining, reset = int(remaining), int(reset)
+        limit = headers.get('X-RateLimit-Limit')
+        with self._locked_state() as state:
+            if limit is not None:
+                state['limit'] = int(limit)
+            if state.pop('estimated', False):
+                # First report of a window that was only estimated: its reset time replaces the estimate,
+                # and calls counted since the rollover may still be in flight
+                state['remaining'] = min(state['remaining'], remaining)
+                state['reset'] = reset
+                return
+            # Responses from concurrent callers arrive out of order; within one window keep the lowest budget
+            if reset > state.get('reset', 0) or state.get('remaining') is None:
+                state['remaining'] = remaining
+            else:
+                state['remaining'] = min(state['remaining'], remaining)
+            state['reset'] = max(reset, state.get('reset', 0))
+
+    def block_until(self, reset: Optional[float]) -> None:
+        """
+        Mark the budget as exhausted for everyone and sleep until it refills.
+
+        Args:
+            reset: Epoch seconds when the budget refills
+        """
+        reset = reset or time.time() + 60
+        with self._locked_state() as state:
+            state.pop('estimated', None)
+            state['remaining'] = 0
+            state['reset'] = max(reset, state.get('reset', 0))
+        self._sleep_until(reset)
+
+    def _sleep_until(self, reset: float) -> None:
+        """
+        Sleep until the given reset time (plus a small safety margin).
+
+        Args:
+            reset: Epoch seconds when the budget refills
+        """
+        wait = max(0, reset - time.time()) + 1
+        if self.log:
+            self.log.info(f"GitHub rate limit exhausted, sleeping {wait:.0f}s until reset")
+        time.sleep(wait)
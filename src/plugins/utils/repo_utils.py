@@ -0,0 +1,45 @@
+from typing import Optional
+from urllib.parse import urlparse
+
+def get_repo_partition_prefix_str(repo: str) -> str:
+    """
+    Hive partition of a repository, nested under the `dt=` partition.
+
+    Owners cannot contain underscores, so the slug maps back to the repository.
+
+    Args:
+        repo: Repository full name (e.g. torvalds/linux)
+
+    Returns:
+        Partition path (e.g. repo=torvalds__linux)
+    """
+    return f"repo={repo.replace('/', '__')}"
+
+def get_repo_api_url(api_url: str, repo: Optional[str] = None) -> str:
+    """
+    Commits endpoint of a repository.
+
+    Args:
+        api_url: Commits endpoint, with a `{repo}` placeholder when repo is given
+        repo: Repository full name (e.g. torvalds/linux)
+
+    Returns:
+        The endpoint URL
+    """
+    return api_url.format(repo=repo) if repo else api_url
+
+def get_repo_from_api_url(api_url: str) -> str:
+    """
+    Repository of a REST commits endpoint.
+
+    Args:
+        api_url: Commits endpoint (e.g. https://api.github.com/repos/torvalds/linux/commits)
+
+    Returns:
+        Repository full name (e.g. torvalds/linux)
+    """
+    path = urlparse(api_url).path.split('/')
+    if 'repos' not in path or len(path) < path.index('repos') + 3:
+        raise ValueError(f"Cannot find the repository in API URL {api_url}")
+    index = path.index('repos')
+    return f"{path[index + 1]}/{path[index + 2]}"
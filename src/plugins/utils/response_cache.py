@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+class ResponseCache:
+    """
+    Persistent, size-bounded cache of API responses used for conditional requests.
+
+    Each entry stores the body together with its `ETag` / `Last-Modified`
+    validators, keyed by URL and query parameters. When the cache grows past
+    `max_bytes` the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 512 * 1024 * 1024, log = None) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache entries
+            max_bytes: Maximum total size of the cache on disk
+            log: Logger instance for logging operations
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.log = log
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._size = sum(entry.stat().st_size for entry in os.scandir(cache_dir) if entry.name.endswith('.json'))
+
+    @staticmethod
+    def make_key(url: str, params: Dict) -> str:
+        """
+        Build a stable cache key from a URL and its query parameters.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+
+        Returns:
+            Hex digest identifying the request
+        """
+        raw = json.dumps([url, sorted((str(k), str(v)) for k, v in params.items())])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, url: str, params: Dict) -> Optional[Dict]:
+        """
+        Look up a cached entry.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+
+        Returns:
+            Entry with `etag`, `last_modified`, `headers` and `body`, or None
+        """
+        path = self._entry_path(self.make_key(url, params))
+        try:
+            with open(path, 'r', encoding='utf-8') as entry_file:
+                entry = json.load(entry_file)
+        except (OSError, ValueError):
+            return None
+
+        # Touch the entry so eviction treats it as recently used
+        os.utime(path)
+        return entry
+
+    def put(self, url: str, params: Dict, etag: Optional[str], last_modified: Optional[str], headers: Dict[str, str], body: str) -> None:
+        """
+        Store a response, then evict old entries if the cache is over budget.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+            etag: Value of the `ETag` response header
+            last_modified: Value of the `Last-Modified` response header
+            headers: Response headers worth replaying on a hit (e.g. `Link`)
+            body: Response body text
+        """
+        if not etag and not last_modified:
+            return
+
+        path = self._entry_path(self.make_key(url, params))
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as entry_file:
+            json.dump({
+                'etag': etag,
+                'last_modified': last_modified,
+                'headers': headers,
+                'body': body
+            }, entry_file)
+        size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._size += size
+            over_budget = self._size > self.max_bytes
+        if over_budget:
+            self._evict()
+
+    def record(self, hit: bool) -> None:
+        """
+        Count a cache hit or miss.
+
+        Args:
+            hit: True when the cached body was reused
+        """
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _evict(self) -> None:
+        """
+        Remove least recently used entries until the cache fits in `max_bytes`.
+        """
+        with self._lock:
+            entries = []
+            total = 0
+            for entry in os.scandir(self.cache_dir):
+                if not entry.name.endswith('.json'):
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+
+            self._size = total
+            if self.log:
+                self.log.info(f"Evicted response cache entries, cache size now {total} bytes")
@@ -0,0 +1,223 @@
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from plugins.utils.repo_utils import get_repo_partition_prefix_str
+from plugins.utils.time_utils import get_hive_partition_prefix_str
+
+# Shard of the commits kept by one partition, for the commits of one month:
+# month=YYYY-MM/dt=YYYY-MM-DD.parquet under the repository prefix of the index
+SHA_INDEX_SHARD_PATTERN = re.compile(r'^month=(?P<month>\d{4}-\d{2})/(?P<partition>dt=\d{4}-\d{2}-\d{2})\.parquet$')
+
+SHA_INDEX_SCHEMA = pa.schema([
+    ('commit_sha', pa.string()),
+    ('dt', pa.date32()),
+])
+
+def get_month_keys(dt: pa.ChunkedArray) -> pa.ChunkedArray:
+    """
+    Month (YYYY-MM) of each commit day.
+
+    Args:
+        dt: Commit days, as DATE (gold layout) or YYYY-MM-DD strings (silver layout)
+
+    Returns:
+        The months as strings
+    """
+    return pc.utf8_slice_codeunits(pc.cast(dt, pa.string()), 0, 7)
+
+class CommitShaIndex:
+    """
+    Index of the commit SHAs already kept by the gold partitions of a
+    repository, used to drop commits that reach a partition again (pages
+    shifting during a sweep, retried or overlapping extraction windows).
+
+    The index is made of sorted parquet shards, one per partition and
+    month of the commit day, so a partition only ever rewrites its own
+    shards (mapped tasks and runs of other days do not contend) and a
+    re-run of a partition replaces them. Lookups load the shards of the
+    other partitions for the months of the checked commits, once per month,
+    and are vectorized (`is_in`) over whole tables.
+
+    Commits are also deduplicated across the parts of the partition. Parts
+    are filtered concurrently, so this is settled once every part is read
+    (`resolve`): a commit reaching several parts is kept by the part with
+    the lowest name, whichever part finished first. Partitions of the same
+    repository processed at the same time do not see each other's shards
+    yet, so a commit reaching both is kept by both.
+    """
+
+    def __init__(self, gcs, bucket: str, prefix: str, repo: Optional[str] = None, log = None, metrics = None) -> None:
+        """
+        Initialize the index and list its shards.
+
+        Args:
+            gcs: GCS helper of the partition being processed
+            bucket: Bucket name of the index
+            prefix: Prefix path of the index in the bucket
+            repo: Repository full name (e.g. torvalds/linux), the index is kept per repository
+            log: Logger instance for logging operations
+            metrics: StageMetrics receiving the dedup phase and counters
+        """
+        self.gcs = gcs
+        self.bucket = bucket
+        self.prefix = f"{prefix}/{get_repo_partition_prefix_str(repo)}" if repo else prefix
+        self.partition = get_hive_partition_prefix_str(gcs.partition_date)
+        self.log = log
+        self.metrics = metrics or gcs.metrics
+
+        self.shards: Dict[str, List[str]] = defaultdict(list)
+        self.own_shards: List[str] = []
+        for name in sorted(gcs.get_layer_checksums(gcs_bucket=bucket, prefix=self.prefix)):
+            match = SHA_INDEX_SHARD_PATTERN.match(name)
+            if not match:
+                continue
+            if match.group('partition') == self.partition:
+                self.own_shards.append(name)
+            else:
+                self.shards[match.group('month')].append(name)
+
+        self._months: Dict[str, pa.Array] = {}
+        # Commits kept by every part, in the batches they were filtered in
+        self._parts: Dict[str, List[pa.Table]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.dropped = 0
+        self.lookups = 0
+        self.lookup_seconds = 0.0
+
+    def _load_months(self, months: Iterable[str]) -> None:
+        # Shards are read outside the lock, so parts of other months are not held up by the downloads; parts of the
+        # same month loading it at the same time read its shards twice, and the first copy is kept
+        for month in months:
+            if month in self._months:
+                continue
+            tables = [self.gcs.read_parquet_table(gcs_bucket=self.bucket, object_name=f"{self.prefix}/{name}") for name in self.shards.get(month, [])]
+            shas = pa.concat_tables([SHA_INDEX_SCHEMA.empty_table()] + [table.cast(SHA_INDEX_SCHEMA) for table in tables])['commit_sha']
+            with self._lock:
+                self._months.setdefault(month, shas.combine_chunks())
+
+    def filter(self, table: pa.Table, part: str) -> pa.Table:
+        """
+        Drop the commits already indexed by another partition, or already kept by the same part.
+
+        Args:
+            table: Commits with commit_sha and dt (gold or silver layout)
+            part: Name of the part holding the commits (e.g. part-00001); the batches of a part are filtered in order
+
+        Returns:
+            The commits to keep, in their original order
+        """
+        if not table.num_rows:
+            return table
+
+        started_at = time.perf_counter()
+        with self.metrics.phase('dedup'):
+            months = [month for month in pc.unique(get_month_keys(table['dt'])).to_pylist() if month]
+            self._load_months(months)
+
+            # First row of every sha within the table
+            shas = table['commit_sha']
+            rows = pa.table({'commit_sha': shas, 'row': pa.array(range(table.num_rows), pa.int64())})
+            first_rows = rows.group_by('commit_sha', use_threads=False).aggregate([('row', 'min')])['row_min']
+            is_first = pc.is_in(rows['row'], value_set=first_rows)
+            # Commits without a sha cannot be told apart, they are kept and not indexed
+            no_sha = pc.fill_null(pc.equal(shas, ''), True)
+
+            # Only the thread processing the part adds to its batches, and loaded months are never replaced
+            with self._lock:
+                batches = list(self._parts[part])
+            part_shas = pa.concat_arrays([pa.array([], pa.string())] + [batch['commit_sha'].combine_chunks() for batch in batches])
+            known = pc.is_in(shas, value_set=part_shas)
+            for month in months:
+                known = pc.or_(known, pc.is_in(shas, value_set=self._months[month]))
+            kept = table.filter(pc.or_(no_sha, pc.and_(is_first, pc.invert(pc.fill_null(known, False)))))
+
+            kept_shas = kept.select(['commit_sha', 'dt']).filter(pc.not_equal(kept['commit_sha'], ''))
+            kept_shas = kept_shas.set_column(1, 'dt', pc.cast(pc.cast(kept_shas['dt'], pa.string()), pa.date32())).cast(SHA_INDEX_SCHEMA)
+
+        with self._lock:
+            self._parts[part].append(kept_shas)
+            self.lookups += 1
+            self.lookup_seconds += time.perf_counter() - started_at
+            self.checked += table.num_rows
+            self.dropped += table.num_rows - kept.num_rows
+
+        self.metrics.incr('sha_index_lookups')
+        self.metrics.incr('sha_index_checked', table.num_rows)
+        self.metrics.incr('duplicates_dropped', table.num_rows - kept.num_rows)
+        return kept
+
+    def resolve(self) -> Dict[str, pa.Array]:
+        """
+        Settle the commits kept by several parts of the partition, once every part is read:
+        the part with the lowest name keeps them, the other parts have to drop them.
+
+        Returns:
+            Mapping of part name to the SHAs the part has to drop, for the parts holding such commits only
+        """
+        with self.metrics.phase('dedup'):
+            kept = pa.concat_tables([SHA_INDEX_SCHEMA.append(pa.field('part', pa.string())).empty_table()] + [
+                batch.append_column('part', pa.repeat(pa.scalar(part, pa.string()), batch.num_rows))
+                for part, batches in self._parts.items()
+                for batch in batches
+            ])
+            first_parts = kept.group_by('commit_sha', use_threads=False).aggregate([('part', 'min')])
+            kept = kept.join(first_parts, 'commit_sha')
+            duplicates = kept.filter(pc.not_equal(kept['part'], kept['part_min']))
+
+            drops = {}
+            for part in sorted(pc.unique(duplicates['part']).to_pylist()):
+                drops[part] = duplicates.filter(pc.equal(duplicates['part'], part))['commit_sha'].combine_chunks()
+                self._parts[part] = [batch.filter(pc.invert(pc.is_in(batch['commit_sha'], value_set=drops[part]))) for batch in self._parts[part]]
+
+        self.dropped += duplicates.num_rows
+        self.metrics.incr('duplicates_dropped', duplicates.num_rows)
+        return drops
+
+    def commit(self, parquet_compression: str = 'snappy') -> Dict[str, int]:
+        """
+        Replace the shards of this partition with the commits it kept.
+
+        Args:
+            parquet_compression: Parquet compression codec of the shards
+
+        Returns:
+            Summary of the lookups (checked and dropped commits, shards written)
+        """
+        kept = pa.concat_tables([SHA_INDEX_SCHEMA.empty_table()] + [batch for batches in self._parts.values() for batch in batches])
+        months = get_month_keys(kept['dt'])
+
+        written = []
+        for month in sorted(month for month in pc.unique(months).to_pylist() if month):
+            name = f"month={month}/{self.partition}.parquet"
+            shard = kept.filter(pc.equal(months, month)).sort_by('commit_sha')
+            with self.gcs.open_blob_writer(self.bucket, f"{self.prefix}/{name}", content_type='application/octet-stream') as writer:
+                with self.metrics.phase('serialize'):
+                    pq.write_table(shard, writer, compression=parquet_compression)
+            written.append(name)
+
+        for name in self.own_shards:
+            if name not in written:
+                self.gcs.delete_blob(gcs_bucket=self.bucket, object_name=f"{self.prefix}/{name}")
+
+        summary = {
+            "checked": self.checked,
+            "dropped": self.dropped,
+            "indexed_months": len(self._months),
+            "indexed_shas": sum(len(shas) for shas in self._months.values()),
+            "shards_written": len(written),
+        }
+        if self.log:
+            mean_ms = 1000 * self.lookup_seconds / self.lookups if self.lookups else 0.0
+            self.log.info(
+                f"SHA index: checked {self.checked} commits against {summary['indexed_shas']} indexed SHAs "
+                f"({self.lookups} bulk lookups, {mean_ms:.2f} ms each on average), dropped {self.dropped} duplicates"
+            )
+        return summary
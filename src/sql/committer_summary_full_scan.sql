@@ -0,0 +1,59 @@
+-- Per-committer state computed from the whole f_commits_hourly history: the state after the
+-- last active day, and the state after the active day before it (prior_*)
+WITH commits_by_dt AS (
+  SELECT committer_email, dt, SUM(commit_count) AS commit_count
+  FROM `personal-project-447516.airr_labs_interview.f_commits_hourly`
+  WHERE committer_email IS NOT NULL
+  GROUP BY committer_email, dt
+),
+
+streak_boundaries AS (
+  SELECT
+    committer_email,
+    dt,
+    SUM(commit_count) OVER w AS total_commits,
+    -- Detect start of a new streak when previous day had no commit
+    IF(DATE_DIFF(dt, LAG(dt) OVER w, DAY) = 1, 0, 1) AS new_streak,
+    ROW_NUMBER() OVER (PARTITION BY committer_email ORDER BY dt DESC) AS active_days_ago
+  FROM commits_by_dt
+  WINDOW w AS (PARTITION BY committer_email ORDER BY dt)
+),
+
+streak_groups AS (
+  SELECT
+    *,
+    SUM(new_streak) OVER (PARTITION BY committer_email ORDER BY dt) AS streak_group
+  FROM streak_boundaries
+),
+
+streak_states AS (
+  SELECT
+    *,
+    MIN(dt) OVER (PARTITION BY committer_email, streak_group) AS current_streak_start,
+    ROW_NUMBER() OVER (PARTITION BY committer_email, streak_group ORDER BY dt) AS current_streak_length
+  FROM streak_groups
+),
+
+daily_states AS (
+  SELECT
+    *,
+    MAX(current_streak_length) OVER (PARTITION BY committer_email ORDER BY dt) AS longest_streak
+  FROM streak_states
+)
+
+SELECT
+  cur.committer_email,
+  cur.total_commits,
+  cur.current_streak_start,
+  cur.current_streak_length,
+  cur.longest_streak,
+  cur.dt AS last_active_dt,
+  prior.total_commits AS prior_total_commits,
+  prior.current_streak_start AS prior_current_streak_start,
+  prior.current_streak_length AS prior_current_streak_length,
+  prior.longest_streak AS prior_longest_streak,
+  prior.dt AS prior_last_active_dt
+FROM daily_states cur
+LEFT JOIN daily_states prior
+  ON prior.committer_email = cur.committer_email AND prior.active_days_ago = 2
+WHERE cur.active_days_ago = 1
@@ -6,10 +6,14 @@ CREATE TABLE IF NOT EXISTS `personal-project-447516.airr_labs_interview.staging_
   committer_email STRING,
   committer_date STRING,
   dt DATE,
-  PRIMARY KEY (commit_sha) NOT ENFORCED
+  repo STRING,
+  PRIMARY KEY (repo, commit_sha) NOT ENFORCED
 )
 PARTITION BY dt;
 
+-- Tables created before the multi-repository layout
+ALTER TABLE `personal-project-447516.airr_labs_interview.staging_commits` ADD COLUMN IF NOT EXISTS repo STRING;
+
 
 CREATE TABLE IF NOT EXISTS `personal-project-447516.airr_labs_interview.d_date`
 (
@@ -36,8 +40,49 @@ CREATE TABLE IF NOT EXISTS `personal-project-447516.airr_labs_interview.f_commit
   committer_email STRING,
   commit_count INT64,
   dt DATE,
-  PRIMARY KEY (committer_email,d_date_id) NOT ENFORCED,
+  repo STRING,
+  PRIMARY KEY (repo,committer_email,d_date_id) NOT ENFORCED,
   FOREIGN KEY(d_date_id) references `personal-project-447516.airr_labs_interview.d_date`(d_date_id) NOT ENFORCED,
   FOREIGN KEY(d_time_id) references `personal-project-447516.airr_labs_interview.d_time`(d_time_id) NOT ENFORCED
 )
 PARTITION BY dt;
+
+ALTER TABLE `personal-project-447516.airr_labs_interview.f_commits_hourly` ADD COLUMN IF NOT EXISTS repo STRING;
+
+-- Per-committer state of the reporting queries, see merge_committer_summary.sql
+CREATE TABLE IF NOT EXISTS `personal-project-447516.airr_labs_interview.committer_summary`
+(
+  committer_email STRING,
+  total_commits INT64,
+  current_streak_start DATE,
+  current_streak_length INT64,
+  longest_streak INT64,
+  last_active_dt DATE,
+  prior_total_commits INT64,
+  prior_current_streak_start DATE,
+  prior_current_streak_length INT64,
+  prior_longest_streak INT64,
+  prior_last_active_dt DATE,
+  PRIMARY KEY (committer_email) NOT ENFORCED
+);
+
+-- Commit counts per weekday and hour range (the heat map), see merge_commits_heat_map.sql
+CREATE TABLE IF NOT EXISTS `personal-project-447516.airr_labs_interview.commits_heat_map`
+(
+  weekday_number INT64,
+  weekday STRING,
+  hour_range_str STRING,
+  commit_count INT64,
+  PRIMARY KEY (weekday_number, hour_range_str) NOT ENFORCED
+);
+
+-- Contribution of each day to the heat map, replaced when the day is re-run
+CREATE TABLE IF NOT EXISTS `personal-project-447516.airr_labs_interview.commits_heat_map_daily`
+(
+  dt DATE,
+  weekday_number INT64,
+  weekday STRING,
+  hour_range_str STRING,
+  commit_count INT64
+)
+PARTITION BY dt;
@@ -0,0 +1,56 @@
+-- Adds the day's f_commits_hourly partition to the heat map cube, minus what a previous run of
+-- the day added (kept in commits_heat_map_daily), so runs can be repeated and applied in any order.
+-- The first run applies every day of the fact table up to its own.
+DECLARE run_dt DATE DEFAULT DATE('{{ ds }}');
+DECLARE first_dt DATE DEFAULT (
+  SELECT IF(COUNT(1) = 0, DATE '1970-01-01', run_dt)
+  FROM `personal-project-447516.airr_labs_interview.commits_heat_map_daily`
+);
+
+BEGIN TRANSACTION;
+
+CREATE TEMP TABLE day_cells AS
+SELECT
+  f.dt,
+  MOD(EXTRACT(DAYOFWEEK FROM f.dt) + 5, 7) + 1 AS weekday_number,
+  FORMAT_DATE('%A', f.dt) AS weekday,
+  t.hour_range_str,
+  SUM(f.commit_count) AS commit_count
+FROM `personal-project-447516.airr_labs_interview.f_commits_hourly` f
+JOIN `personal-project-447516.airr_labs_interview.d_time` t
+  ON f.d_time_id = t.d_time_id
+WHERE f.dt BETWEEN first_dt AND run_dt
+GROUP BY f.dt, weekday_number, weekday, t.hour_range_str;
+
+MERGE INTO `personal-project-447516.airr_labs_interview.commits_heat_map` AS target
+USING (
+  SELECT weekday_number, ANY_VALUE(weekday) AS weekday, hour_range_str, SUM(commit_count) AS commit_count
+  FROM (
+    SELECT weekday_number, weekday, hour_range_str, commit_count
+    FROM day_cells
+
+    UNION ALL
+
+    SELECT weekday_number, weekday, hour_range_str, -commit_count
+    FROM `personal-project-447516.airr_labs_interview.commits_heat_map_daily`
+    WHERE dt BETWEEN first_dt AND run_dt
+  )
+  GROUP BY weekday_number, hour_range_str
+) AS source
+ON target.weekday_number = source.weekday_number AND target.hour_range_str = source.hour_range_str
+
+WHEN MATCHED THEN
+  UPDATE SET commit_count = target.commit_count + source.commit_count
+
+WHEN NOT MATCHED BY TARGET THEN
+  INSERT (weekday_number, weekday, hour_range_str, commit_count)
+  VALUES (source.weekday_number, source.weekday, source.hour_range_str, source.commit_count);
+
+DELETE FROM `personal-project-447516.airr_labs_interview.commits_heat_map_daily`
+WHERE dt BETWEEN first_dt AND run_dt;
+
+INSERT INTO `personal-project-447516.airr_labs_interview.commits_heat_map_daily` (dt, weekday_number, weekday, hour_range_str, commit_count)
+SELECT dt, weekday_number, weekday, hour_range_str, commit_count
+FROM day_cells;
+
+COMMIT TRANSACTION;
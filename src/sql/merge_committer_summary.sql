@@ -0,0 +1,92 @@
+-- Applies the day's f_commits_hourly partition to the per-committer state.
+-- A re-run of the last applied day starts again from the prior state of its committers;
+-- a run for an earlier day (or on an empty table) rebuilds the state from the whole history.
+DECLARE run_dt DATE DEFAULT DATE('{{ ds }}');
+DECLARE rebuild BOOL DEFAULT (
+  SELECT COUNT(1) = 0 OR COUNTIF(last_active_dt > run_dt) > 0
+  FROM `personal-project-447516.airr_labs_interview.committer_summary`
+);
+
+IF rebuild THEN
+{% include 'sql/rebuild_committer_summary.sql' %}
+ELSE
+MERGE INTO `personal-project-447516.airr_labs_interview.committer_summary` AS target
+USING (
+  WITH day_commits AS (
+    SELECT committer_email, SUM(commit_count) AS commit_count
+    FROM `personal-project-447516.airr_labs_interview.f_commits_hourly`
+    WHERE dt = run_dt AND committer_email IS NOT NULL
+    GROUP BY committer_email
+  ),
+
+  -- State before the day of its committers, and of the committers it had when last applied
+  base AS (
+    SELECT
+      committer_email,
+      IF(last_active_dt = run_dt, prior_total_commits, total_commits) AS total_commits,
+      IF(last_active_dt = run_dt, prior_current_streak_start, current_streak_start) AS current_streak_start,
+      IF(last_active_dt = run_dt, prior_current_streak_length, current_streak_length) AS current_streak_length,
+      IF(last_active_dt = run_dt, prior_longest_streak, longest_streak) AS longest_streak,
+      IF(last_active_dt = run_dt, prior_last_active_dt, last_active_dt) AS last_active_dt
+    FROM `personal-project-447516.airr_labs_interview.committer_summary`
+    WHERE last_active_dt = run_dt
+      OR committer_email IN (SELECT committer_email FROM day_commits)
+  ),
+
+  streaks AS (
+    SELECT
+      committer_email,
+      d.commit_count,
+      b.total_commits,
+      b.current_streak_start,
+      b.current_streak_length,
+      b.longest_streak,
+      b.last_active_dt,
+      -- Continue the streak when the committer was active the day before
+      IF(b.last_active_dt = DATE_SUB(run_dt, INTERVAL 1 DAY), b.current_streak_start, run_dt) AS new_streak_start,
+      IF(b.last_active_dt = DATE_SUB(run_dt, INTERVAL 1 DAY), b.current_streak_length + 1, 1) AS new_streak_length
+    FROM day_commits d
+    FULL OUTER JOIN base b USING (committer_email)
+  )
+
+  -- Committers without commits on the day (left by a re-run) go back to their prior state,
+  -- or are removed when the day was their first one
+  SELECT
+    committer_email,
+    commit_count IS NULL AND last_active_dt IS NULL AS is_removed,
+    IF(commit_count IS NULL, total_commits, IFNULL(total_commits, 0) + commit_count) AS total_commits,
+    IF(commit_count IS NULL, current_streak_start, new_streak_start) AS current_streak_start,
+    IF(commit_count IS NULL, current_streak_length, new_streak_length) AS current_streak_length,
+    IF(commit_count IS NULL, longest_streak, GREATEST(IFNULL(longest_streak, 0), new_streak_length)) AS longest_streak,
+    IF(commit_count IS NULL, last_active_dt, run_dt) AS last_active_dt,
+    IF(commit_count IS NULL, NULL, total_commits) AS prior_total_commits,
+    IF(commit_count IS NULL, NULL, current_streak_start) AS prior_current_streak_start,
+    IF(commit_count IS NULL, NULL, current_streak_length) AS prior_current_streak_length,
+    IF(commit_count IS NULL, NULL, longest_streak) AS prior_longest_streak,
+    IF(commit_count IS NULL, NULL, last_active_dt) AS prior_last_active_dt
+  FROM streaks
+) AS source
+ON target.committer_email = source.committer_email
+
+WHEN MATCHED AND source.is_removed THEN
+  DELETE
+
+WHEN MATCHED THEN
+  UPDATE SET
+    total_commits = source.total_commits,
+    current_streak_start = source.current_streak_start,
+    current_streak_length = source.current_streak_length,
+    longest_streak = source.longest_streak,
+    last_active_dt = source.last_active_dt,
+    prior_total_commits = source.prior_total_commits,
+    prior_current_streak_start = source.prior_current_streak_start,
+    prior_current_streak_length = source.prior_current_streak_length,
+    prior_longest_streak = source.prior_longest_streak,
+    prior_last_active_dt = source.prior_last_active_dt
+
+WHEN NOT MATCHED BY TARGET THEN
+  INSERT (committer_email, total_commits, current_streak_start, current_streak_length, longest_streak, last_active_dt,
+    prior_total_commits, prior_current_streak_start, prior_current_streak_length, prior_longest_streak, prior_last_active_dt)
+  VALUES (source.committer_email, source.total_commits, source.current_streak_start, source.current_streak_length, source.longest_streak, source.last_active_dt,
+    source.prior_total_commits, source.prior_current_streak_start, source.prior_current_streak_length, source.prior_longest_streak, source.prior_last_active_dt);
+END IF;
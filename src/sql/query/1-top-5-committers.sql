@@ -1,11 +1,5 @@
-WITH commiter_agg AS (
-  SELECT committer_email, SUM(commit_count) as sum_count
-  FROM `personal-project-447516.airr_labs_interview.f_commits_hourly`
-  GROUP BY committer_email
-)
-
-SELECT committer_email, sum_count, RANK() OVER (ORDER BY sum_count DESC) as r
-FROM commiter_agg
+SELECT committer_email, total_commits as sum_count, RANK() OVER (ORDER BY total_commits DESC) as r
+FROM `personal-project-447516.airr_labs_interview.committer_summary`
 ORDER BY r ASC
 LIMIT 5
-;
\ No newline at end of file
+;
@@ -0,0 +1,27 @@
+MERGE INTO `personal-project-447516.airr_labs_interview.committer_summary` AS target
+USING (
+{% include 'sql/committer_summary_full_scan.sql' %}
+) AS source
+ON target.committer_email = source.committer_email
+
+WHEN MATCHED THEN
+  UPDATE SET
+    total_commits = source.total_commits,
+    current_streak_start = source.current_streak_start,
+    current_streak_length = source.current_streak_length,
+    longest_streak = source.longest_streak,
+    last_active_dt = source.last_active_dt,
+    prior_total_commits = source.prior_total_commits,
+    prior_current_streak_start = source.prior_current_streak_start,
+    prior_current_streak_length = source.prior_current_streak_length,
+    prior_longest_streak = source.prior_longest_streak,
+    prior_last_active_dt = source.prior_last_active_dt
+
+WHEN NOT MATCHED BY TARGET THEN
+  INSERT (committer_email, total_commits, current_streak_start, current_streak_length, longest_streak, last_active_dt,
+    prior_total_commits, prior_current_streak_start, prior_current_streak_length, prior_longest_streak, prior_last_active_dt)
+  VALUES (source.committer_email, source.total_commits, source.current_streak_start, source.current_streak_length, source.longest_streak, source.last_active_dt,
+    source.prior_total_commits, source.prior_current_streak_start, source.prior_current_streak_length, source.prior_longest_streak, source.prior_last_active_dt)
+
+WHEN NOT MATCHED BY SOURCE THEN
+  DELETE;
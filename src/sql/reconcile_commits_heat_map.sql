@@ -0,0 +1,47 @@
+-- Checks the heat map read from commits_heat_map against the same heat map computed from the whole
+-- f_commits_hourly table (every hourly row counted, no DISTINCT), failing the job on any difference.
+
+ASSERT NOT EXISTS (
+  WITH full_scan AS (
+    SELECT
+      d.weekday,
+      SUM(CASE WHEN t.hour_range_str = '01-03' THEN f.commit_count ELSE 0 END) AS `01-03`,
+      SUM(CASE WHEN t.hour_range_str = '04-06' THEN f.commit_count ELSE 0 END) AS `04-06`,
+      SUM(CASE WHEN t.hour_range_str = '07-09' THEN f.commit_count ELSE 0 END) AS `07-09`,
+      SUM(CASE WHEN t.hour_range_str = '10-12' THEN f.commit_count ELSE 0 END) AS `10-12`,
+      SUM(CASE WHEN t.hour_range_str = '13-15' THEN f.commit_count ELSE 0 END) AS `13-15`,
+      SUM(CASE WHEN t.hour_range_str = '16-18' THEN f.commit_count ELSE 0 END) AS `16-18`,
+      SUM(CASE WHEN t.hour_range_str = '19-21' THEN f.commit_count ELSE 0 END) AS `19-21`,
+      SUM(CASE WHEN t.hour_range_str = '22-00' THEN f.commit_count ELSE 0 END) AS `22-00`
+    FROM `personal-project-447516.airr_labs_interview.f_commits_hourly` f
+    LEFT JOIN `personal-project-447516.airr_labs_interview.d_date` d
+      ON f.d_date_id = d.d_date_id
+    LEFT JOIN `personal-project-447516.airr_labs_interview.d_time` t
+      ON f.d_time_id = t.d_time_id
+    GROUP BY d.weekday
+  ),
+
+  cube AS (
+    SELECT
+      weekday,
+      SUM(CASE WHEN hour_range_str = '01-03' THEN commit_count ELSE 0 END) AS `01-03`,
+      SUM(CASE WHEN hour_range_str = '04-06' THEN commit_count ELSE 0 END) AS `04-06`,
+      SUM(CASE WHEN hour_range_str = '07-09' THEN commit_count ELSE 0 END) AS `07-09`,
+      SUM(CASE WHEN hour_range_str = '10-12' THEN commit_count ELSE 0 END) AS `10-12`,
+      SUM(CASE WHEN hour_range_str = '13-15' THEN commit_count ELSE 0 END) AS `13-15`,
+      SUM(CASE WHEN hour_range_str = '16-18' THEN commit_count ELSE 0 END) AS `16-18`,
+      SUM(CASE WHEN hour_range_str = '19-21' THEN commit_count ELSE 0 END) AS `19-21`,
+      SUM(CASE WHEN hour_range_str = '22-00' THEN commit_count ELSE 0 END) AS `22-00`
+    FROM `personal-project-447516.airr_labs_interview.commits_heat_map`
+    -- Cells emptied by re-runs are kept with a zero count
+    WHERE commit_count != 0
+    GROUP BY weekday
+  ),
+
+  differences AS (
+    (SELECT * FROM full_scan EXCEPT DISTINCT SELECT * FROM cube)
+    UNION ALL
+    (SELECT * FROM cube EXCEPT DISTINCT SELECT * FROM full_scan)
+  )
+  SELECT * FROM differences
+) AS 'commits_heat_map differs from the heat map of the full f_commits_hourly table';
@@ -0,0 +1,104 @@
+-- Checks committer_summary against full scans of f_commits_hourly: the state of every committer,
+-- and the results of the reporting queries computed both ways (fails the job on any difference).
+-- Commits without a committer email are not attributed to a committer in either.
+
+ASSERT NOT EXISTS (
+  WITH full_scan AS (
+{% include 'sql/committer_summary_full_scan.sql' %}
+  )
+  SELECT committer_email
+  FROM full_scan f
+  FULL OUTER JOIN `personal-project-447516.airr_labs_interview.committer_summary` s USING (committer_email)
+  WHERE f.total_commits IS DISTINCT FROM s.total_commits
+    OR f.current_streak_start IS DISTINCT FROM s.current_streak_start
+    OR f.current_streak_length IS DISTINCT FROM s.current_streak_length
+    OR f.longest_streak IS DISTINCT FROM s.longest_streak
+    OR f.last_active_dt IS DISTINCT FROM s.last_active_dt
+) AS 'committer_summary state differs from the full scan of f_commits_hourly';
+
+-- Top committers (ties at the last rank included)
+ASSERT NOT EXISTS (
+  WITH full_scan AS (
+    SELECT committer_email, sum_count, RANK() OVER (ORDER BY sum_count DESC) as r
+    FROM (
+      SELECT committer_email, SUM(commit_count) as sum_count
+      FROM `personal-project-447516.airr_labs_interview.f_commits_hourly`
+      WHERE committer_email IS NOT NULL
+      GROUP BY committer_email
+    )
+  ),
+
+  summary AS (
+    SELECT committer_email, total_commits as sum_count, RANK() OVER (ORDER BY total_commits DESC) as r
+    FROM `personal-project-447516.airr_labs_interview.committer_summary`
+  ),
+
+  differences AS (
+    (SELECT * FROM full_scan WHERE r <= 5 EXCEPT DISTINCT SELECT * FROM summary WHERE r <= 5)
+    UNION ALL
+    (SELECT * FROM summary WHERE r <= 5 EXCEPT DISTINCT SELECT * FROM full_scan WHERE r <= 5)
+  )
+  SELECT * FROM differences
+) AS 'Top committers differ between committer_summary and f_commits_hourly';
+
+-- Longest streak
+ASSERT NOT EXISTS (
+  WITH commits_agg_by_dt AS (
+    SELECT committer_email, dt
+    FROM `personal-project-447516.airr_labs_interview.f_commits_hourly`
+    WHERE committer_email IS NOT NULL
+    GROUP BY committer_email, dt
+  ),
+
+  streak_boundaries AS (
+    SELECT
+      committer_email,
+      dt,
+      CASE 
+        WHEN LAG(dt) OVER (PARTITION BY committer_email ORDER BY dt) IS NULL 
+          OR DATE_DIFF(dt, LAG(dt) OVER (PARTITION BY committer_email ORDER BY dt), DAY) > 1 
+        THEN 1 
+        ELSE 0 
+      END as new_streak
+    FROM commits_agg_by_dt
+  ),
+
+  streak_groups AS (
+    SELECT
+      committer_email,
+      SUM(new_streak) OVER (PARTITION BY committer_email ORDER BY dt) as streak_group
+    FROM streak_boundaries
+  ),
+
+  streak_lengths AS (
+    SELECT committer_email, streak_group, COUNT(1) as streak_length
+    FROM streak_groups
+    GROUP BY committer_email, streak_group
+  ),
+
+  full_scan AS (
+    SELECT committer_email, longest_streak
+    FROM (
+      SELECT committer_email, MAX(streak_length) as longest_streak, RANK() OVER(ORDER BY MAX(streak_length) DESC) as r
+      FROM streak_lengths
+      GROUP BY committer_email
+    )
+    WHERE r = 1
+  ),
+
+  summary AS (
+    SELECT committer_email, longest_streak
+    FROM (
+      SELECT committer_email, longest_streak, RANK() OVER(ORDER BY longest_streak DESC) as r
+      FROM `personal-project-447516.airr_labs_interview.committer_summary`
+    )
+    WHERE r = 1
+  ),
+
+  differences AS (
+    (SELECT * FROM full_scan EXCEPT DISTINCT SELECT * FROM summary)
+    UNION ALL
+    (SELECT * FROM summary EXCEPT DISTINCT SELECT * FROM full_scan)
+  )
+  SELECT * FROM differences
+) AS 'Longest streak differs between committer_summary and f_commits_hourly';
@@ -0,0 +1,51 @@
+import io
+import json
+
+import pytest
+
+from plugins.operators.gcs_transform import GCSTransformOperator
+from plugins.utils.arrow_transform import iter_github_commits_batches, transform_github_commits_table
+from plugins.utils.json_utils import to_ndjson_line
+
+def make_commit(sha: str, **committer) -> dict:
+    commit = {"sha": sha, "commit": {"committer": {"name": "n", "email": "e@x", "date": "2024-10-01T18:30:00Z"}}}
+    commit.update(committer)
+    return commit
+
+def run_python(commits: list) -> bytes:
+    operator = GCSTransformOperator(task_id='test_transform', src_path='', dest_path='', repo='owner/name', transform_engine='python')
+    return b''.join(to_ndjson_line(record) for record in operator.transform_github_commits(commits))
+
+def run_columnar(commits: list) -> bytes:
+    bronze = b''.join(json.dumps(commit).encode('utf-8') + b'\n' for commit in commits)
+    return b''.join(
+        to_ndjson_line(record)
+        for batch in iter_github_commits_batches(io.BytesIO(bronze))
+        for record in transform_github_commits_table(batch, repo='owner/name').to_pylist()
+    )
+
+@pytest.mark.parametrize('committer, committer_id', [
+    ({"committer": {"id": 5, "login": "octocat"}}, 5),
+    ({"committer": {"id": 7}}, 7),
+    ({"committer": {}}, -1),
+    ({"committer": None}, -1),
+    ({}, -1),
+    ({"committer": {"login": "octocat"}}, None),
+])
+def test_engines_are_byte_identical(committer, committer_id):
+    commits = [make_commit('a', **committer)]
+    python_output = run_python(commits)
+
+    assert run_columnar(commits) == python_output
+    assert json.loads(python_output)['committer_id'] == committer_id
+    assert json.loads(python_output)['dt'] == '2024-10-02'
+
+def test_engines_are_byte_identical_on_mixed_committers():
+    commits = [
+        make_commit('a', committer={"id": 1, "login": "one"}),
+        make_commit('b', committer={}),
+        make_commit('c', committer={"login": "no-id"}),
+        make_commit('d'),
+    ]
+
+    assert run_columnar(commits) == run_python(commits)
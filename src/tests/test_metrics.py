@@ -0,0 +1,42 @@
+import logging
+
+import pytest
+
+from plugins.utils.metrics import NULL_METRICS, instrument_execute
+
+class FakeOperator:
+    task_id = 'test_stage'
+    log = logging.getLogger('test_metrics')
+
+    def __init__(self, metrics_file_path: str, error: Exception = None) -> None:
+        self.metrics_file_path = metrics_file_path
+        self.error = error
+
+    @instrument_execute
+    def execute(self, context):
+        self.metrics.incr('rows_written', 3)
+        if self.error:
+            raise self.error
+        return 'done'
+
+def test_metrics_are_written_to_the_file(tmp_path):
+    path = tmp_path / 'metrics.ndjson'
+    operator = FakeOperator(str(path))
+
+    assert operator.execute({}) == 'done'
+    assert '"rows_written": 3' in path.read_text()
+    assert operator.metrics is NULL_METRICS
+
+def test_failing_sink_does_not_fail_the_task(tmp_path, caplog):
+    # A directory cannot be opened as the metrics file
+    operator = FakeOperator(str(tmp_path))
+
+    with caplog.at_level(logging.WARNING):
+        assert operator.execute({}) == 'done'
+    assert 'Could not emit the stage metrics' in caplog.text
+
+def test_failing_sink_keeps_the_task_error(tmp_path):
+    operator = FakeOperator(str(tmp_path), error=ValueError('task failed'))
+
+    with pytest.raises(ValueError, match='task failed'):
+        operator.execute({})
@@ -0,0 +1,34 @@
+import threading
+import time
+
+from plugins.utils.compression import estimate_decompressed_size
+from plugins.utils.parallel import process_blobs_in_parallel
+
+def run_concurrently(blobs, max_in_flight_bytes: int) -> int:
+    lock = threading.Lock()
+    state = {'running': 0, 'peak': 0}
+
+    def process_blob(blob: str) -> str:
+        with lock:
+            state['running'] += 1
+            state['peak'] = max(state['peak'], state['running'])
+        time.sleep(0.05)
+        with lock:
+            state['running'] -= 1
+        return blob
+
+    results = process_blobs_in_parallel(blobs, process_blob, max_concurrency=4, max_in_flight_bytes=max_in_flight_bytes)
+    assert [result['result'] for result in results] == [blob for blob, _ in blobs]
+    return state['peak']
+
+def test_compressed_blobs_count_for_their_decompressed_size():
+    assert estimate_decompressed_size('part-00001.json', 100) == 100
+    assert estimate_decompressed_size('part-00001.json.gz', 100) > 100
+    assert estimate_decompressed_size('part-00001.json.zst', 100) > 100
+
+def test_budget_bounds_decompressed_bytes_in_flight():
+    size = 100
+    budget = 2 * estimate_decompressed_size('part.json.gz', size)
+
+    assert run_concurrently([(f'part-{i}.json', size) for i in range(4)], budget) == 4
+    assert run_concurrently([(f'part-{i}.json.gz', size) for i in range(4)], budget) == 2
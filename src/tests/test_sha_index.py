@@ -0,0 +1,44 @@
+from datetime import datetime
+
+import pyarrow as pa
+
+from plugins.gcs import GCS
+from plugins.storage import LocalStorage
+from plugins.utils.sha_index import CommitShaIndex
+
+def make_index(tmp_path) -> CommitShaIndex:
+    gcs = GCS(partition_date=datetime(2024, 10, 2), storage=LocalStorage(root_dir=str(tmp_path)))
+    return CommitShaIndex(gcs, 'bucket', 'gold/commit_sha_index', repo='owner/name')
+
+def make_commits(*shas: str) -> pa.Table:
+    return pa.table({'commit_sha': list(shas), 'dt': ['2024-10-02'] * len(shas)})
+
+def test_duplicates_within_a_part_keep_the_first_row(tmp_path):
+    index = make_index(tmp_path)
+
+    assert index.filter(make_commits('a', 'b', 'a', '', ''), 'part-00001')['commit_sha'].to_pylist() == ['a', 'b', '', '']
+    assert index.filter(make_commits('b', 'c'), 'part-00001')['commit_sha'].to_pylist() == ['c']
+
+def test_duplicates_across_parts_are_kept_by_the_lowest_part(tmp_path):
+    index = make_index(tmp_path)
+
+    # Parts finishing out of order keep every commit until the index is resolved
+    assert index.filter(make_commits('c', 'a'), 'part-00003').num_rows == 2
+    assert index.filter(make_commits('a', 'b'), 'part-00002').num_rows == 2
+    assert index.filter(make_commits('b'), 'part-00001').num_rows == 1
+
+    drops = index.resolve()
+
+    assert {part: shas.to_pylist() for part, shas in drops.items()} == {'part-00002': ['b'], 'part-00003': ['a']}
+    assert index.commit()['dropped'] == 2
+
+def test_commits_indexed_by_another_partition_are_dropped(tmp_path):
+    index = make_index(tmp_path)
+    index.filter(make_commits('a', 'b'), 'part-00001')
+    index.resolve()
+    index.commit()
+
+    other_day = GCS(partition_date=datetime(2024, 10, 3), storage=index.gcs.storage)
+    other = CommitShaIndex(other_day, 'bucket', 'gold/commit_sha_index', repo='owner/name')
+
+    assert other.filter(make_commits('b', 'c'), 'part-00001')['commit_sha'].to_pylist() == ['c']